@@ -1,7 +1,12 @@
 import os
+import sys
 from celery import Celery
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'admin_module.settings')
+# Settings are imported after this module: worker and beat processes never serve
+# requests, so they skip the admin and the full URLConf (see settings.CELERY_PROCESS)
+if os.path.basename(sys.argv[0]) == 'celery' or sys.argv[0].endswith(os.path.join('celery', '__main__.py')):
+    os.environ.setdefault('DJANGO_PROCESS', 'celery')
 
 app = Celery('admin_module')
 
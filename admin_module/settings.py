@@ -14,6 +14,8 @@ from pathlib import Path
 from celery.schedules import crontab
 import os
 from datetime import timedelta
+from redis.backoff import ExponentialBackoff
+from redis.retry import Retry
 
 PASSWORD_RESET_TIMEOUT = 60
 
@@ -79,14 +81,19 @@ LOCAL_APPS = [
     "apps.feedback",
     "apps.qr",
     "apps.cms",
+    "apps.geo",
+    "apps.search",
+    "apps.trending",
 ]
 
 INSTALLED_APPS = DJANGO_APPS + EXTERNAL_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "apps.core.profiling.QueryProfilingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "apps.municipality.middleware.TenantContextMiddleware",
+    "apps.core.db_router.ReplicaRoutingMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
@@ -113,7 +120,7 @@ REST_FRAMEWORK = {
         "user": "10/day",
         "anon": "5/hour",
     },
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "apps.core.pagination.KeysetPagination",
     "PAGE_SIZE": 20,
 }
 CACHES = {
@@ -122,9 +129,37 @@ CACHES = {
         "LOCATION": "redis://redis:6379/1",
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            # One pool per process shared by the cache and get_redis(); size it for the worker's threads
+            "CONNECTION_POOL_KWARGS": {
+                "max_connections": int(os.environ.get("REDIS_MAX_CONNECTIONS", "50")),
+                "health_check_interval": 30,
+                # redis-py otherwise retries a dead server for seconds with backoff
+                "retry": Retry(ExponentialBackoff(cap=0.05, base=0.01), 1),
+            },
+            "SOCKET_CONNECT_TIMEOUT": 0.5,
+            "SOCKET_TIMEOUT": 1.0,
+            # A cache outage degrades to misses instead of failing requests
+            "IGNORE_EXCEPTIONS": True,
         },
     }
 }
+DJANGO_REDIS_LOG_IGNORED_EXCEPTIONS = True
+DJANGO_REDIS_LOGGER = "django"
+# apps.core.redis_utils circuit breaker: skip Redis for a while after repeated failures
+REDIS_BREAKER_FAILURES = 5
+REDIS_BREAKER_COOLDOWN_SECONDS = 10
+OTP_MAX_ATTEMPTS = 5
+OTP_ATTEMPT_WINDOW_SECONDS = 60 * 5
+
+# SMS (apps.core.sms), sent by the core.send_sms task
+SMS_BACKEND = os.environ.get("SMS_BACKEND", "samaya")  # "local" keeps messages in memory
+SMS_CONNECT_TIMEOUT = 3
+SMS_READ_TIMEOUT = 10
+SMS_POOL_SIZE = 10
+SMS_MAX_RETRIES = 5
+SMS_RETRY_BACKOFF = 2  # seconds, doubled per failed attempt (with jitter)
+SMS_RETRY_BACKOFF_MAX = 300
+SMS_RATE_LIMITS = {"samaya": 10}  # messages per second, across all workers
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(
@@ -141,6 +176,17 @@ SIMPLE_JWT = {
 
 ROOT_URLCONF = "admin_module.urls"
 
+# Set in Celery worker and beat processes by admin_module/celery.py. They do not
+# autodiscover admin modules and load only the routes tasks reverse(), so booting
+# one does not import every view, serializer and ModelAdmin.
+CELERY_PROCESS = os.environ.get("DJANGO_PROCESS") == "celery"
+if CELERY_PROCESS:
+    INSTALLED_APPS = [
+        "django.contrib.admin.apps.SimpleAdminConfig" if app == "django.contrib.admin" else app
+        for app in INSTALLED_APPS
+    ]
+    ROOT_URLCONF = "admin_module.worker_urls"
+
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
@@ -173,8 +219,24 @@ DATABASES = {
         "PASSWORD": os.environ.get("DB_PASSWORD"),
         "HOST": os.environ.get("DB_HOST"),
         "PORT": os.environ.get("DB_PORT"),
+        # Reuse connections across requests; CONN_HEALTH_CHECKS pings them before reuse
+        "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": True,
     }
 }
+if os.environ.get("DB_REPLICA_HOST"):
+    # Read replica for public GET views with read_replica = True (see apps.core.db_router)
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "HOST": os.environ["DB_REPLICA_HOST"],
+        "PORT": os.environ.get("DB_REPLICA_PORT", DATABASES["default"]["PORT"]),
+        "USER": os.environ.get("DB_REPLICA_USER", DATABASES["default"]["USER"]),
+        "PASSWORD": os.environ.get("DB_REPLICA_PASSWORD", DATABASES["default"]["PASSWORD"]),
+        "TEST": {"MIRROR": "default"},
+    }
+DATABASE_ROUTERS = ["apps.core.db_router.ReplicaRouter"]
+DATABASE_REPLICA_ALIAS = "replica"
+REPLICA_PIN_SECONDS = 15  # keep a client that wrote on the primary for longer than the replication lag
 
 
 # Password validation
@@ -315,6 +377,22 @@ CELERY_BEAT_SCHEDULE = {
         "task": "cms.publish_unpublish_scheduled_pages",
         "schedule": crontab(),
     },
+    "qr-flush-scan-buffer": {
+        "task": "qr.flush_scan_buffer",
+        "schedule": timedelta(seconds=10),
+    },
+    "qr-purge-bulk-exports": {
+        "task": "qr.purge_bulk_exports",
+        "schedule": crontab(minute=30),
+    },
+    "search-rebuild-autocomplete": {
+        "task": "search.rebuild_autocomplete",
+        "schedule": crontab(hour=3, minute=0),
+    },
+    "trending-compute-rankings": {
+        "task": "trending.compute_rankings",
+        "schedule": crontab(minute="*/15"),
+    },
 }
 CMS_MAX_PAGE_VERSIONS = 20
 CMS_VERSION_MIN_INTERVAL_SECONDS = 60
@@ -328,6 +406,82 @@ CMS_VERSION_TRACKED_FIELDS = [
 ]
 CMS_RESERVED_SLUGS = {"admin", "login", "logout", "api", "cms", "static", "media"}
 
+QR_RENDER_MIN_SIZE = 64
+QR_RENDER_MAX_SIZE = 4096
+QR_RENDER_CACHE_TIMEOUT = 60 * 60 * 24 * 30
+QR_RENDER_MAX_AGE = 60 * 60 * 24 * 365
+QR_BULK_POOL_SIZE = None  # defaults to os.cpu_count()
+QR_BULK_JOB_TIMEOUT = 60 * 60 * 24
+QR_LOCAL_TARGET_TTL = 60
+QR_LOCAL_TARGET_MAX = 50000
+QR_TARGET_PATHS = {
+    "tourist_place": "/places/{entity_id}/",
+    "place": "/places/{entity_id}/",
+    "business": "/businesses/{entity_id}/",
+    "event": "/events/{entity_id}/",
+    "municipality": "/",
+}
+QR_HEATMAP_CELL_SIZE = 0.005  # degrees, roughly 500m
+QR_UNIQUE_VISITOR_BACKEND = "redis"  # "memory" uses the pure-Python HyperLogLog
+QR_HLL_RETENTION_DAYS = 400
+TENANT_CACHE_SECONDS = 60
+# Reverse proxies in front of the app that append to X-Forwarded-For; 0 trusts only REMOTE_ADDR
+TRUSTED_PROXY_DEPTH = int(os.environ.get("TRUSTED_PROXY_DEPTH", "0"))
+# Cached list/retrieve responses of TenantCacheMixin viewsets, invalidated per tenant on writes
+TENANT_RESPONSE_CACHE_ENABLED = True
+TENANT_RESPONSE_CACHE_TIMEOUT = 60 * 5
+# apps.core.singleflight: one recompute per expired key, others served stale or wait
+SINGLEFLIGHT_LEASE_SECONDS = 10  # recompute lock lease
+SINGLEFLIGHT_WAIT_SECONDS = 5  # cold misses wait this long for the lock holder
+SINGLEFLIGHT_STALE_SECONDS = 60  # expired entries stay servable this long
+SINGLEFLIGHT_BETA = 1.0  # > 1 refreshes earlier, 0 disables early refresh
+CMS_PUBLIC_PAGE_CACHE_TIMEOUT = 60 * 5  # 0 disables the public page cache
+
+GEO_MAX_RADIUS_M = 50000
+GEO_MAX_RESULTS = 200
+GEO_MEMORY_INDEX = True  # answer nearby queries from the per-process spatial index
+GEO_INDEX_CELL_DEG = 0.01  # grid bucket size, roughly 1km
+GEO_INDEX_MAX_PENDING = 512
+GEO_INDEX_VERIFY_SECONDS = 30
+GEO_INDEX_MAX_TENANTS = 64
+
+SEARCH_MAX_RESULTS = 50
+SEARCH_FILTER_MAX_RESULTS = 1000  # cap on ids a ?search= filter passes to the queryset
+SEARCH_STATS_TIMEOUT = 300
+AUTOCOMPLETE_MAX_PREFIX = 15
+AUTOCOMPLETE_KEEP = 100  # entries kept per prefix
+AUTOCOMPLETE_MAX_RESULTS = 20
+AUTOCOMPLETE_MAX_AGE = 60
+
+EVENT_CALENDAR_MAX_DAYS = 92
+ICS_MAX_AGE = 300
+ICS_PAST_DAYS = 90  # finished events stay in feeds this long
+ICS_BUILD_CHUNK_SIZE = 200
+ICS_FEED_CACHE_TIMEOUT = 60 * 60 * 24
+
+RATING_PRIOR_MEAN = 3.5
+RATING_PRIOR_WEIGHT = 5  # reviews' worth of pull towards the prior
+
+# Per entity type: signal -> weight. Signals are scans, favorites, bookmarks, rating
+TRENDING_WEIGHTS = {
+    "place": {"scans": 0.6, "rating": 0.4},
+    "business": {"scans": 0.4, "favorites": 0.3, "rating": 0.3},
+    "event": {"scans": 0.3, "bookmarks": 0.5, "rating": 0.2},
+}
+TRENDING_HALF_LIFE_DAYS = 7
+TRENDING_WINDOW_DAYS = 30
+TRENDING_TOP_N = 50
+TRENDING_TTL = 60 * 60 * 24  # lists outlive a few failed runs, not a dead beat
+TRENDING_MAX_AGE = 300
+
+# Per-request query/cache profiling (apps.core.profiling); stats at /api/_profiling/
+PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "0") == "1"
+PROFILING_SERVER_TIMING = os.environ.get("PROFILING_SERVER_TIMING", "0") == "1"
+PROFILING_STRICT_BUDGETS = False  # raise instead of logging when a view exceeds its query budget
+
+# Swagger/ReDoc at /api/swagger/ and /api/redoc/; off in production so drf_yasg is never imported
+API_DOCS_ENABLED = os.environ.get("API_DOCS_ENABLED", "1" if DEBUG else "0") == "1"
+
 
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
 EMAIL_HOST = "smtp.gmail.com"
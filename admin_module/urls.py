@@ -24,34 +24,11 @@ from django.conf.urls.static import static
 from rest_framework import permissions
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
-
-schema_view = get_schema_view(
-    openapi.Info(
-        title="Travel Management API",
-        default_version="v1",
-        description="API documentation",
-    ),
-    public=True,
-    permission_classes=(permissions.IsAuthenticated,),
-)
+from apps.core.views import profiling_stats
+from apps.qr.views import qr_scan_redirect
 
 urlpatterns = [
     path("admin/", admin.site.urls),
-    re_path(
-        r"^api/swagger(?P<format>\.json|\.yaml)$",
-        schema_view.without_ui(cache_timeout=0),
-        name="schema-json",
-    ),
-    path(
-        "api/swagger/",
-        schema_view.with_ui("swagger", cache_timeout=0),
-        name="schema-swagger-ui",
-    ),
-    path(
-        "api/redoc/", schema_view.with_ui("redoc", cache_timeout=0), name="schema-redoc"
-    ),
     path("api/token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("api/token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("api/user/", include("apps.user.urls")),
@@ -62,8 +39,49 @@ urlpatterns = [
     path("api/feedback/", include("apps.feedback.urls")),
     path("api/qr/", include("apps.qr.urls")),
     path("api/cms/", include("apps.cms.urls")),
+    path("api/geo/", include("apps.geo.urls")),
+    path("api/search/", include("apps.search.urls")),
+    path("api/trending/", include("apps.trending.urls")),
+    path(
+        "qr/<str:entity_type>/<str:entity_id>/<uuid:qr_uuid>/",
+        qr_scan_redirect,
+        name="qr-scan",
+    ),
 ]
 
+if getattr(settings, "API_DOCS_ENABLED", False):
+    # drf_yasg and its schema generator are only imported where the docs are served
+    from drf_yasg import openapi
+    from drf_yasg.views import get_schema_view
+
+    schema_view = get_schema_view(
+        openapi.Info(
+            title="Travel Management API",
+            default_version="v1",
+            description="API documentation",
+        ),
+        public=True,
+        permission_classes=(permissions.IsAuthenticated,),
+    )
+    urlpatterns += [
+        re_path(
+            r"^api/swagger(?P<format>\.json|\.yaml)$",
+            schema_view.without_ui(cache_timeout=0),
+            name="schema-json",
+        ),
+        path(
+            "api/swagger/",
+            schema_view.with_ui("swagger", cache_timeout=0),
+            name="schema-swagger-ui",
+        ),
+        path(
+            "api/redoc/", schema_view.with_ui("redoc", cache_timeout=0), name="schema-redoc"
+        ),
+    ]
+
+if getattr(settings, "PROFILING_ENABLED", False):
+    urlpatterns += [path("api/_profiling/", profiling_stats, name="profiling-stats")]
+
 if settings.DEBUG:
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
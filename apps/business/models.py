@@ -1,9 +1,10 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 from apps.municipality.models import MunicipalityAwareModel
-from apps.core.models import BaseModel
+from apps.core.models import BaseModel, RatedModel
+from apps.geo.models import GeoHashedModel
 
-class Business(MunicipalityAwareModel):
+class Business(MunicipalityAwareModel, GeoHashedModel, RatedModel):
     BUSINESS_TYPE_CHOICES = [
         ('Hotel', 'Hotel'),
         ('TravelAgency', 'Travel Agency'),
@@ -78,6 +79,12 @@ class Business(MunicipalityAwareModel):
     cover_image = models.TextField()
     is_approved = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["municipality", "geohash"]),
+            models.Index(fields=["municipality", "rating_score"]),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -2,15 +2,26 @@ from rest_framework.serializers import (
     ModelSerializer, HiddenField, CurrentUserDefault
 )
 from django.contrib.auth import get_user_model
+from apps.core.serializers import FieldSelectionModelSerializer
 from .models import (
     Business, BusinessMedia, Review, Favorite,
     Report
 )
 
-class BusinessSerializer(ModelSerializer):
+class BusinessSerializer(FieldSelectionModelSerializer):
     class Meta:
         model = Business
         fields = '__all__'
+        read_only_fields = Business.RATING_FIELDS
+
+class BusinessListSerializer(FieldSelectionModelSerializer):
+    class Meta:
+        model = Business
+        fields = [
+            'id', 'name', 'slug', 'business', 'short_description', 'address', 'latitude', 'longitude',
+            'cover_image', 'open_time', 'close_time', 'open_days', 'pricing_type', 'status', 'is_approved',
+            'rating_score', 'rating_count',
+        ]
 
 class BusinessMediaSerializer(ModelSerializer):
     class Meta:
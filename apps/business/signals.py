@@ -1,6 +1,8 @@
 from django.db.models.signals import post_save
 from django.dispatch import receiver
-from apps.business.models import Business
+from apps.business.models import Business, Review
+from apps.core.ratings import track_ratings
+from apps.core.tenant_cache import track_tenant_cache
 from apps.qr.utils import generate_qr
 
 @receiver(post_save, sender=Business)
@@ -11,4 +13,9 @@ def create_business_qr(sender, instance, created, **kwargs):
             entity_id=instance.id,
             municipality=instance.municipality.unique_slug,
             name=instance.name
-        )
\ No newline at end of file
+        )
+
+
+track_ratings(Review, "business", {"approved": True})
+track_tenant_cache(Business)
+track_tenant_cache(Review, "business.municipality_id")
@@ -1,16 +1,28 @@
 from rest_framework.decorators import action
 from rest_framework import viewsets,permissions, status
+from rest_framework.filters import OrderingFilter
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 from apps.core.permissions import IsDataEntryOrDataManagerAndApproved
+from apps.core.tenant_cache import TenantCacheMixin
 from apps.core.views import MunicipalityTenantModelViewSet
+from apps.search.filters import SearchIndexFilter
 from .models import Business, Review, Favorite
-from .serializers import BusinessSerializer, ReviewSerializer, FavoriteSerializer
+from .serializers import BusinessSerializer, BusinessListSerializer, ReviewSerializer, FavoriteSerializer
 
-class BusinessViewSet(MunicipalityTenantModelViewSet):
+class BusinessViewSet(TenantCacheMixin, MunicipalityTenantModelViewSet):
     queryset = Business.objects.all()
     serializer_class = BusinessSerializer
+    list_serializer_class = BusinessListSerializer
     permission_classes = [AllowAny]
+    read_replica = True
+    filter_backends = [OrderingFilter, SearchIndexFilter]
+    search_entity_type = "business"
+    ordering_fields = ["rating_score", "rating_count", "name"]
+    # Tenant lookup, COUNT and page; ?search= adds the postings lookup
+    query_budgets = {"list": 5, "retrieve": 2}
+    # Reviews update the rating columns
+    cache_models = (Business, Review)
 
 class ReviewViewSet(viewsets.ModelViewSet):
     queryset = Review.objects.all()
@@ -5,7 +5,6 @@ from django.conf import settings
 from django.core.validators import URLValidator
 from django.core.exceptions import ValidationError as DjangoValidationError
 import logging
-import bleach
 
 from .models import (
     PageMeta,
@@ -47,6 +46,8 @@ ALLOWED_PROTOCOLS = ["http", "https", "mailto"]
 
 
 def clean_html(v: str) -> str:
+    import bleach
+
     return bleach.clean(
         v or "",
         tags=ALLOWED_TAGS,
@@ -57,6 +58,8 @@ def clean_html(v: str) -> str:
 
 
 def sanitize_meta_text(v: str) -> str:
+    import bleach
+
     return bleach.clean(
         v or "", tags=[], attributes={}, protocols=ALLOWED_PROTOCOLS, strip=True
     )
@@ -0,0 +1,10 @@
+from apps.cms.models import Page, PageMedia, PageMeta, PageSection, PageSlugHistory, PageVersion
+from apps.core.tenant_cache import track_tenant_cache
+
+# Everything PublicPageView shows, including slug redirects
+track_tenant_cache(Page)
+track_tenant_cache(PageMeta, "page.municipality_id")
+track_tenant_cache(PageSection, "page.municipality_id")
+track_tenant_cache(PageMedia, "page.municipality_id")
+track_tenant_cache(PageVersion, "page.municipality_id")
+track_tenant_cache(PageSlugHistory, "page.municipality_id")
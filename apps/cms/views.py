@@ -1,14 +1,13 @@
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
 from rest_framework.response import Response
 from rest_framework import status, permissions, viewsets
 from rest_framework.views import APIView
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from django.utils import timezone
 from django.db import transaction
 from django.conf import settings
-from django.views.decorators.cache import cache_page
-from django.utils.decorators import method_decorator
 
 import secrets
 
@@ -30,8 +29,12 @@ from .serializers import (
     PageListSerializer,
     PagePreviewTokenSerializer,
 )
+from apps.core.db_router import primary
+from apps.core.singleflight import get_or_compute
+from apps.core.tenant_cache import generations
 from apps.core.views import MunicipalityTenantModelViewSet
 from apps.core.permissions import IsDataEntryOrDataManagerAndApproved
+from apps.search.filters import SearchIndexFilter
 
 
 def generate_unique_slug(base_slug, municipality, language_code):
@@ -56,10 +59,35 @@ def generate_unique_slug(base_slug, municipality, language_code):
 
 class PublicPageView(APIView):
     permission_classes = [permissions.AllowAny]
+    read_replica = True
+    # Writes to any of these bump the tenant's generation (see apps.cms.signals)
+    cache_models = (Page, PageMeta, PageSection, PageMedia, PageVersion, PageSlugHistory)
+    # A cold fill: the tenant lookup, the page and its prefetched relations. Cached hits run none
+    query_budget = 6
 
-    @method_decorator(cache_page(60 * 5))
     def get(self, request, slug, language_code="en"):
         municipality = getattr(request, "tenant", None)
+        timeout = getattr(settings, "CMS_PUBLIC_PAGE_CACHE_TIMEOUT", 60 * 5)
+        if municipality is None or not timeout:
+            status_code, data = self.load(municipality, slug, language_code)
+        else:
+            labels = [model._meta.label_lower for model in self.cache_models]
+            generation = ".".join(map(str, generations(labels, municipality.pk)))
+            # load() raises for unknown slugs, so misses are never stored:
+            # only pages and redirects that exist take cache keys
+            status_code, data = get_or_compute(
+                f"cms:public:{municipality.pk}:{generation}:{language_code}:{slug}",
+                lambda: self.load_from_primary(municipality, slug, language_code),
+                timeout,
+            )
+        return Response(data, status=status_code)
+
+    def load_from_primary(self, municipality, slug, language_code):
+        # A fill from a lagging replica would be cached under the new generation
+        with primary():
+            return self.load(municipality, slug, language_code)
+
+    def load(self, municipality, slug, language_code):
         try:
             page = Page.objects.get(
                 municipality=municipality,
@@ -79,13 +107,10 @@ class PublicPageView(APIView):
                 .first()
             )
             if hist:
-                return Response(
-                    {"redirect": hist.new_slug},
-                    status=301,
-                )
-            return Response({"detail": "Not found"}, status=404)
+                return 301, {"redirect": hist.new_slug}
+            raise NotFound("Not found")
         ser = PageSerializer(page)
-        return Response(ser.data)
+        return 200, ser.data
 
 
 class PreviewPageView(APIView):
@@ -106,9 +131,9 @@ class PageViewSet(MunicipalityTenantModelViewSet):
     queryset = Page.objects.all()
     serializer_class = PageSerializer
     permission_classes = [IsDataEntryOrDataManagerAndApproved]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, OrderingFilter, SearchIndexFilter]
     filterset_fields = ["status", "language_code", "is_featured", "template"]
-    search_fields = ["title", "body"]
+    search_entity_type = "page"
     ordering_fields = ["created_at", "updated_at", "published_at"]
     ordering = ["-created_at"]
 
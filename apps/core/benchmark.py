@@ -0,0 +1,46 @@
+import statistics
+import time
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def measure(fn, iterations=1000, warmup=50):
+    """
+    Call fn() repeatedly and return latency stats in milliseconds plus throughput.
+    """
+    for _ in range(warmup):
+        fn()
+    samples = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return summarize(samples, time.perf_counter() - started)
+
+
+def summarize(samples, elapsed=None):
+    """Latency stats in milliseconds for samples already taken in ms."""
+    elapsed = sum(samples) / 1000 if elapsed is None else elapsed
+    return {
+        "iterations": len(samples),
+        "mean_ms": round(statistics.fmean(samples), 4),
+        "p50_ms": round(percentile(samples, 50), 4),
+        "p95_ms": round(percentile(samples, 95), 4),
+        "p99_ms": round(percentile(samples, 99), 4),
+        "max_ms": round(max(samples), 4),
+        "rps": round(len(samples) / elapsed, 1) if elapsed else None,
+    }
+
+
+def format_stats(name, stats):
+    return (
+        f"{name}: p50={stats['p50_ms']}ms p95={stats['p95_ms']}ms "
+        f"p99={stats['p99_ms']}ms rps={stats['rps']}"
+    )
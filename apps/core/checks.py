@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+from django.urls import get_resolver
+
+WORKER_URLCONF = "admin_module.worker_urls"
+
+
+@register(Tags.urls)
+def check_worker_urls(app_configs, **kwargs):
+    """Each route of the Celery URLConf must match the route served under the same name."""
+    if getattr(settings, "CELERY_PROCESS", False):
+        return []
+    served = get_resolver(settings.ROOT_URLCONF).reverse_dict
+    worker = get_resolver(WORKER_URLCONF).reverse_dict
+    errors = []
+    for name in worker:
+        if not isinstance(name, str):
+            continue
+        expected = [pattern for _, pattern, _, _ in served.getlist(name)]
+        found = [pattern for _, pattern, _, _ in worker.getlist(name)]
+        if found != expected:
+            errors.append(Error(
+                f"{WORKER_URLCONF} routes {name!r} to {found}, {settings.ROOT_URLCONF} to {expected}",
+                hint=f"Update {WORKER_URLCONF} to match.",
+                id="core.E001",
+            ))
+    return errors
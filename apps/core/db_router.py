@@ -0,0 +1,95 @@
+import contextvars
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Set per request by ReplicaRoutingMiddleware; everything else (tasks, commands) reads the primary
+_use_replica = contextvars.ContextVar("use_replica", default=False)
+_wrote = contextvars.ContextVar("wrote", default=False)
+
+
+def replica_alias():
+    alias = getattr(settings, "DATABASE_REPLICA_ALIAS", "replica")
+    return alias if alias in settings.DATABASES else None
+
+
+@contextmanager
+def primary():
+    """Read from the primary inside the block, e.g. when filling a cache that must not capture replication lag."""
+    token = _use_replica.set(False)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+def reads_replica(view_func):
+    """True for views that opt in with ``read_replica = True`` (DRF class or function attribute)."""
+    view_class = getattr(view_func, "cls", None) or getattr(view_func, "view_class", None)
+    return bool(getattr(view_class or view_func, "read_replica", False))
+
+
+class ReplicaRouter:
+    """
+    Reads go to the replica only while ReplicaRoutingMiddleware allows it
+    for the current request, and never after the request has written.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _use_replica.get() and not _wrote.get():
+            return replica_alias()
+        return None
+
+    def db_for_write(self, model, **hints):
+        _wrote.set(True)
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Same data on both aliases
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == replica_alias():
+            return False
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Sends the reads of safe-method requests to views with ``read_replica =
+    True`` to the replica alias. A request that writes sets a short-lived
+    cookie pinning the client to the primary for REPLICA_PIN_SECONDS, so its
+    next reads see its own writes despite replication lag. Disabled unless
+    the replica alias is configured.
+    """
+    pin_cookie = "db_pin"
+
+    def __init__(self, get_response):
+        if replica_alias() is None:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        tokens = _use_replica.set(False), _wrote.set(False)
+        try:
+            response = self.get_response(request)
+            if _wrote.get():
+                response.set_cookie(
+                    self.pin_cookie, "1", max_age=getattr(settings, "REPLICA_PIN_SECONDS", 15),
+                    httponly=True, samesite="Lax",
+                )
+            return response
+        finally:
+            _use_replica.reset(tokens[0])
+            _wrote.reset(tokens[1])
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            request.method in SAFE_METHODS
+            and self.pin_cookie not in request.COOKIES
+            and reads_replica(view_func)
+        ):
+            _use_replica.set(True)
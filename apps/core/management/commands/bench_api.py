@@ -0,0 +1,234 @@
+import itertools
+import json
+import platform
+import random
+import subprocess
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from apps.business.models import Business
+from apps.cms.models import Page
+from apps.cms.tasks import publish_unpublish_scheduled_pages
+from apps.core.benchmark import format_stats, measure, summarize
+from apps.core.perfdata import seed_dataset
+from apps.core.tenant_cache import invalidate
+from apps.qr import resolver
+from apps.qr.tasks import flush_scan_buffer
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the hot API paths on a seeded multi-tenant dataset (rolled back afterwards) "
+        "and optionally write the results as JSON or compare them with an earlier run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--municipalities", type=int, default=3)
+        parser.add_argument("--pages", type=int, default=100, help="per municipality")
+        parser.add_argument("--entities", type=int, default=300, help="places and businesses per municipality")
+        parser.add_argument("--events", type=int, default=200, help="per municipality")
+        parser.add_argument("--scans", type=int, default=5000, help="per municipality")
+        parser.add_argument("--iterations", type=int, default=300)
+        parser.add_argument("--only", help="comma-separated benchmark names")
+        parser.add_argument("--output", help="write results to this JSON file")
+        parser.add_argument("--compare", help="JSON file of an earlier run to compare against")
+        parser.add_argument("--threshold", type=float, default=20.0,
+                            help="p95 slowdown in percent reported as a regression")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options["seed"])
+        self.iterations = options["iterations"]
+        only = set(options["only"].split(",")) if options["only"] else None
+        # Keep the run deterministic and free of dev-only instrumentation
+        with override_settings(ALLOWED_HOSTS=["*"], DEBUG=False, PROFILING_ENABLED=False), \
+                mock.patch.object(resolver, "SCAN_BUFFER_KEY", f"{resolver.SCAN_BUFFER_KEY}:bench"), \
+                transaction.atomic():
+            started = time.perf_counter()
+            self.tenants = seed_dataset(
+                municipalities=options["municipalities"], pages=options["pages"], places=options["entities"],
+                businesses=options["entities"], events=options["events"], scans=options["scans"],
+                seed=options["seed"], prefix="bench",
+            )
+            if connection.vendor == "sqlite":
+                with connection.cursor() as cursor:
+                    cursor.execute("ANALYZE")
+            self.stdout.write(f"Seeded {len(self.tenants)} municipalities in {time.perf_counter() - started:.1f}s")
+            self.clients = {
+                tenant["municipality"].pk: Client(HTTP_HOST=tenant["municipality"].full_domain)
+                for tenant in self.tenants
+            }
+
+            results = {}
+            for name, case in self.cases():
+                if only and name not in only:
+                    continue
+                results[name] = case()
+                self.stdout.write(format_stats(name, results[name]))
+            transaction.set_rollback(True)
+
+        report = {
+            "meta": {
+                "commit": git_commit(),
+                "created_at": timezone.now().isoformat(),
+                "database": connection.vendor,
+                "python": platform.python_version(),
+                "dataset": {key: options[key] for key in ("municipalities", "pages", "entities", "events", "scans")},
+                "iterations": self.iterations,
+                "seed": options["seed"],
+            },
+            "results": results,
+        }
+        if options["output"]:
+            with open(options["output"], "w") as handle:
+                json.dump(report, handle, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+        if options["compare"]:
+            self.compare(options["compare"], results, options["threshold"])
+
+    def cases(self):
+        return [
+            ("public_page_cached", self.public_page_cached),
+            ("public_page_uncached", self.public_page_uncached),
+            ("place_list", lambda: self.endpoint("/api/tourism/places/")),
+            ("place_detail", lambda: self.endpoint("/api/tourism/places/{pk}/", "places")),
+            ("business_list", lambda: self.endpoint("/api/business/")),
+            ("business_list_cached", lambda: self.endpoint("/api/business/", cached=True)),
+            ("business_detail", lambda: self.endpoint("/api/business/{pk}/", "businesses")),
+            ("event_list", lambda: self.endpoint("/api/event/events/")),
+            ("event_list_cursor", lambda: self.endpoint("/api/event/events/?cursor=")),
+            ("event_detail", lambda: self.endpoint("/api/event/events/{pk}/", "events")),
+            ("qr_scan", self.qr_scan),
+            ("qr_flush", self.qr_flush),
+            ("page_save", self.page_save),
+            ("scheduled_publish", self.scheduled_publish),
+        ]
+
+    def tenant(self):
+        tenant = self.rng.choice(self.tenants)
+        return tenant, self.clients[tenant["municipality"].pk]
+
+    def get(self, client, url, expected=200):
+        response = client.get(url)
+        if response.status_code != expected:
+            raise AssertionError(f"GET {url} returned {response.status_code}")
+        return response
+
+    def endpoint(self, pattern, collection=None, cached=False):
+        """Uncached by default, so the view itself is measured rather than TenantCacheMixin."""
+        def call():
+            tenant, client = self.tenant()
+            pk = self.rng.choice(tenant[collection]).pk if collection else None
+            self.get(client, pattern.format(pk=pk))
+        if cached:
+            # Rolled-back runs can reuse tenant ids: never serve an earlier run's entries
+            for tenant in self.tenants:
+                invalidate(Business, tenant["municipality"].pk)
+        with override_settings(TENANT_RESPONSE_CACHE_ENABLED=cached):
+            return measure(call, self.iterations, warmup=10)
+
+    def _published_page(self, tenant):
+        return self.rng.choice([page for page in tenant["pages"] if page.status == "published"])
+
+    def public_page_cached(self):
+        def call():
+            tenant, client = self.tenant()
+            page = self._published_page(tenant)
+            self.get(client, f"/api/cms/public/pages/{page.language_code}/{page.slug}/")
+        for tenant in self.tenants:
+            invalidate(Page, tenant["municipality"].pk)
+        # A long warmup fills the page cache, so the timed loop measures hits
+        return measure(call, self.iterations, warmup=self.iterations)
+
+    def public_page_uncached(self):
+        def call():
+            tenant, client = self.tenant()
+            page = self._published_page(tenant)
+            self.get(client, f"/api/cms/public/pages/{page.language_code}/{page.slug}/")
+        with override_settings(CMS_PUBLIC_PAGE_CACHE_TIMEOUT=0):
+            return measure(call, self.iterations, warmup=10)
+
+    def qr_scan(self):
+        def call():
+            tenant, client = self.tenant()
+            qr = self.rng.choice(tenant["qrs"])
+            self.get(client, f"/qr/{qr.entity_type}/{qr.entity_id}/{qr.uuid}/", expected=302)
+        return measure(call, self.iterations, warmup=10)
+
+    def qr_flush(self):
+        """Per flush of a full batch of queued scans (1000 rows)."""
+        samples = []
+        for _ in range(max(1, self.iterations // 50)):
+            for _ in range(1000):
+                tenant, _ = self.tenant()
+                qr = self.rng.choice(tenant["qrs"])
+                resolver.record_scan(qr.uuid, "10.0.0.1", municipality_id=tenant["municipality"].pk)
+            t0 = time.perf_counter()
+            flush_scan_buffer(batch_size=1000)
+            samples.append((time.perf_counter() - t0) * 1000)
+        # Leave nothing queued for the real flush task
+        while flush_scan_buffer(batch_size=1000):
+            pass
+        return summarize(samples)
+
+    def page_save(self):
+        counter = itertools.count()
+
+        def call():
+            tenant, _ = self.tenant()
+            page = self.rng.choice(tenant["pages"])
+            page.title = f"{page.title.split(' #')[0]} #{next(counter)}"
+            page.save()
+        with override_settings(CMS_VERSION_MIN_INTERVAL_SECONDS=0):
+            return measure(call, self.iterations, warmup=10)
+
+    def scheduled_publish(self):
+        """Per task run publishing 20 due pages of every tenant."""
+        samples = []
+        for _ in range(max(1, self.iterations // 20)):
+            for tenant in self.tenants:
+                pks = [page.pk for page in self.rng.sample(tenant["pages"], min(20, len(tenant["pages"])))]
+                Page.objects.filter(pk__in=pks).update(
+                    status="draft", scheduled_publish_at=timezone.now() - timedelta(minutes=1)
+                )
+            t0 = time.perf_counter()
+            publish_unpublish_scheduled_pages()
+            samples.append((time.perf_counter() - t0) * 1000)
+        return summarize(samples)
+
+    def compare(self, path, results, threshold):
+        with open(path) as handle:
+            baseline = json.load(handle)
+        self.stdout.write(f"Compared with {path} (commit {baseline['meta'].get('commit')}):")
+        regressions = 0
+        for name, stats in results.items():
+            before = baseline["results"].get(name)
+            if before is None:
+                continue
+            change = (stats["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100 if before["p95_ms"] else 0.0
+            flag = ""
+            if change > threshold:
+                flag = "  REGRESSION"
+                regressions += 1
+            self.stdout.write(
+                f"  {name}: p95 {before['p95_ms']} -> {stats['p95_ms']}ms ({change:+.1f}%), "
+                f"rps {before['rps']} -> {stats['rps']}{flag}"
+            )
+        if regressions:
+            self.stderr.write(f"{regressions} benchmark(s) slower than the {threshold}% threshold")
@@ -0,0 +1,133 @@
+import http.client
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.cms.models import Page
+from apps.core.benchmark import format_stats, summarize
+from apps.municipality.models import Municipality
+
+
+class Command(BaseCommand):
+    help = (
+        "Start gunicorn in each server mode (see gunicorn.conf.py) and load test the public "
+        "page endpoint of a seeded tenant through it. Run seed_perf_data first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--modes", default="sync,gthread,asgi")
+        parser.add_argument("--tenant", default="perf-0", help="unique_slug of a seeded municipality")
+        parser.add_argument("--concurrency", type=int, default=32, help="client threads")
+        parser.add_argument("--requests", type=int, default=3000, help="per mode")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument("--workers", type=int, help="override the worker count of every mode")
+        parser.add_argument("--boot-timeout", type=float, default=30.0, help="seconds")
+
+    def handle(self, *args, **options):
+        self.options = options
+        municipality = Municipality.objects.filter(unique_slug=options["tenant"]).first()
+        if municipality is None:
+            raise CommandError(f"No municipality {options['tenant']!r}; run seed_perf_data first.")
+        paths = [
+            f"/api/cms/public/pages/{language}/{slug}/"
+            for language, slug in Page.objects.filter(municipality=municipality, status="published")
+            .values_list("language_code", "slug")[:50]
+        ]
+        if not paths:
+            raise CommandError(f"{options['tenant']} has no published pages.")
+        self.host = municipality.full_domain
+
+        for mode in options["modes"].split(","):
+            server = self.start(mode)
+            try:
+                self.wait_ready(server, paths[0])
+                # Warm every worker's connections and the page cache before timing
+                self.load(paths, len(paths) * 4)
+                stats, errors = self.load(paths, options["requests"])
+            finally:
+                self.stop(server)
+            self.stdout.write(format_stats(mode, stats) + f" errors={errors}")
+
+    def start(self, mode):
+        env = {
+            **os.environ,
+            "SERVER_MODE": mode,
+            "PORT": str(self.options["port"]),
+            "GUNICORN_ACCESS_LOG": "",
+            "GUNICORN_LOG_LEVEL": "warning",
+        }
+        if self.options["workers"]:
+            env["GUNICORN_WORKERS"] = str(self.options["workers"])
+        return subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "-c", str(settings.BASE_DIR / "gunicorn.conf.py")],
+            cwd=settings.BASE_DIR, env=env,
+        )
+
+    def stop(self, server):
+        # SIGTERM is gunicorn's graceful shutdown
+        server.send_signal(signal.SIGTERM)
+        try:
+            server.wait(timeout=35)
+        except subprocess.TimeoutExpired:
+            server.kill()
+            server.wait()
+
+    def wait_ready(self, server, path):
+        deadline = time.monotonic() + self.options["boot_timeout"]
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError(f"gunicorn exited with status {server.returncode}")
+            try:
+                if self.request(self.connect(), path) == 200:
+                    return
+            except OSError:
+                pass
+            time.sleep(0.2)
+        raise CommandError("gunicorn did not answer in time")
+
+    def connect(self):
+        return http.client.HTTPConnection("127.0.0.1", self.options["port"], timeout=30)
+
+    def request(self, conn, path):
+        conn.request("GET", path, headers={"Host": self.host})
+        response = conn.getresponse()
+        response.read()
+        return response.status
+
+    def load(self, paths, total):
+        concurrency = self.options["concurrency"]
+        samples, errors = [], []
+        lock = threading.Lock()
+
+        def worker(index):
+            # One keep-alive connection per client, like a browser or a proxy upstream
+            conn = self.connect()
+            mine, failed = [], 0
+            for i in range(index, total, concurrency):
+                t0 = time.perf_counter()
+                try:
+                    status = self.request(conn, paths[i % len(paths)])
+                except (OSError, http.client.HTTPException):
+                    conn.close()
+                    conn = self.connect()
+                    status = None
+                mine.append((time.perf_counter() - t0) * 1000)
+                failed += status != 200
+            conn.close()
+            with lock:
+                samples.extend(mine)
+                errors.append(failed)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return summarize(samples, time.monotonic() - started), sum(errors)
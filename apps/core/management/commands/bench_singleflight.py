@@ -0,0 +1,90 @@
+import math
+import pickle
+import threading
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+
+from apps.core.benchmark import format_stats, summarize
+from apps.core.redis_utils import get_redis
+from apps.core.singleflight import get_or_compute
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test the single-flight cache: many threads read one short-lived key whose "
+        "recompute is slow. Reports how many recomputes ran and how many overlapped; with "
+        "single-flight they never do (early refresh may run them somewhat before each expiry)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=32)
+        parser.add_argument("--duration", type=float, default=5.0, help="seconds")
+        parser.add_argument("--ttl", type=float, default=2.0, help="seconds an entry stays fresh")
+        parser.add_argument("--compute-ms", type=float, default=50.0, help="simulated recompute time")
+        parser.add_argument("--naive", action="store_true",
+                            help="also run plain get-or-set, which recomputes once per waiting request")
+
+    def handle(self, *args, **options):
+        self.options = options
+        modes = [("singleflight", self.single_flight)]
+        if options["naive"]:
+            modes.append(("naive", self.naive))
+        windows = math.ceil(options["duration"] / options["ttl"])
+        for name, read in modes:
+            computes, overlapping, stats = self.run(read)
+            self.stdout.write(format_stats(name, stats))
+            self.stdout.write(
+                f"  {computes} recomputes for {windows} expiry windows, at most {overlapping} at once "
+                f"({stats['iterations']} reads)"
+            )
+
+    def run(self, read):
+        key = f"bench:singleflight:{uuid.uuid4().hex}"
+        counts = {"computes": 0, "running": 0, "overlapping": 0}
+        lock = threading.Lock()
+
+        def compute():
+            with lock:
+                counts["computes"] += 1
+                counts["running"] += 1
+                counts["overlapping"] = max(counts["overlapping"], counts["running"])
+            time.sleep(self.options["compute_ms"] / 1000)
+            with lock:
+                counts["running"] -= 1
+            return "value"
+
+        samples = []
+        started = time.monotonic()
+        deadline = started + self.options["duration"]
+
+        def worker():
+            mine = []
+            while time.monotonic() < deadline:
+                t0 = time.perf_counter()
+                read(key, compute)
+                mine.append((time.perf_counter() - t0) * 1000)
+            with lock:
+                samples.extend(mine)
+
+        threads = [threading.Thread(target=worker) for _ in range(self.options["threads"])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+        get_redis().delete(key)
+        return counts["computes"], counts["overlapping"], summarize(samples, elapsed)
+
+    def single_flight(self, key, compute):
+        return get_or_compute(key, compute, self.options["ttl"])
+
+    def naive(self, key, compute):
+        redis_conn = get_redis()
+        raw = redis_conn.get(key)
+        if raw is not None:
+            return pickle.loads(raw)
+        value = compute()
+        redis_conn.set(key, pickle.dumps(value), px=int(self.options["ttl"] * 1000))
+        return value
@@ -0,0 +1,102 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.benchmark import summarize
+
+# What each kind of process does before it can take work
+SCENARIOS = {
+    # A web worker up to its first request: apps, then the URLConf and every view
+    "web": (
+        {},
+        "import django; django.setup()\n"
+        "from django.core.wsgi import get_wsgi_application; get_wsgi_application()\n"
+        "from django.urls import get_resolver; get_resolver().url_patterns\n",
+    ),
+    # A Celery worker: apps, every tasks module, then the checks it runs at init
+    "worker": (
+        {"DJANGO_PROCESS": "celery"},
+        "from admin_module.celery import app\n"
+        "import django; django.setup()\n"
+        "app.loader.import_default_modules()\n"
+        "from django.core.checks import run_checks; run_checks()\n",
+    ),
+}
+
+
+def parse_importtime(output):
+    """{module: (self_us, cumulative_us)} from ``python -X importtime`` stderr."""
+    modules = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure cold start: run each process kind (see SCENARIOS) in a fresh interpreter "
+        "under -X importtime, report wall time and the packages that cost the most to import."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=5)
+        parser.add_argument("--only", help="comma-separated scenario names")
+        parser.add_argument("--top", type=int, default=12, help="packages to list per scenario")
+        parser.add_argument("--output", help="write results to this JSON file")
+
+    def handle(self, *args, **options):
+        names = options["only"].split(",") if options["only"] else list(SCENARIOS)
+        unknown = set(names) - set(SCENARIOS)
+        if unknown:
+            raise CommandError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+        results = {}
+        for name in names:
+            env, code = SCENARIOS[name]
+            wall_ms, import_ms, packages = [], [], defaultdict(list)
+            for _ in range(options["runs"]):
+                elapsed, modules = self.run(env, code)
+                wall_ms.append(elapsed)
+                import_ms.append(sum(self_us for self_us, _ in modules.values()) / 1000)
+                totals = defaultdict(int)
+                for module, (self_us, _) in modules.items():
+                    totals[module.split(".")[0]] += self_us
+                for package, total in totals.items():
+                    packages[package].append(total / 1000)
+
+            stats = summarize(wall_ms)
+            top = sorted(
+                ((package, round(statistics.median(times), 1)) for package, times in packages.items()),
+                key=lambda item: -item[1],
+            )[:options["top"]]
+            imports = round(statistics.median(import_ms), 1)
+            results[name] = {**stats, "imports_total_ms": imports, "imports_ms": dict(top)}
+            self.stdout.write(
+                f"{name}: p50={stats['p50_ms']:.0f}ms max={stats['max_ms']:.0f}ms, "
+                f"{imports}ms importing ({stats['iterations']} runs)"
+            )
+            self.stdout.write("  " + ", ".join(f"{package} {ms}ms" for package, ms in top))
+
+        if options["output"]:
+            with open(options["output"], "w") as fh:
+                json.dump(results, fh, indent=2)
+
+    def run(self, env, code):
+        started = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            env={**os.environ, **env}, capture_output=True, text=True,
+        )
+        elapsed = (time.perf_counter() - started) * 1000
+        if proc.returncode:
+            raise CommandError(f"Startup failed:\n{proc.stderr[-2000:]}")
+        return elapsed, parse_importtime(proc.stderr)
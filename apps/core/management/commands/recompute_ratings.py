@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from apps.core.ratings import TRACKED, recompute_ratings
+
+
+class Command(BaseCommand):
+    help = "Rebuild rating aggregates from the review tables, e.g. after bulk QuerySet.update() moderation."
+
+    def handle(self, *args, **options):
+        for review_model, target_field, counted_filter in TRACKED:
+            updated = recompute_ratings(review_model, target_field, counted_filter)
+            self.stdout.write(f"{review_model._meta.label}: {updated} rated rows.")
@@ -0,0 +1,140 @@
+import multiprocessing
+import os
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+
+from apps.core.perfdata import BATCH_SIZE, create_municipalities, seed_tenant
+from apps.municipality.models import Municipality
+from apps.qr.resolver import warm_targets
+from apps.search import autocomplete
+from apps.search.index import rebuild_index
+from apps.user.models import User
+
+SIZES = ("pages", "sections", "versions", "places", "businesses", "events", "scans", "reviews", "favorites")
+
+
+def _seed(job):
+    """
+    One tenant, in a worker process. The rng depends only on the seed and
+    the tenant's slug (so QR uuids differ between prefixes), never on the
+    worker count or the order tenants finish in.
+    """
+    municipality_id, sizes, user_ids, scan_days, seed = job
+    started = time.perf_counter()
+    municipality = Municipality.objects.get(pk=municipality_id)
+    rng = random.Random(f"{seed}:{municipality.unique_slug}")
+    with transaction.atomic():
+        seed_tenant(
+            rng, municipality, sizes["pages"], sizes["sections"], sizes["places"], sizes["businesses"],
+            sizes["events"], sizes["scans"], versions=sizes["versions"], reviews=sizes["reviews"],
+            favorites=sizes["favorites"], user_ids=user_ids, scan_days=scan_days,
+        )
+    return municipality.unique_slug, time.perf_counter() - started
+
+
+def _rows_per_tenant(sizes):
+    entities = sizes["places"] + sizes["businesses"] + sizes["events"]
+    return (
+        sizes["pages"] * (1 + sizes["sections"] + sizes["versions"])
+        + entities * 2  # rows and their QR codes
+        + sizes["reviews"] * 2 + sizes["reviews"] // 4
+        + (sizes["favorites"] * 2 if sizes["favorites"] else 0)
+        + sizes["scans"] + 2  # event location and category
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a large deterministic multi-tenant dataset (pages with versions, places, businesses, events, "
+        "reviews in English and Nepali, QR scans) for load and performance testing. Rows are bulk inserted, "
+        "so save() side effects are skipped unless --side-effects is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--municipalities", type=int, default=200)
+        parser.add_argument("--pages", type=int, default=500, help="per municipality")
+        parser.add_argument("--sections", type=int, default=3, help="per page")
+        parser.add_argument("--versions", type=int, default=3, help="per page")
+        parser.add_argument("--places", type=int, default=200, help="per municipality")
+        parser.add_argument("--businesses", type=int, default=200, help="per municipality")
+        parser.add_argument("--events", type=int, default=100, help="per municipality")
+        parser.add_argument("--scans", type=int, default=10000, help="per municipality")
+        parser.add_argument("--reviews", type=int, default=500,
+                            help="place and business reviews per municipality (a quarter as many event ratings)")
+        parser.add_argument("--favorites", type=int, default=500,
+                            help="business favorites and event bookmarks per municipality")
+        parser.add_argument("--users", type=int, default=5000, help="shared pool of public users")
+        parser.add_argument("--days", type=int, default=90, help="spread scans over this many days")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--prefix", default="perf", help="tenants are named {prefix}-{i}")
+        parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                            help="processes seeding tenants in parallel (always 1 on SQLite)")
+        parser.add_argument("--side-effects", action="store_true",
+                            help="afterwards publish QR targets and build the search and autocomplete indexes")
+
+    def handle(self, *args, **options):
+        prefix = options["prefix"]
+        if Municipality.objects.filter(unique_slug__startswith=f"{prefix}-").exists():
+            raise CommandError(f"Municipalities named {prefix}-* already exist; use another --prefix.")
+        sizes = {key: options[key] for key in SIZES}
+        workers = max(1, options["workers"] or 1)
+        if connection.vendor == "sqlite":
+            # One writer at a time: parallel inserts would only wait on the database lock
+            workers = 1
+
+        started = time.perf_counter()
+        municipalities = create_municipalities(options["municipalities"], prefix)
+        user_ids = self.create_users(prefix, options["users"])
+        jobs = [
+            (municipality.pk, sizes, user_ids, options["days"], options["seed"])
+            for municipality in municipalities
+        ]
+        self.stdout.write(f"Seeding {len(jobs)} municipalities with {workers} worker(s)...")
+
+        if workers == 1:
+            results = map(_seed, jobs)
+        else:
+            # Children must not share the parent's database sockets
+            connections.close_all()
+            pool = multiprocessing.Pool(workers)
+            results = pool.imap_unordered(_seed, jobs)
+        try:
+            for done, (slug, seconds) in enumerate(results, 1):
+                self.stdout.write(f"  [{done}/{len(jobs)}] {slug} in {seconds:.1f}s")
+        finally:
+            if workers > 1:
+                pool.close()
+                pool.join()
+
+        if options["side_effects"]:
+            self.run_side_effects(municipalities)
+
+        rows = _rows_per_tenant(sizes) * len(jobs) + len(user_ids)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f"Inserted {rows} rows in {elapsed:.1f}s ({rows / elapsed:.0f} rows/s).")
+
+    def create_users(self, prefix, count):
+        if User.objects.filter(email__startswith=f"{prefix}-user-").exists():
+            raise CommandError(f"Users {prefix}-user-* already exist; use another --prefix.")
+        User.objects.bulk_create(
+            [
+                # "!" is Django's unusable password marker: these accounts cannot log in
+                User(name=f"{prefix} user {i}", email=f"{prefix}-user-{i}@example.com", password="!")
+                for i in range(count)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        return list(
+            User.objects.filter(email__startswith=f"{prefix}-user-").order_by("pk").values_list("pk", flat=True)
+        )
+
+    def run_side_effects(self, municipalities):
+        """The bulk equivalents of what save() signals would have done row by row."""
+        self.stdout.write(f"Published {warm_targets()} QR targets.")
+        for municipality in municipalities:
+            indexed = rebuild_index(municipality=municipality)
+            entries = autocomplete.rebuild(municipality.pk)
+            self.stdout.write(f"  {municipality.unique_slug}: {indexed} rows indexed, {entries} autocomplete entries")
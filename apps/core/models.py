@@ -20,3 +20,35 @@ class BaseModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class RatedModel(models.Model):
+    """
+    Review aggregates kept on the rated row itself (see apps.core.ratings), so
+    list pages never aggregate reviews and "top rated" is an index scan.
+    """
+    rating_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_1 = models.PositiveIntegerField(default=0)
+    rating_2 = models.PositiveIntegerField(default=0)
+    rating_3 = models.PositiveIntegerField(default=0)
+    rating_4 = models.PositiveIntegerField(default=0)
+    rating_5 = models.PositiveIntegerField(default=0)
+    # Bayesian average, 0 while unrated
+    rating_score = models.FloatField(default=0)
+
+    # Maintained by apps.core.ratings only: serializers must not let clients write them
+    RATING_FIELDS = (
+        "rating_count", "rating_sum", "rating_1", "rating_2", "rating_3", "rating_4", "rating_5", "rating_score",
+    )
+
+    class Meta:
+        abstract = True
+
+    @property
+    def rating_average(self):
+        return round(self.rating_sum / self.rating_count, 2) if self.rating_count else None
+
+    @property
+    def rating_histogram(self):
+        return {star: getattr(self, f"rating_{star}") for star in range(1, 6)}
@@ -0,0 +1,170 @@
+import base64
+import datetime
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def estimate_count(queryset):
+    """
+    The planner's row estimate on PostgreSQL and MySQL, an exact COUNT elsewhere.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor == "postgresql":
+        return _postgresql_estimate(connection, queryset)
+    if connection.vendor == "mysql":
+        return _mysql_estimate(connection, queryset)
+    return queryset.count()
+
+
+def _postgresql_estimate(connection, queryset):
+    sql, params = queryset.values("pk").query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _mysql_estimate(connection, queryset):
+    with connection.cursor() as cursor:
+        if not queryset.query.where and not queryset.query.distinct:
+            # Unfiltered: InnoDB's table statistics, no plan needed
+            cursor.execute(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+            if row and row[0] is not None:
+                return int(row[0])
+        sql, params = queryset.values("pk").query.sql_with_params()
+        cursor.execute(f"EXPLAIN {sql}", params)
+        columns = [column[0].lower() for column in cursor.description]
+        plan = [dict(zip(columns, row)) for row in cursor.fetchall()]
+    # Rows of the outer query block: each table's rows that pass its filters, joined
+    estimate = 1.0
+    for step in plan:
+        if step.get("id") == 1 and step.get("rows") is not None:
+            estimate *= int(step["rows"]) * float(step.get("filtered") or 100) / 100
+    return int(round(estimate))
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    Page numbers by default. Sending ``?cursor=`` (empty for the first page)
+    switches to keyset pagination over the view's ``cursor_ordering``, e.g.
+    ``("-created_at", "-id")``: each page is one index range scan of
+    page_size + 1 rows, with no OFFSET and no COUNT, so the cost stays flat
+    however deep a client scrolls. All fields must sort the same way and be
+    non-nullable, the last one must be unique, and a composite index on them
+    should exist.
+
+    ``?count=exact`` or ``?count=estimate`` adds a total to cursor pages.
+    """
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        ordering = getattr(view, "cursor_ordering", None)
+        self.keyset = ordering is not None and self.cursor_query_param in request.query_params
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.ordering = ordering
+        self._check_ordering(queryset.model)
+        page_size = self.get_page_size(request)
+        queryset = queryset.order_by(*ordering)
+        self.count = self._count(queryset, request.query_params.get(self.count_query_param))
+
+        position = self._decode(request.query_params[self.cursor_query_param], queryset.model)
+        if position is not None:
+            queryset = queryset.filter(self._after(position))
+        rows = list(queryset[: page_size + 1])
+        self.has_next = len(rows) > page_size
+        self.page = rows[:page_size]
+        return self.page
+
+    def _count(self, queryset, mode):
+        if mode == "exact":
+            return queryset.count()
+        if mode == "estimate":
+            return estimate_count(queryset)
+        return None
+
+    def _fields(self):
+        return [name.lstrip("-") for name in self.ordering]
+
+    def _model_field(self, model, name):
+        return model._meta.pk if name == "pk" else model._meta.get_field(name)
+
+    def _check_ordering(self, model):
+        # NULLs fall outside every comparison in _after(), so rows holding them would be skipped
+        nullable = [name for name in self._fields() if self._model_field(model, name).null]
+        if nullable:
+            raise ImproperlyConfigured(f"cursor_ordering fields must not be nullable: {', '.join(nullable)}")
+
+    def _after(self, position):
+        """
+        Rows strictly after ``position`` in cursor_ordering: the tuple
+        comparison spelled out as ORs, plus a bound on the first field so the
+        planner can start an index range scan there.
+        """
+        descending = self.ordering[0].startswith("-")
+        lookup = "lt" if descending else "gt"
+        fields = self._fields()
+        condition = Q()
+        for i, name in enumerate(fields):
+            condition |= Q(**{f"{name}__{lookup}": position[i]}, **dict(zip(fields[:i], position[:i])))
+        return Q(**{f"{fields[0]}__{lookup}e": position[0]}) & condition
+
+    def _encode(self, instance):
+        position = [self._encode_value(getattr(instance, name)) for name in self._fields()]
+        return base64.urlsafe_b64encode(json.dumps(position).encode()).decode().rstrip("=")
+
+    @staticmethod
+    def _encode_value(value):
+        if isinstance(value, (datetime.date, datetime.time)):
+            return value.isoformat()
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        return str(value)
+
+    def _decode(self, raw, model):
+        if not raw:
+            return None
+        fields = self._fields()
+        try:
+            position = json.loads(base64.urlsafe_b64decode(raw + "=" * (-len(raw) % 4)))
+            if not isinstance(position, list) or len(position) != len(fields) or None in position:
+                raise ValueError("Cursor does not match the ordering")
+            return [self._model_field(model, name).to_python(value) for name, value in zip(fields, position)]
+        except (ValueError, TypeError, ValidationError) as exc:
+            raise NotFound("Invalid cursor.") from exc
+
+    def get_next_link(self):
+        if not getattr(self, "keyset", False):
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, self._encode(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        if not getattr(self, "keyset", False):
+            return super().get_paginated_response(data)
+        body = OrderedDict()
+        if self.count is not None:
+            body["count"] = self.count
+        body["next"] = self.get_next_link()
+        body["results"] = data
+        return Response(body)
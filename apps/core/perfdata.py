@@ -0,0 +1,341 @@
+"""
+Deterministic synthetic tenants for benchmarks and seed_perf_data. The build_* helpers return
+unsaved instances so callers choose how to insert them (bulk_create skips
+save() and signals: no versions, QR targets or search indexing).
+"""
+import random
+import uuid
+from collections import Counter
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db.models.fields.files import FieldFile
+from django.utils import timezone
+
+from apps.business.models import Business, Favorite, Review as BusinessReview
+from apps.cms.models import VERSION_TRACKED_FIELDS, Page, PageSection, PageVersion
+from apps.event.models import Bookmark, Event, EventCategory, EventLocation, EventPublicInteraction
+from apps.geo.utils import encode_geohash
+from apps.municipality.models import Municipality
+from apps.qr.models import QR, QRAnalytics
+from apps.qr.utils import entity_uuid
+from apps.tourism.models import Review as PlaceReview, TouristPlace
+
+EN_WORDS = (
+    "lake temple trek mountain valley village market museum river view heritage festival homestay "
+    "garden bridge forest monastery sunrise boating culture food craft local trail"
+).split()
+NE_WORDS = "ताल मन्दिर हिमाल गाउँ बजार संग्रहालय नदी होमस्टे चाड संस्कृति खाना बगैंचा पुल जंगल".split()
+REVIEWS_EN = [
+    "Beautiful place, worth the walk", "Friendly staff and clean rooms", "Too crowded on weekends",
+    "Great view of the mountains at sunrise", "Food was average but the owners were kind", "Would visit again",
+]
+REVIEWS_NE = [
+    "धेरै राम्रो ठाउँ", "सफा र शान्त वातावरण", "खाना मीठो थियो", "फेरि आउन मन लाग्छ", "अलि महँगो लाग्यो",
+]
+# Most reviews are good, as on every review site
+RATING_WEIGHTS = [0.05, 0.07, 0.15, 0.33, 0.40]
+PLACE_CATEGORIES = ["lake", "temple", "viewpoint", "museum", "park", "heritage"]
+BUSINESS_TYPES = [choice for choice, _ in Business.BUSINESS_TYPE_CHOICES]
+# Roughly the extent of a large Nepali municipality
+ORIGIN, SPAN = (27.70, 85.30), 0.5
+BATCH_SIZE = 2000
+
+
+def words(rng, count, vocabulary=EN_WORDS):
+    return " ".join(rng.choices(vocabulary, k=count))
+
+
+def point(rng):
+    return ORIGIN[0] + rng.random() * SPAN, ORIGIN[1] + rng.random() * SPAN
+
+
+def create_municipalities(count, prefix="perf"):
+    """Get or create ``count`` tenants named ``{prefix}-{i}``, reachable as ``{prefix}-{i}.localhost``."""
+    found = []
+    for i in range(count):
+        slug = f"{prefix}-{i}"
+        municipality, _ = Municipality.objects.get_or_create(
+            unique_slug=slug, defaults={"name": slug, "full_domain": f"{slug}.localhost"}
+        )
+        found.append(municipality)
+    return found
+
+
+def build_pages(rng, municipality, count, published_ratio=0.8):
+    now = timezone.now()
+    pages = []
+    for i in range(count):
+        language = "np" if i % 4 == 3 else "en"
+        published = rng.random() < published_ratio
+        pages.append(
+            Page(
+                municipality=municipality,
+                title=words(rng, 4, NE_WORDS if language == "np" else EN_WORDS).title(),
+                slug=f"page-{i}",
+                language_code=language,
+                body=words(rng, 300, NE_WORDS if language == "np" else EN_WORDS),
+                status="published" if published else "draft",
+                published_at=now - timedelta(days=rng.randint(0, 365)) if published else None,
+            )
+        )
+    return pages
+
+
+def build_sections(rng, pages, per_page):
+    return [
+        PageSection(page=page, title=words(rng, 3).title(), content=words(rng, 120), position=position)
+        for page in pages
+        for position in range(per_page)
+    ]
+
+
+def build_places(rng, municipality, count):
+    places = []
+    for i in range(count):
+        lat, lng = point(rng)
+        places.append(
+            TouristPlace(
+                municipality=municipality, name=words(rng, 2).title(), slug=f"place-{i}", address=words(rng, 4),
+                latitude=lat, longitude=lng, geohash=encode_geohash(lat, lng),
+                category=rng.choice(PLACE_CATEGORIES), tags=words(rng, 3), seo_description=words(rng, 60),
+                is_approved=rng.random() < 0.9, approval_status="approved",
+            )
+        )
+    return places
+
+
+def build_businesses(rng, municipality, count):
+    businesses = []
+    for i in range(count):
+        lat, lng = point(rng)
+        # slug and reg_no are unique across tenants
+        key = f"m{municipality.pk}-{i}"
+        businesses.append(
+            Business(
+                municipality=municipality, name=words(rng, 2).title(), slug=key, reg_no=key,
+                address=words(rng, 4), business=rng.choice(BUSINESS_TYPES),
+                short_description=words(rng, 5)[:50], full_description=words(rng, 200), overview=words(rng, 80),
+                history=words(rng, 80), values=words(rng, 30), specialities=rng.sample(EN_WORDS, 3),
+                latitude=Decimal(f"{lat:.6f}"), longitude=Decimal(f"{lng:.6f}"), geohash=encode_geohash(lat, lng),
+                authorized_person=words(rng, 2).title(), status="published",
+            )
+        )
+    return businesses
+
+
+def build_events(rng, municipality, count, location, category):
+    now = timezone.now()
+    return [
+        Event(
+            municipality=municipality, title=words(rng, 3).title(), description=words(rng, 150),
+            short_summary=words(rng, 12), date=now + timedelta(days=rng.randint(-60, 120), hours=rng.randint(6, 20)),
+            location=location, category=category, slug=f"m{municipality.pk}-event-{i}", tags=rng.sample(EN_WORDS, 3),
+        )
+        for i in range(count)
+    ]
+
+
+def _snapshot_value(value):
+    return value.name or None if isinstance(value, FieldFile) else value
+
+
+def build_versions(rng, pages, per_page):
+    """History rows as Page.create_version() would have left them, oldest first."""
+    versions = []
+    for page in pages:
+        for number in range(1, per_page + 1):
+            snapshot = {field: _snapshot_value(getattr(page, field, None)) for field in VERSION_TRACKED_FIELDS}
+            snapshot["title"] = page.title if number == per_page else f"{page.title} (draft {number})"
+            versions.append(
+                PageVersion(
+                    page=page, version_number=number, title=snapshot["title"], body=page.body,
+                    snapshot=snapshot, change_note=f"Auto version {number}",
+                )
+            )
+    return versions
+
+
+def build_qrs(entity_type, objects, rng=None):
+    """QRs with seeded uuids when ``rng`` is given, so reruns produce the same codes."""
+    return [
+        QR(
+            uuid=uuid.UUID(int=rng.getrandbits(128), version=4) if rng else uuid.uuid4(),
+            name=f"{entity_type} {obj.pk}", entity_type=entity_type, entity_id=entity_uuid(obj.pk),
+        )
+        for obj in objects
+    ]
+
+
+def skewed(rng, items):
+    """Pick from ``items`` favouring the first ones, like real popularity."""
+    return items[int(len(items) * rng.random() ** 3)]
+
+
+def build_scans(rng, municipality, qrs, count):
+    """Scans skewed towards a few popular codes; also fills QR.total_scans to match."""
+    scans = [
+        QRAnalytics(
+            municipality=municipality, qr=skewed(rng, qrs),
+            ip_address=f"10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}",
+        )
+        for _ in range(count)
+    ]
+    totals = Counter(scan.qr_id for scan in scans)
+    for qr in qrs:
+        qr.total_scans += totals[qr.pk]
+    return scans
+
+
+def review_text(rng):
+    if rng.random() < 0.3:
+        return rng.choice(REVIEWS_NE)
+    return rng.choice(REVIEWS_EN)
+
+
+def plan_ratings(rng, targets, count):
+    """
+    [(target, stars)] for ``count`` reviews, and the RatedModel aggregates
+    set on each target so no recompute pass is needed after bulk inserts.
+    """
+    planned = [(skewed(rng, targets), rng.choices(range(1, 6), RATING_WEIGHTS)[0]) for _ in range(count)]
+    mean = getattr(settings, "RATING_PRIOR_MEAN", 3.5)
+    weight = getattr(settings, "RATING_PRIOR_WEIGHT", 5)
+    for target, stars in planned:
+        target.rating_count += 1
+        target.rating_sum += stars
+        setattr(target, f"rating_{stars}", getattr(target, f"rating_{stars}") + 1)
+    for target in targets:
+        if target.rating_count:
+            target.rating_score = (target.rating_sum + weight * mean) / (target.rating_count + weight)
+    return planned
+
+
+def build_place_reviews(rng, planned):
+    return [
+        PlaceReview(place=place, user_name=words(rng, 2).title(), rating=stars, comment=review_text(rng),
+                    is_approved=True)
+        for place, stars in planned
+    ]
+
+
+def build_business_reviews(rng, planned, user_ids):
+    return [
+        BusinessReview(business=business, user_id=rng.choice(user_ids) if user_ids else None, rating=stars,
+                       comment=review_text(rng), approved=True)
+        for business, stars in planned
+    ]
+
+
+def build_event_interactions(rng, planned, user_ids):
+    return [
+        EventPublicInteraction(event=event, user_id=rng.choice(user_ids) if user_ids else None, rating=stars,
+                               comment=review_text(rng))
+        for event, stars in planned
+    ]
+
+
+def insert(model, objects, municipality):
+    """
+    bulk_create that always hands back saved rows with their pks: MySQL does
+    not return auto-increment ids from a multi-row INSERT, so re-read them.
+    """
+    created = model.objects.bulk_create(objects, batch_size=BATCH_SIZE)
+    if not created or created[-1].pk is not None:
+        return created
+    return list(model.objects.filter(municipality=municipality).order_by("-pk")[: len(created)])[::-1]
+
+
+def insert_backdated(model, objects, municipality, date_field, days, since):
+    """
+    Insert rows spread evenly over the last ``days`` days. ``date_field`` is
+    auto_now_add, which bulk_create overwrites, so each day's share is
+    inserted and then moved back to its day (rows of this tenant newer than
+    ``since`` are the ones just inserted).
+    """
+    per_day = -(-len(objects) // max(days, 1))
+    for day in range(days):
+        chunk = objects[day * per_day:(day + 1) * per_day]
+        if not chunk:
+            break
+        model.objects.bulk_create(chunk, batch_size=BATCH_SIZE)
+        stamp = since - timedelta(days=day, hours=12)
+        model.objects.filter(municipality=municipality, **{f"{date_field}__gte": since}).update(
+            **{date_field: stamp, "created_at": stamp}
+        )
+
+
+def seed_tenant(rng, municipality, pages, sections, places, businesses, events, scans, versions=0, reviews=0,
+                favorites=0, user_ids=(), scan_days=1):
+    """
+    Fill one tenant with bulk inserts only (no save() side effects) and
+    return the created objects benchmarks pick targets from. Rating
+    aggregates and QR scan totals are filled in to match the inserted rows.
+    """
+    since = timezone.now()
+    page_rows = Page.objects.bulk_create(build_pages(rng, municipality, pages), batch_size=BATCH_SIZE)
+    PageSection.objects.bulk_create(build_sections(rng, page_rows, sections), batch_size=BATCH_SIZE)
+    PageVersion.objects.bulk_create(build_versions(rng, page_rows, versions), batch_size=BATCH_SIZE)
+
+    place_objects = build_places(rng, municipality, places)
+    place_reviews = plan_ratings(rng, place_objects, reviews)
+    place_rows = insert(TouristPlace, place_objects, municipality)
+    business_objects = build_businesses(rng, municipality, businesses)
+    business_reviews = plan_ratings(rng, business_objects, reviews)
+    business_rows = insert(Business, business_objects, municipality)
+    location = EventLocation.objects.create(name=words(rng, 2).title(), address="-", city="-", state="-")
+    category = EventCategory.objects.create(name=words(rng, 1))
+    event_objects = build_events(rng, municipality, events, location, category)
+    event_reviews = plan_ratings(rng, event_objects, reviews // 4)
+    event_rows = insert(Event, event_objects, municipality)
+    if place_rows is not place_objects or business_rows is not business_objects or event_rows is not event_objects:
+        # Re-read rows (MySQL): point the planned reviews at them by position
+        place_reviews = _remap(place_reviews, place_objects, place_rows)
+        business_reviews = _remap(business_reviews, business_objects, business_rows)
+        event_reviews = _remap(event_reviews, event_objects, event_rows)
+
+    PlaceReview.objects.bulk_create(build_place_reviews(rng, place_reviews), batch_size=BATCH_SIZE)
+    BusinessReview.objects.bulk_create(build_business_reviews(rng, business_reviews, user_ids), batch_size=BATCH_SIZE)
+    EventPublicInteraction.objects.bulk_create(
+        build_event_interactions(rng, event_reviews, user_ids), batch_size=BATCH_SIZE
+    )
+    if user_ids and favorites:
+        Favorite.objects.bulk_create(
+            [Favorite(user_id=rng.choice(user_ids), business=skewed(rng, business_rows)) for _ in range(favorites)],
+            batch_size=BATCH_SIZE,
+        )
+        Bookmark.objects.bulk_create(
+            [Bookmark(user_id=rng.choice(user_ids), event=skewed(rng, event_rows)) for _ in range(favorites)],
+            batch_size=BATCH_SIZE,
+        )
+
+    qr_rows = build_qrs("tourist_place", place_rows, rng) + build_qrs("business", business_rows, rng) \
+        + build_qrs("event", event_rows, rng)
+    scan_rows = build_scans(rng, municipality, qr_rows, scans)
+    QR.objects.bulk_create(qr_rows, batch_size=BATCH_SIZE)
+    insert_backdated(QRAnalytics, scan_rows, municipality, "scanned_at", scan_days, since)
+    return {
+        "municipality": municipality,
+        "pages": page_rows,
+        "places": place_rows,
+        "businesses": business_rows,
+        "events": event_rows,
+        "qrs": qr_rows,
+    }
+
+
+def _remap(planned, objects, rows):
+    position = {id(obj): i for i, obj in enumerate(objects)}
+    return [(rows[position[id(target)]], stars) for target, stars in planned]
+
+
+def seed_dataset(municipalities=3, pages=100, sections=3, places=300, businesses=300, events=200, scans=5000,
+                 seed=42, prefix="perf"):
+    """Seed ``municipalities`` tenants of the given sizes; returns one seed_tenant() dict per tenant."""
+    # The prefix is part of the seed: QR uuids come from the rng and must differ between datasets
+    rng = random.Random(f"{seed}:{prefix}")
+    return [
+        seed_tenant(rng, municipality, pages, sections, places, businesses, events, scans)
+        for municipality in create_municipalities(municipalities, prefix)
+    ]
@@ -0,0 +1,236 @@
+import contextvars
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger("django")
+
+_current = contextvars.ContextVar("query_profile", default=None)
+_stats = {}
+_stats_lock = threading.Lock()
+_MISSING = object()
+
+IN_LIST_RE = re.compile(r"\bIN \((?:%s, )*%s\)")
+SPACE_RE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when PROFILING_STRICT_BUDGETS is on, so test runs fail loudly."""
+
+
+class QueryProfile:
+    def __init__(self):
+        self.queries = 0
+        self.sql_ms = 0.0
+        self.fingerprints = Counter()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @property
+    def duplicates(self):
+        return sum(count - 1 for count in self.fingerprints.values() if count > 1)
+
+    def repeated(self):
+        return {sql: count for sql, count in self.fingerprints.most_common(5) if count > 1}
+
+
+def fingerprint(sql):
+    """SQL with its parameters already out; IN lists of any length collapse to one shape."""
+    return IN_LIST_RE.sub("IN (...)", SPACE_RE.sub(" ", sql))
+
+
+def _record_query(execute, sql, params, many, context):
+    profile = _current.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.queries += 1
+        profile.sql_ms += (time.perf_counter() - started) * 1000
+        profile.fingerprints[fingerprint(sql)] += 1
+
+
+def _counted_get(method):
+    def get(key, default=None, *args, **kwargs):
+        value = method(key, _MISSING, *args, **kwargs)
+        profile = _current.get()
+        if profile is not None:
+            if value is _MISSING:
+                profile.cache_misses += 1
+            else:
+                profile.cache_hits += 1
+        return default if value is _MISSING else value
+    return get
+
+
+def _counted_get_many(method):
+    def get_many(keys, *args, **kwargs):
+        keys = list(keys)
+        found = method(keys, *args, **kwargs)
+        profile = _current.get()
+        if profile is not None:
+            profile.cache_hits += len(found)
+            profile.cache_misses += len(keys) - len(found)
+        return found
+    return get_many
+
+
+def instrument_caches():
+    """Count hits and misses on this thread's cache instances (once each)."""
+    for cache in caches.all():
+        if getattr(cache, "_profiled", False):
+            continue
+        cache.get = _counted_get(cache.get)
+        cache.get_many = _counted_get_many(cache.get_many)
+        cache._profiled = True
+
+
+@contextmanager
+def profile_queries():
+    """Collect a QueryProfile for everything run inside the block, on every database."""
+    profile = QueryProfile()
+    token = _current.set(profile)
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(_record_query))
+            yield profile
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def assert_max_queries(budget):
+    """For tests: fail if the block runs more than ``budget`` queries."""
+    with profile_queries() as profile:
+        yield profile
+    if profile.queries > budget:
+        raise QueryBudgetExceeded(
+            f"{profile.queries} queries > budget {budget}; repeated: {profile.repeated()}"
+        )
+
+
+def view_budget(view_func, method):
+    """
+    A view's query budget: ``query_budgets[action]`` or ``query_budget`` on
+    the DRF view class, or a ``query_budget`` attribute on a function view.
+    """
+    view_class = getattr(view_func, "cls", None) or getattr(view_func, "view_class", None)
+    if view_class is None:
+        return getattr(view_func, "query_budget", None)
+    action = (getattr(view_func, "actions", None) or {}).get(method.lower())
+    budgets = getattr(view_class, "query_budgets", None) or {}
+    return budgets.get(action, getattr(view_class, "query_budget", None))
+
+
+def record(route, profile, wall_ms, budget):
+    over = budget is not None and profile.queries > budget
+    with _stats_lock:
+        entry = _stats.setdefault(
+            route,
+            {
+                "requests": 0, "queries": 0, "max_queries": 0, "sql_ms": 0.0, "wall_ms": 0.0,
+                "max_wall_ms": 0.0, "duplicates": 0, "cache_hits": 0, "cache_misses": 0,
+                "budget": budget, "over_budget": 0, "repeated": Counter(),
+            },
+        )
+        entry["requests"] += 1
+        entry["queries"] += profile.queries
+        entry["max_queries"] = max(entry["max_queries"], profile.queries)
+        entry["sql_ms"] += profile.sql_ms
+        entry["wall_ms"] += wall_ms
+        entry["max_wall_ms"] = max(entry["max_wall_ms"], wall_ms)
+        entry["duplicates"] += profile.duplicates
+        entry["cache_hits"] += profile.cache_hits
+        entry["cache_misses"] += profile.cache_misses
+        entry["over_budget"] += over
+        entry["repeated"].update(profile.repeated())
+        # Bounded: only the worst offenders are interesting
+        entry["repeated"] = Counter(dict(entry["repeated"].most_common(10)))
+    return over
+
+
+def route_stats():
+    """Aggregated stats of this process, slowest total SQL time first."""
+    with _stats_lock:
+        rows = []
+        for route, entry in _stats.items():
+            requests = entry["requests"]
+            rows.append(
+                {
+                    "route": route,
+                    "requests": requests,
+                    "avg_queries": round(entry["queries"] / requests, 2),
+                    "max_queries": entry["max_queries"],
+                    "budget": entry["budget"],
+                    "over_budget": entry["over_budget"],
+                    "avg_sql_ms": round(entry["sql_ms"] / requests, 2),
+                    "total_sql_ms": round(entry["sql_ms"], 2),
+                    "avg_wall_ms": round(entry["wall_ms"] / requests, 2),
+                    "max_wall_ms": round(entry["max_wall_ms"], 2),
+                    "duplicates": entry["duplicates"],
+                    "cache_hits": entry["cache_hits"],
+                    "cache_misses": entry["cache_misses"],
+                    "repeated": dict(entry["repeated"]),
+                }
+            )
+    return sorted(rows, key=lambda row: -row["total_sql_ms"])
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+class QueryProfilingMiddleware:
+    """
+    Per request: query count, SQL time, repeated query shapes and cache
+    hits/misses, aggregated per route (see route_stats). Adds a Server-Timing
+    header when PROFILING_SERVER_TIMING is on, and checks the view's query
+    budget, raising QueryBudgetExceeded when PROFILING_STRICT_BUDGETS is on.
+    Disabled entirely unless PROFILING_ENABLED.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "PROFILING_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        instrument_caches()
+        started = time.perf_counter()
+        with profile_queries() as profile:
+            response = self.get_response(request)
+        wall_ms = (time.perf_counter() - started) * 1000
+
+        match = request.resolver_match
+        if match is None:
+            return response
+        # Router patterns are regexes; drop their anchors for readability
+        route = f"{request.method} /{match.route.replace('^', '').replace('$', '')}"
+        budget = getattr(request, "_query_budget", None)
+        if record(route, profile, wall_ms, budget):
+            message = f"{route}: {profile.queries} queries > budget {budget}; repeated: {profile.repeated()}"
+            if getattr(settings, "PROFILING_STRICT_BUDGETS", False):
+                raise QueryBudgetExceeded(message)
+            logger.warning(f"Query budget exceeded: {message}")
+        if getattr(settings, "PROFILING_SERVER_TIMING", False):
+            response["Server-Timing"] = (
+                f'db;dur={profile.sql_ms:.1f};desc="{profile.queries} queries, {profile.duplicates} repeated", '
+                f'cache;desc="{profile.cache_hits} hits, {profile.cache_misses} misses", '
+                f"total;dur={wall_ms:.1f}"
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._query_budget = view_budget(view_func, request.method)
@@ -0,0 +1,108 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, Value, When
+from django.db.models.functions import Cast
+from django.db.models.signals import post_delete, post_init, post_save
+
+from apps.core.models import RatedModel
+
+# (review model, target field, counted filter) registered by track_ratings()
+TRACKED = []
+
+RATING_FIELDS = RatedModel.RATING_FIELDS
+
+
+def bayesian_score():
+    """
+    (sum + m * C) / (count + m): a few reviews are pulled towards the prior mean C,
+    so one 5-star review does not outrank fifty 4.8 ones.
+    """
+    mean = getattr(settings, "RATING_PRIOR_MEAN", 3.5)
+    weight = getattr(settings, "RATING_PRIOR_WEIGHT", 5)
+    return Case(
+        When(rating_count=0, then=Value(0.0)),
+        default=(Cast("rating_sum", FloatField()) + weight * mean) / (Cast("rating_count", FloatField()) + weight),
+        output_field=FloatField(),
+    )
+
+
+def adjust_rating(model, pk, rating, step):
+    """
+    Add (step=1) or remove (step=-1) one rating on ``model`` row ``pk``.
+    The score is computed in a second statement because MySQL evaluates
+    SET clauses left to right against already-updated columns.
+    """
+    if pk is None or not 1 <= rating <= 5:
+        return
+    with transaction.atomic():
+        model.objects.filter(pk=pk).update(
+            rating_count=F("rating_count") + step,
+            rating_sum=F("rating_sum") + step * rating,
+            **{f"rating_{rating}": F(f"rating_{rating}") + step},
+        )
+        model.objects.filter(pk=pk).update(rating_score=bayesian_score())
+
+
+def recompute_ratings(review_model, target_field, counted_filter):
+    """
+    Rebuild the aggregates of every row rated by ``review_model`` from scratch.
+    Returns the number of rows updated.
+    """
+    target_model = review_model._meta.get_field(target_field).related_model
+    histogram = {}
+    rows = (
+        review_model.objects.filter(rating__gte=1, rating__lte=5, **counted_filter)
+        .values_list(f"{target_field}_id", "rating")
+        .annotate(n=Count("pk"))
+    )
+    for target_id, rating, n in rows:
+        histogram.setdefault(target_id, [0] * 6)[rating] = n
+    with transaction.atomic():
+        target_model.objects.update(**{field: 0 for field in RATING_FIELDS})
+        for target_id, counts in histogram.items():
+            target_model.objects.filter(pk=target_id).update(
+                rating_count=sum(counts),
+                rating_sum=sum(star * n for star, n in enumerate(counts)),
+                **{f"rating_{star}": counts[star] for star in range(1, 6)},
+            )
+        target_model.objects.update(rating_score=bayesian_score())
+    return len(histogram)
+
+
+def track_ratings(review_model, target_field, counted_filter):
+    """
+    Keep the RatedModel aggregates of ``target_field`` in step with
+    ``review_model`` saves and deletes. ``counted_filter`` holds the field
+    values a review needs to count, e.g. {"approved": True}.
+
+    Updates through QuerySet.update() bypass this; use recompute_ratings().
+    """
+    TRACKED.append((review_model, target_field, counted_filter))
+    target_model = review_model._meta.get_field(target_field).related_model
+    attname = review_model._meta.get_field(target_field).attname
+    label = review_model._meta.label_lower
+
+    def state(instance):
+        counted = all(getattr(instance, field) == value for field, value in counted_filter.items())
+        return (getattr(instance, attname), instance.rating) if counted else None
+
+    def remember(sender, instance, **kwargs):
+        instance._rating_state = state(instance) if instance.pk is not None else None
+
+    def on_save(sender, instance, **kwargs):
+        before, after = getattr(instance, "_rating_state", None), state(instance)
+        if before != after:
+            if before is not None:
+                adjust_rating(target_model, before[0], before[1], -1)
+            if after is not None:
+                adjust_rating(target_model, after[0], after[1], 1)
+        instance._rating_state = after
+
+    def on_delete(sender, instance, **kwargs):
+        before = getattr(instance, "_rating_state", None)
+        if before is not None:
+            adjust_rating(target_model, before[0], before[1], -1)
+
+    post_init.connect(remember, sender=review_model, weak=False, dispatch_uid=f"ratings-init-{label}")
+    post_save.connect(on_save, sender=review_model, weak=False, dispatch_uid=f"ratings-save-{label}")
+    post_delete.connect(on_delete, sender=review_model, weak=False, dispatch_uid=f"ratings-delete-{label}")
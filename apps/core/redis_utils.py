@@ -1,27 +1,153 @@
+"""
+Redis access for code that needs more than the Django cache API: one pooled
+client per process (pool size and socket timeouts come from CACHES), batched
+helpers, Lua scripts for atomic patterns, and a circuit breaker so that a
+slow or unavailable Redis makes callers fall back to a default instead of
+stalling requests.
+"""
+import functools
+import logging
+import threading
+import time
+
+from django.conf import settings
 from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+
+logger = logging.getLogger("django")
+
+# INCR that starts a fresh window: the first increment sets the expiry, in one round trip
+INCR_EXPIRE_SCRIPT = """
+local count = redis.call("INCR", KEYS[1])
+if count == 1 then
+    redis.call("PEXPIRE", KEYS[1], ARGV[1])
+end
+return {count, redis.call("PTTL", KEYS[1])}
+"""
+
+_scripts = {}
+_breaker_lock = threading.Lock()
+_breaker = {"failures": 0, "open_until": 0.0}
+
 
 def get_redis():
     return get_redis_connection("default")
 
+
+def script(source):
+    """A registered script (EVALSHA, reloaded automatically after a Redis restart)."""
+    if source not in _scripts:
+        _scripts[source] = get_redis().register_script(source)
+    return _scripts[source]
+
+
+def circuit_open():
+    return time.monotonic() < _breaker["open_until"]
+
+
+def _record_failure(error):
+    with _breaker_lock:
+        _breaker["failures"] += 1
+        if _breaker["failures"] >= getattr(settings, "REDIS_BREAKER_FAILURES", 5):
+            _breaker["open_until"] = time.monotonic() + getattr(settings, "REDIS_BREAKER_COOLDOWN_SECONDS", 10)
+            _breaker["failures"] = 0
+            logger.error(f"Redis unavailable, skipping it for a while: {error}")
+
+
+def _record_success():
+    if _breaker["failures"]:
+        with _breaker_lock:
+            _breaker["failures"] = 0
+
+
+def fail_open(default=None):
+    """
+    Decorator: return ``default`` instead of raising when Redis errors or
+    times out, and without trying at all while the circuit is open (after
+    REDIS_BREAKER_FAILURES consecutive errors, for REDIS_BREAKER_COOLDOWN_SECONDS).
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if circuit_open():
+                return default
+            try:
+                result = func(*args, **kwargs)
+            except RedisError as e:
+                _record_failure(e)
+                logger.warning(f"Redis call {func.__name__} failed: {e}")
+                return default
+            _record_success()
+            return result
+        return wrapper
+    return decorator
+
+
+@fail_open(default=0)
+def delete_many(keys):
+    keys = list(keys)
+    return get_redis().delete(*keys) if keys else 0
+
+
+@fail_open(default={})
+def get_many(keys):
+    """MGET: {key: raw value} for the keys that exist."""
+    keys = list(keys)
+    if not keys:
+        return {}
+    return {key: value for key, value in zip(keys, get_redis().mget(keys)) if value is not None}
+
+
+@fail_open(default=False)
+def set_many(mapping, seconds=None):
+    """Set every key of ``mapping`` in one pipelined round trip."""
+    with get_redis().pipeline(transaction=False) as pipe:
+        for key, value in mapping.items():
+            pipe.set(key, value, ex=seconds)
+        pipe.execute()
+    return True
+
+
+@fail_open(default=(None, None))
+def incr_with_expiry(key, seconds):
+    """
+    Increment a counter that expires ``seconds`` after its first increment.
+    Returns (count, milliseconds left), or (None, None) when Redis is unavailable.
+    """
+    count, ttl = script(INCR_EXPIRE_SCRIPT)(keys=[key], args=[int(seconds * 1000)])
+    return count, ttl
+
+
+@fail_open()
 def set_withdrawal_limit(wallet_id, seconds=86400):
-    redis_conn = get_redis()
-    redis_key = f"withdrawal_limit:{wallet_id}"
-    redis_conn.set(redis_key, 1, ex=seconds)
+    get_redis().set(f"withdrawal_limit:{wallet_id}", 1, ex=seconds)
 
+
+# Fails closed: a limit must not lapse because Redis is down
+@fail_open(default=b"1")
 def check_withdrawal_limit(wallet_id):
-    redis_conn = get_redis()
-    redis_key = f"withdrawal_limit:{wallet_id}"
-    return redis_conn.get(redis_key)
+    return get_redis().get(f"withdrawal_limit:{wallet_id}")
+
 
+@fail_open(default=False)
 def set_token(key, value, seconds):
-    redis_conn = get_redis()
-    redis_conn.set(key, value, ex=seconds)
+    get_redis().set(key, value, ex=seconds)
+    return True
 
+
+@fail_open()
 def get_token(key):
-    redis_conn = get_redis()
-    token = redis_conn.get(key)
+    token = get_redis().get(key)
     return token.decode() if token else None
 
+
+@fail_open()
+def pop_token(key):
+    """Read and delete a one-time token atomically, so it cannot be used twice."""
+    token = get_redis().getdel(key)
+    return token.decode() if token else None
+
+
+@fail_open()
 def delete_token(key):
-    redis_conn = get_redis()
-    redis_conn.delete(key)
\ No newline at end of file
+    get_redis().delete(key)
@@ -0,0 +1,29 @@
+from rest_framework import serializers
+
+
+class FieldSelectionModelSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer taking an optional ``fields`` argument: only those of its
+    fields are rendered. Views pass the ``?fields=`` query parameter here
+    (see MunicipalityTenantModelViewSet).
+    """
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    def model_fields_to_load(self):
+        """
+        Model field names backing the selected fields, for ``.only()``, or
+        None if one of them reads something else (a property, a relation
+        path) and the full row is needed.
+        """
+        model_fields = {field.name for field in self.Meta.model._meta.concrete_fields}
+        sources = {"pk"}
+        for field in self.fields.values():
+            if field.source not in model_fields and field.source != "pk":
+                return None
+            sources.add(field.source)
+        return sources
@@ -0,0 +1,121 @@
+import logging
+import math
+import pickle
+import random
+import time
+import uuid
+
+from django.conf import settings
+
+from apps.core.redis_utils import fail_open, get_redis, script
+
+logger = logging.getLogger("django")
+
+# Delete the lock only if we still hold it: after our lease ran out someone else may
+RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+POLL_SECONDS = 0.02
+# Returned by acquire() when Redis is unavailable: compute, but without a lock to release
+NO_LOCK = ""
+
+
+def lock_key(key):
+    return f"{key}:lock"
+
+
+@fail_open(default=NO_LOCK)
+def acquire(redis_conn, key, lease):
+    """Take the recompute lock of ``key`` for ``lease`` seconds. Returns a token, or None if it is held."""
+    token = uuid.uuid4().hex
+    if redis_conn.set(lock_key(key), token, nx=True, px=int(lease * 1000)):
+        return token
+    return None
+
+
+@fail_open()
+def release(redis_conn, key, token):
+    script(RELEASE_SCRIPT)(keys=[lock_key(key)], args=[token])
+
+
+def should_refresh(expires_at, delta, beta, now=None):
+    """
+    Probabilistic early expiry ("XFetch"): a request refreshes early with a
+    probability rising as expiry nears, faster for entries that took
+    ``delta`` seconds to compute. Past ``expires_at`` it is always true.
+    """
+    now = time.time() if now is None else now
+    return now - delta * beta * math.log(1.0 - random.random()) >= expires_at
+
+
+@fail_open()
+def _read(redis_conn, key):
+    return redis_conn.get(key)
+
+
+@fail_open()
+def _store(redis_conn, key, value, delta, ttl, stale_ttl):
+    entry = (value, time.time() + ttl, delta)
+    # Kept past its expiry for stale_ttl so a stale copy can be served meanwhile
+    redis_conn.set(key, pickle.dumps(entry, pickle.HIGHEST_PROTOCOL), ex=max(1, int(ttl + stale_ttl)))
+
+
+def _compute_and_store(redis_conn, key, compute, ttl, stale_ttl, token):
+    started = time.perf_counter()
+    try:
+        value = compute()
+        _store(redis_conn, key, value, time.perf_counter() - started, ttl, stale_ttl)
+        return value
+    finally:
+        if token != NO_LOCK:
+            release(redis_conn, key, token)
+
+
+def get_or_compute(key, compute, ttl, stale_ttl=None, lease=None, wait=None, beta=None):
+    """
+    Return the cached value of ``key``, calling ``compute()`` at most once at a
+    time across all processes to fill it:
+
+    - fresh entries are returned as they are, except that one request may
+      refresh them a little early (see should_refresh);
+    - expired entries are served stale for up to ``stale_ttl`` seconds while
+      the one request holding the lock recomputes;
+    - on a cold miss the lock holder computes and everyone else waits up to
+      ``wait`` seconds for its result, then computes without the cache.
+
+    The lock lease is short (``lease`` seconds) so a crashed holder cannot
+    block recomputation for long. Without Redis every call just computes.
+    """
+    stale_ttl = getattr(settings, "SINGLEFLIGHT_STALE_SECONDS", 60) if stale_ttl is None else stale_ttl
+    lease = getattr(settings, "SINGLEFLIGHT_LEASE_SECONDS", 10) if lease is None else lease
+    wait = getattr(settings, "SINGLEFLIGHT_WAIT_SECONDS", 5) if wait is None else wait
+    beta = getattr(settings, "SINGLEFLIGHT_BETA", 1.0) if beta is None else beta
+    redis_conn = get_redis()
+
+    raw = _read(redis_conn, key)
+    if raw is not None:
+        value, expires_at, delta = pickle.loads(raw)
+        if not should_refresh(expires_at, delta, beta):
+            return value
+        token = acquire(redis_conn, key, lease)
+        if token is None:
+            # Someone is already refreshing: keep serving what we have
+            return value
+        return _compute_and_store(redis_conn, key, compute, ttl, stale_ttl, token)
+
+    deadline = time.monotonic() + wait
+    while True:
+        token = acquire(redis_conn, key, lease)
+        if token is not None:
+            return _compute_and_store(redis_conn, key, compute, ttl, stale_ttl, token)
+        time.sleep(POLL_SECONDS)
+        raw = _read(redis_conn, key)
+        if raw is not None:
+            return pickle.loads(raw)[0]
+        if time.monotonic() >= deadline:
+            logger.warning(f"Single-flight wait for {key} timed out; computing without the cache")
+            return compute()
+
@@ -0,0 +1,98 @@
+"""
+SMS delivery. Requests only queue messages (apps.core.tasks.send_sms); the
+task sends them through the backend named by SMS_BACKEND, retrying
+transient failures with exponential backoff, and keeps each provider under
+its SMS_RATE_LIMITS across all workers.
+"""
+import logging
+import os
+
+from django.conf import settings
+
+from apps.core.redis_utils import incr_with_expiry
+
+logger = logging.getLogger("django")
+
+
+class SMSError(Exception):
+    """Sending failed. ``retryable`` is False when sending again cannot help (e.g. a rejected number)."""
+
+    def __init__(self, message, retryable=True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class SamayaSMSBackend:
+    name = "samaya"
+    url = "https://samayasms.com.np/smsapi/index.php"
+
+    def __init__(self):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        # One pooled session per worker process: keep-alive instead of a TCP/TLS handshake per message.
+        # Retries are the task's job, so the adapter does not add its own.
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(
+            pool_maxsize=getattr(settings, "SMS_POOL_SIZE", 10), max_retries=0,
+        ))
+
+    def send(self, phone, message):
+        import requests
+
+        payload = {
+            "key": os.environ.get("SMS_API_KEY"),
+            "routeid": os.environ.get("SMS_ROUTE_ID"),
+            "type": "text",
+            "contacts": phone,
+            "senderid": os.environ.get("SMS_SENDER_ID"),
+            "msg": message,
+        }
+        timeout = (getattr(settings, "SMS_CONNECT_TIMEOUT", 3), getattr(settings, "SMS_READ_TIMEOUT", 10))
+        try:
+            response = self.session.post(self.url, data=payload, timeout=timeout)
+        except requests.RequestException as e:
+            raise SMSError(f"{type(e).__name__}: {e}") from e
+        if response.status_code == 429 or response.status_code >= 500:
+            raise SMSError(f"Gateway returned {response.status_code}: {response.text[:200]}")
+        if response.status_code >= 400:
+            raise SMSError(f"Gateway rejected the message ({response.status_code}): {response.text[:200]}",
+                           retryable=False)
+        logger.info(f"SMS sent to {phone}, API status: {response.status_code}, response: {response.text}")
+
+
+class LocalSMSBackend:
+    """Keeps messages in ``outbox`` instead of sending them: for tests and local development."""
+    name = "local"
+    outbox = []
+
+    def send(self, phone, message):
+        self.outbox.append({"phone": phone, "message": message})
+        logger.info(f"SMS to {phone} kept in the local outbox")
+
+
+_BACKENDS = {"samaya": SamayaSMSBackend, "local": LocalSMSBackend}
+_backend = None
+
+
+def get_sms_backend():
+    global _backend
+    name = getattr(settings, "SMS_BACKEND", "samaya")
+    if not isinstance(_backend, _BACKENDS[name]):
+        _backend = _BACKENDS[name]()
+    return _backend
+
+
+def rate_limit_wait(provider):
+    """
+    Take a slot in the provider's per-second budget (SMS_RATE_LIMITS, shared by
+    all workers). Returns 0 when the message may go now, otherwise the seconds
+    until the next window. Without Redis messages are not held back.
+    """
+    limit = getattr(settings, "SMS_RATE_LIMITS", {}).get(provider)
+    if not limit:
+        return 0
+    count, ttl = incr_with_expiry(f"sms:rate:{provider}", 1)
+    if count is None or count <= limit:
+        return 0
+    return max(ttl, 1) / 1000
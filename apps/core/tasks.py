@@ -0,0 +1,38 @@
+import logging
+
+from celery import shared_task
+from celery.utils.time import get_exponential_backoff_interval
+from django.conf import settings
+
+from apps.core.sms import SMSError, get_sms_backend, rate_limit_wait
+
+logger = logging.getLogger("django")
+
+
+# Nothing reads the result, and subscribing to it would make queuing wait on the result backend too
+@shared_task(bind=True, name="core.send_sms", ignore_result=True)
+def send_sms(self, phone, message, failures=0):
+    """
+    Send one SMS. Transient gateway errors are retried after an exponential,
+    jittered backoff, up to SMS_MAX_RETRIES times. Waiting for the
+    provider's rate limit does not count as a failure.
+    """
+    backend = get_sms_backend()
+    wait = rate_limit_wait(backend.name)
+    if wait:
+        raise self.retry(countdown=wait, max_retries=None)
+    try:
+        backend.send(phone, message)
+    except SMSError as e:
+        if not e.retryable or failures >= getattr(settings, "SMS_MAX_RETRIES", 5):
+            logger.error(f"Giving up on SMS to {phone} after {failures + 1} attempts: {e}")
+            return False
+        countdown = get_exponential_backoff_interval(
+            getattr(settings, "SMS_RETRY_BACKOFF", 2), failures,
+            getattr(settings, "SMS_RETRY_BACKOFF_MAX", 300), full_jitter=True,
+        )
+        logger.warning(f"SMS to {phone} failed, retrying in {countdown}s: {e}")
+        raise self.retry(
+            args=(phone, message), kwargs={"failures": failures + 1}, countdown=countdown, max_retries=None,
+        )
+    return True
@@ -0,0 +1,143 @@
+import hashlib
+import logging
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils.translation import get_language
+from rest_framework.response import Response
+
+from apps.core.db_router import primary
+from apps.core.redis_utils import get_many, get_redis, set_many
+from apps.core.singleflight import get_or_compute
+
+logger = logging.getLogger("django")
+
+
+def generation_key(label, municipality_id):
+    return f"tc:{municipality_id}:{label}:gen"
+
+
+def _fresh_generation():
+    # A clock value rather than 0, so entries cached under a generation that
+    # was evicted from the cache can never become current again
+    return time.time_ns() // 1000
+
+
+def generations(labels, municipality_id):
+    """
+    Current generation of each model label for one tenant, in one MGET (plus
+    one pipelined SET for labels that have none yet). Without Redis every call
+    gets fresh generations, so nothing cached before the outage is served.
+    """
+    keys = [generation_key(label, municipality_id) for label in labels]
+    found = {key: int(value) for key, value in get_many(keys).items()}
+    missing = {key: _fresh_generation() for key in keys if key not in found}
+    if missing:
+        set_many(missing)
+        found.update(missing)
+    return [found[key] for key in keys]
+
+
+def invalidate(model, municipality_id):
+    """
+    Drop every cached response of one tenant that depends on ``model``, by
+    moving to a new generation. Code writing through QuerySet.update() or
+    bulk_create() calls this itself; signals cover save() and delete().
+    """
+    key = generation_key(model._meta.label_lower, municipality_id)
+    redis_conn = get_redis()
+    # A missing generation is replaced by a fresh one, which is just as new
+    if not redis_conn.set(key, _fresh_generation(), nx=True):
+        redis_conn.incr(key)
+
+
+def _tenant_of(instance, path):
+    value = instance
+    try:
+        for name in path.split("."):
+            value = getattr(value, name)
+    except ObjectDoesNotExist:
+        # The parent is being deleted too; its own signal invalidates
+        return None
+    return value
+
+
+def track_tenant_cache(model, tenant_path="municipality_id"):
+    """
+    Invalidate the tenant's cached responses depending on ``model`` after
+    each save or delete commits. ``tenant_path`` leads from an instance to
+    its municipality id, e.g. "business.municipality_id" for reviews.
+    """
+    label = model._meta.label_lower
+
+    def on_change(sender, instance, **kwargs):
+        municipality_id = _tenant_of(instance, tenant_path)
+        if municipality_id is None:
+            return
+
+        def bump():
+            try:
+                invalidate(model, municipality_id)
+            except Exception as e:
+                logger.warning(f"Tenant cache invalidation failed for {label} in {municipality_id}: {e}")
+        transaction.on_commit(bump)
+
+    post_save.connect(on_change, sender=model, weak=False, dispatch_uid=f"tenant-cache-save-{label}")
+    post_delete.connect(on_change, sender=model, weak=False, dispatch_uid=f"tenant-cache-delete-{label}")
+
+
+class TenantCacheMixin:
+    """
+    Caches the list and retrieve responses of a MunicipalityTenantModelViewSet
+    per tenant, query string and language. Keys embed the tenant's generation
+    of every model in ``cache_models`` (default: the queryset's model), so a
+    write invalidates exactly that tenant's entries; register the models with
+    track_tenant_cache(). Responses must not vary by user.
+
+    Entries are filled through single-flight get_or_compute(), so a miss or
+    an expiry is recomputed by one request while the others wait for it or
+    are served the stale copy.
+    """
+    cache_models = None
+    cache_actions = ("list", "retrieve")
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    def get_cache_models(self):
+        return self.cache_models or (self.queryset.model,)
+
+    def response_cache_key(self, request):
+        municipality_id = request.tenant.pk
+        labels = [model._meta.label_lower for model in self.get_cache_models()]
+        params = urlencode(sorted(request.query_params.lists()), doseq=True)
+        raw = "|".join(
+            [
+                request.scheme, type(self).__module__, type(self).__name__, self.action,
+                urlencode(sorted(self.kwargs.items())), params, get_language() or "",
+                ",".join(map(str, generations(labels, municipality_id))),
+            ]
+        )
+        return f"tc:{municipality_id}:resp:{hashlib.md5(raw.encode()).hexdigest()}"
+
+    def cached_response(self, method, request, *args, **kwargs):
+        if not getattr(settings, "TENANT_RESPONSE_CACHE_ENABLED", True) or self.action not in self.cache_actions:
+            return method(request, *args, **kwargs)
+        data = get_or_compute(
+            self.response_cache_key(request),
+            lambda: self.fill(method, request, *args, **kwargs),
+            getattr(settings, "TENANT_RESPONSE_CACHE_TIMEOUT", 300),
+        )
+        return Response(data)
+
+    def fill(self, method, request, *args, **kwargs):
+        # Read the primary: a fill from a lagging replica would be cached under the new generation
+        with primary():
+            return method(request, *args, **kwargs).data
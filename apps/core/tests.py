@@ -1,3 +1,174 @@
-from django.test import TestCase
+import uuid
+from unittest import mock
 
-# Create your tests here.
+import requests
+from celery.exceptions import Retry
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import resolve
+
+from apps.business.models import Business
+from apps.cms.models import Page
+from apps.core.profiling import QueryBudgetExceeded, assert_max_queries, view_budget
+from apps.core.redis_utils import get_redis
+from apps.core.sms import LocalSMSBackend, SMSError, SamayaSMSBackend, rate_limit_wait
+from apps.core.tasks import send_sms
+from apps.event.views import EventViewSet
+from apps.municipality import middleware
+from apps.municipality.models import Municipality
+from apps.qr.models import QR
+from apps.qr.resolver import publish_target
+from apps.trending.rankings import store
+from apps.trending.views import trending_list
+
+
+class QueryBudgetTests(TestCase):
+    """The budgeted public endpoints stay within their query budgets, tenant lookup included."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.municipality = Municipality.objects.create(
+            name="Budget", unique_slug="budget", full_domain="budget.example.com"
+        )
+        cls.page = Page.objects.create(
+            municipality=cls.municipality, title="About", slug="about", status="published"
+        )
+        for i in range(3):
+            Business.objects.create(
+                municipality=cls.municipality, name=f"Shop {i}", slug=f"shop-{i}", reg_no=f"REG-{i}",
+                latitude=27.7, longitude=85.3, status="published", is_approved=True,
+            )
+
+    def setUp(self):
+        # Every request pays for the tenant lookup, as after a cache expiry
+        middleware._tenant_cache.clear()
+
+    def get(self, path):
+        budget = view_budget(resolve(path).func, "GET")
+        self.assertIsNotNone(budget, f"{path} has no query budget")
+        with assert_max_queries(budget):
+            return self.client.get(path, HTTP_HOST=self.municipality.full_domain)
+
+    def test_trending_list(self):
+        store(self.municipality.pk, "business", [])
+        response = self.get("/api/trending/business/")
+        self.assertEqual(response.status_code, 200)
+
+    def test_qr_scan_redirect(self):
+        qr = QR.objects.create(name="Gate", entity_type="business", entity_id=uuid.uuid4())
+        publish_target(qr)
+        response = self.get(f"/qr/business/{qr.entity_id}/{qr.uuid}/")
+        self.assertEqual(response.status_code, 302)
+
+    def test_public_page_cold_and_cached(self):
+        path = f"/api/cms/public/pages/{self.page.slug}/"
+        for _ in range(2):
+            response = self.get(path)
+            self.assertEqual(response.status_code, 200)
+
+    def test_viewset_lists(self):
+        for path in ("/api/business/", "/api/event/events/", "/api/tourism/places/"):
+            with self.subTest(path=path):
+                self.assertEqual(self.get(path).status_code, 200)
+
+    def test_view_budget_lookup(self):
+        self.assertEqual(view_budget(trending_list, "GET"), trending_list.query_budget)
+        self.assertEqual(view_budget(EventViewSet.as_view({"get": "list"}), "GET"), EventViewSet.query_budgets["list"])
+
+    def test_exceeding_the_budget_fails(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            with assert_max_queries(0):
+                Municipality.objects.count()
+
+
+@override_settings(SMS_BACKEND="samaya", SMS_MAX_RETRIES=2, SMS_RETRY_BACKOFF=2, SMS_RETRY_BACKOFF_MAX=300)
+class SendSMSTests(SimpleTestCase):
+    """send_sms against a mocked gateway; retry() is patched so retries are inspected, not run."""
+
+    def setUp(self):
+        # A fresh backend per test, and no shared rate limit
+        for patcher in (mock.patch("apps.core.sms._backend", None),
+                        mock.patch("apps.core.tasks.rate_limit_wait", return_value=0)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def post(self, status_code=200, side_effect=None):
+        response = mock.Mock(status_code=status_code, text="gateway says")
+        return mock.patch.object(requests.Session, "post", return_value=response, side_effect=side_effect)
+
+    def run_task(self, failures=0):
+        with mock.patch.object(send_sms, "retry", side_effect=Retry()) as retry:
+            try:
+                result = send_sms("9800000000", "Your OTP is 123456", failures=failures)
+            except Retry:
+                result = None
+        return result, retry
+
+    def test_sent(self):
+        with self.post(200) as post:
+            result, retry = self.run_task()
+        self.assertTrue(result)
+        post.assert_called_once()
+        retry.assert_not_called()
+
+    def test_retries_server_errors_with_jittered_backoff(self):
+        with self.post(503):
+            result, retry = self.run_task(failures=1)
+        self.assertIsNone(result)
+        kwargs = retry.call_args.kwargs
+        self.assertEqual(kwargs["kwargs"], {"failures": 2})
+        # Full jitter: anywhere up to 2 * 2**1 seconds
+        self.assertTrue(0 <= kwargs["countdown"] <= 4)
+
+    def test_retries_timeouts(self):
+        with self.post(side_effect=requests.Timeout("read timed out")):
+            result, retry = self.run_task()
+        self.assertIsNone(result)
+        self.assertEqual(retry.call_args.kwargs["kwargs"], {"failures": 1})
+
+    def test_gives_up_after_max_retries(self):
+        with self.post(503):
+            result, retry = self.run_task(failures=2)
+        self.assertFalse(result)
+        retry.assert_not_called()
+
+    def test_client_errors_are_not_retried(self):
+        with self.post(400):
+            result, retry = self.run_task()
+        self.assertFalse(result)
+        retry.assert_not_called()
+
+    def test_rate_limited_messages_wait_without_sending(self):
+        with self.post(200) as post, mock.patch("apps.core.tasks.rate_limit_wait", return_value=0.4):
+            result, retry = self.run_task()
+        self.assertIsNone(result)
+        post.assert_not_called()
+        self.assertEqual(retry.call_args.kwargs["countdown"], 0.4)
+
+    def test_backend_errors(self):
+        backend = SamayaSMSBackend()
+        for status_code, retryable in ((500, True), (429, True), (404, False)):
+            with self.subTest(status_code=status_code), self.post(status_code):
+                with self.assertRaises(SMSError) as raised:
+                    backend.send("9800000000", "hi")
+                self.assertEqual(raised.exception.retryable, retryable)
+
+    @override_settings(SMS_BACKEND="local")
+    def test_local_backend_keeps_messages(self):
+        with mock.patch.object(LocalSMSBackend, "outbox", []):
+            self.assertTrue(send_sms("9800000000", "hello"))
+            self.assertEqual(LocalSMSBackend.outbox, [{"phone": "9800000000", "message": "hello"}])
+
+
+class SMSRateLimitTests(SimpleTestCase):
+    def setUp(self):
+        get_redis().delete("sms:rate:test")
+
+    @override_settings(SMS_RATE_LIMITS={"test": 2})
+    def test_rejects_past_the_per_second_limit(self):
+        self.assertEqual(rate_limit_wait("test"), 0)
+        self.assertEqual(rate_limit_wait("test"), 0)
+        self.assertTrue(0 < rate_limit_wait("test") <= 1)
+
+    @override_settings(SMS_RATE_LIMITS={})
+    def test_unlimited_providers_never_wait(self):
+        self.assertEqual(rate_limit_wait("test"), 0)
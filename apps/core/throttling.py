@@ -0,0 +1,35 @@
+from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
+
+from apps.core.redis_utils import incr_with_expiry
+
+
+class RedisRateThrottleMixin:
+    """
+    Fixed-window throttling on one atomic INCR-and-expire round trip, instead
+    of DRF's read-modify-write of a timestamp list in the cache (which races
+    under concurrency and grows with the rate). Lets requests through when
+    Redis is unavailable.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        count, ttl = incr_with_expiry(f"throttle:{self.key}", self.duration)
+        if count is None:
+            return True
+        self.retry_after = max(ttl, 0) / 1000
+        return count <= self.num_requests
+
+    def wait(self):
+        return getattr(self, "retry_after", None)
+
+
+class RedisUserRateThrottle(RedisRateThrottleMixin, UserRateThrottle):
+    pass
+
+
+class RedisAnonRateThrottle(RedisRateThrottleMixin, AnonRateThrottle):
+    pass
@@ -1,11 +1,17 @@
 import random
 import logging
-import os
-import requests
 
+from django.conf import settings
+from django.db import transaction
+from django.http import Http404, JsonResponse
 from django.shortcuts import render
 
 from rest_framework import viewsets
+from rest_framework.exceptions import ValidationError
+
+from .profiling import reset_stats, route_stats
+from .serializers import FieldSelectionModelSerializer
+from .tasks import send_sms
 
 logger = logging.getLogger('django')
 
@@ -15,28 +21,71 @@ def generate_otp():
     return otp
 
 def send_otp_sms(phone, otp):
-    url = "https://samayasms.com.np/smsapi/index.php"
-    payload = {
-        'key': os.environ.get('SMS_API_KEY'),
-        'routeid': os.environ.get('SMS_ROUTE_ID'),
-        'type': 'text',
-        'contacts': phone,
-        'senderid': os.environ.get('SMS_SENDER_ID'),
-        'msg': f'Your OTP is {otp}'
-    }
-    try:
-        response = requests.post(url, data=payload)
-        logger.info(f"SMS sent to {phone}, API status: {response.status_code}, response: {response.text}")
-        response.raise_for_status()
-    except Exception as e:
-        logger.error(f"Failed to send SMS to {phone}: {e}")
+    """Queue the OTP text (see apps.core.sms): the request never waits on the SMS gateway."""
+    # After commit, so no code is texted for a rolled-back registration; a broker outage is logged, not raised
+    transaction.on_commit(lambda: send_sms.delay(phone, f"Your OTP is {otp}"), robust=True)
 
 class MunicipalityTenantModelViewSet(viewsets.ModelViewSet):
+    # Compact serializer for the list action; falls back to serializer_class
+    list_serializer_class = None
+    fields_param = "fields"
+
+    def get_serializer_class(self):
+        if self.action == "list" and self.list_serializer_class is not None:
+            return self.list_serializer_class
+        return super().get_serializer_class()
+
+    def requested_fields(self):
+        """
+        Names from ``?fields=a,b,c`` on list and retrieve, or None. Unknown
+        names are rejected rather than silently dropped.
+        """
+        if self.action not in ("list", "retrieve") or self.request is None:
+            return None
+        raw = self.request.query_params.get(self.fields_param)
+        if not raw:
+            return None
+        serializer_class = self.get_serializer_class()
+        if not issubclass(serializer_class, FieldSelectionModelSerializer):
+            return None
+        names = [name.strip() for name in raw.split(",") if name.strip()]
+        unknown = set(names) - set(serializer_class().fields)
+        if unknown:
+            raise ValidationError({self.fields_param: f"Unknown fields: {', '.join(sorted(unknown))}"})
+        return names
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.requested_fields()
+        if fields is not None:
+            kwargs["fields"] = fields
+        return super().get_serializer(*args, **kwargs)
+
     def get_queryset(self):
         # Assumes model has a ForeignKey to Municipality named 'municipality'
-        base_queryset = super().get_queryset()
-        return base_queryset.filter(municipality=self.request.tenant)
+        base_queryset = super().get_queryset().filter(municipality=self.request.tenant)
+        serializer_class = self.get_serializer_class()
+        if self.action in ("list", "retrieve") and issubclass(serializer_class, FieldSelectionModelSerializer):
+            # Only read the columns the response shows
+            only = serializer_class(fields=self.requested_fields()).model_fields_to_load()
+            if only is not None:
+                # The cursor of a keyset page is read from its last row
+                only |= {name.lstrip("-") for name in getattr(self, "cursor_ordering", None) or ()}
+                base_queryset = base_queryset.only(*only)
+        return base_queryset
 
     def perform_create(self, serializer, **kwargs):
         # Automatically attach municipality from the request
-        serializer.save(municipality=self.request.tenant, **kwargs)
\ No newline at end of file
+        serializer.save(municipality=self.request.tenant, **kwargs)
+
+
+def profiling_stats(request):
+    """
+    Per-route query/cache stats gathered by QueryProfilingMiddleware in this
+    process; DELETE resets them. Only routed when PROFILING_ENABLED, and only
+    answered in DEBUG or for staff.
+    """
+    if not (settings.DEBUG or request.user.is_staff):
+        raise Http404
+    if request.method == "DELETE":
+        reset_stats()
+    return JsonResponse({"routes": route_stats()})
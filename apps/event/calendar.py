@@ -0,0 +1,87 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from .models import Event, EventSchedule
+
+# Output key -> lookup from EventSchedule and from Event
+OCCURRENCE_FIELDS = {
+    "event_id": ("event_id", "pk"),
+    "schedule_id": ("pk", None),
+    "title": ("event__title", "title"),
+    "slug": ("event__slug", "slug"),
+    "category_id": ("event__category_id", "category_id"),
+    "category": ("event__category__name", "category__name"),
+    "location": ("event__location__name", "location__name"),
+    "start_time": ("start_time", "date"),
+    "end_time": ("end_time", "date"),
+}
+
+
+def day_bounds(day):
+    """Aware [start, end) of a local calendar day."""
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, start + timedelta(days=1)
+
+
+def occurrences(municipality, start, end, category_id=None):
+    """
+    Everything happening in [start, end), in two queries:
+
+    * schedules whose interval overlaps the window (start_time < end and
+      end_time > start), served by the (event, start_time, end_time) index;
+    * events without any schedule, treated as a point in time at Event.date
+      and found through the (municipality, date) index.
+    """
+    schedules = EventSchedule.objects.filter(
+        event__municipality=municipality, start_time__lt=end, end_time__gt=start
+    )
+    events = Event.objects.filter(municipality=municipality, date__gte=start, date__lt=end).exclude(
+        Exists(EventSchedule.objects.filter(event=OuterRef("pk")))
+    )
+    if category_id is not None:
+        schedules = schedules.filter(event__category_id=category_id)
+        events = events.filter(category_id=category_id)
+
+    keys = list(OCCURRENCE_FIELDS)
+    schedule_lookups = [lookups[0] for lookups in OCCURRENCE_FIELDS.values()]
+    event_lookups = [lookups[1] for lookups in OCCURRENCE_FIELDS.values() if lookups[1]]
+    found = [dict(zip(keys, row)) for row in schedules.values_list(*schedule_lookups)]
+    for row in events.values_list(*event_lookups):
+        item = dict(zip([key for key in keys if OCCURRENCE_FIELDS[key][1]], row))
+        item["schedule_id"] = None
+        found.append(item)
+    found.sort(key=lambda item: (item["start_time"], item["event_id"]))
+    return found
+
+
+def group_by_day(items, start, end):
+    """
+    [{"date", "events"}] for every local day of the window with something on,
+    listing multi-day occurrences under each day they cover.
+    """
+    first_day = timezone.localtime(start).date()
+    last_day = timezone.localtime(end - timedelta(microseconds=1)).date()
+    days = defaultdict(list)
+    for item in items:
+        day = max(timezone.localtime(item["start_time"]).date(), first_day)
+        # An interval ending exactly at midnight does not cover the next day
+        until = timezone.localtime(max(item["start_time"], item["end_time"] - timedelta(microseconds=1))).date()
+        while day <= min(until, last_day):
+            days[day].append(item)
+            day += timedelta(days=1)
+    return [{"date": day, "events": days[day]} for day in sorted(days)]
+
+
+def month_window(year, month):
+    start = timezone.make_aware(datetime(year, month, 1))
+    end = timezone.make_aware(datetime(year + month // 12, month % 12 + 1, 1))
+    return start, end
+
+
+def week_window(day):
+    """Monday-based week containing ``day``."""
+    monday = day - timedelta(days=day.weekday())
+    return day_bounds(monday)[0], day_bounds(monday + timedelta(days=7))[0]
@@ -0,0 +1,203 @@
+import hashlib
+import logging
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Prefetch
+from django.utils import timezone
+
+from apps.core.redis_utils import get_redis
+from .models import Event, EventSchedule, OrganizerInfo
+
+logger = logging.getLogger("django")
+
+PRODID = "-//Dobato//Municipal Events//EN"
+ICS_DATETIME = "%Y%m%dT%H%M%SZ"
+DEFAULT_DURATION = timedelta(hours=1)
+
+
+def blocks_key(municipality_id):
+    """Hash of event id -> "<category id> <end timestamp>\\n<VEVENT lines>"."""
+    return f"ics:{municipality_id}:events"
+
+
+def generation_key(municipality_id):
+    return f"ics:{municipality_id}:gen"
+
+
+def feed_cache_key(municipality_id, category_id, generation):
+    return f"ics:feed:{municipality_id}:{category_id or 'all'}:{generation}"
+
+
+def escape(value):
+    return (
+        str(value or "")
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold(line):
+    """Split a content line into 75-octet chunks as RFC 5545 requires."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return encoded + b"\r\n"
+    chunks, start, limit = [], 0, 75
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        # Never cut a multi-byte character in half
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1
+        chunks.append(encoded[start:end])
+        start, limit = end, 74  # continuation lines start with a space
+    return b"\r\n ".join(chunks) + b"\r\n"
+
+
+def _stamp(value):
+    return value.astimezone(dt_timezone.utc).strftime(ICS_DATETIME)
+
+
+def event_queryset():
+    return Event.objects.select_related("location", "category").prefetch_related(
+        Prefetch("eventschedule_set", queryset=EventSchedule.objects.order_by("start_time")),
+        Prefetch("organizer_info", queryset=OrganizerInfo.objects.order_by("pk")),
+    )
+
+
+def render_event(event, domain):
+    """
+    (category id, end of the last occurrence, VEVENT bytes) for one event:
+    one VEVENT per schedule, or a single one at Event.date without schedules.
+    """
+    schedules = list(event.eventschedule_set.all())
+    intervals = [(s.pk, s.start_time, s.end_time) for s in schedules] or [
+        (None, event.date, event.date + DEFAULT_DURATION)
+    ]
+    location = event.location
+    organizer = next((o for o in event.organizer_info.all() if o.email), None)
+    dtstamp = _stamp(timezone.now())
+    lines = []
+    for schedule_id, start, end in intervals:
+        uid = f"event-{event.pk}" + (f"-schedule-{schedule_id}" if schedule_id else "")
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:{uid}@{domain}",
+            f"DTSTAMP:{dtstamp}",
+            f"DTSTART:{_stamp(start)}",
+            f"DTEND:{_stamp(end)}",
+            f"SUMMARY:{escape(event.title)}",
+            f"DESCRIPTION:{escape(event.short_summary or event.description)}",
+            f"CATEGORIES:{escape(event.category.name)}",
+        ]
+        if location is not None:
+            lines.append(f"LOCATION:{escape(', '.join(filter(None, [location.name, location.address, location.city])))}")
+            if location.latitude is not None and location.longitude is not None:
+                lines.append(f"GEO:{location.latitude:.6f};{location.longitude:.6f}")
+        if organizer is not None:
+            lines.append(f"ORGANIZER;CN={escape(organizer.name)}:mailto:{organizer.email}")
+        if event.booking_rsvp_link:
+            lines.append(f"URL:{event.booking_rsvp_link}")
+        lines.append("END:VEVENT")
+    last_end = max(end for _, _, end in intervals)
+    return event.category_id, last_end, b"".join(fold(line) for line in lines)
+
+
+def _block(category_id, last_end, body):
+    return f"{category_id} {int(last_end.timestamp())}\n".encode() + body
+
+
+def _bump(redis_conn, municipality_id):
+    redis_conn.incr(generation_key(municipality_id))
+
+
+def build_blocks(municipality):
+    """
+    Render every event of a tenant into the blocks hash, streaming over a
+    chunked iterator so memory stays flat for large tenants.
+    """
+    redis_conn = get_redis()
+    key = blocks_key(municipality.pk)
+    chunk_size = getattr(settings, "ICS_BUILD_CHUNK_SIZE", 200)
+    redis_conn.delete(key)
+    mapping = {}
+    for event in event_queryset().filter(municipality=municipality).iterator(chunk_size=chunk_size):
+        mapping[event.pk] = _block(*render_event(event, municipality.full_domain))
+        if len(mapping) >= chunk_size:
+            redis_conn.hset(key, mapping=mapping)
+            mapping = {}
+    # The marker field keeps the hash present for tenants without events
+    mapping["built"] = b""
+    redis_conn.hset(key, mapping=mapping)
+    _bump(redis_conn, municipality.pk)
+
+
+def refresh_event(event_id):
+    """Re-render one event's block after it or something it shows changed."""
+    event = event_queryset().select_related("municipality").filter(pk=event_id).first()
+    if event is None or event.municipality is None:
+        return
+    redis_conn = get_redis()
+    key = blocks_key(event.municipality_id)
+    if not redis_conn.exists(key):
+        # Never built: the next poll builds the whole feed anyway
+        return
+    redis_conn.hset(key, event.pk, _block(*render_event(event, event.municipality.full_domain)))
+    _bump(redis_conn, event.municipality_id)
+
+
+def remove_event(municipality_id, event_id):
+    redis_conn = get_redis()
+    if redis_conn.hdel(blocks_key(municipality_id), event_id):
+        _bump(redis_conn, municipality_id)
+
+
+def get_feed(municipality, category_id=None):
+    """
+    Return (etag, ics bytes). The assembled feed is cached per generation, so
+    polls between changes cost one cache read; a change re-renders only the
+    affected event and re-joins the stored blocks.
+    """
+    redis_conn = get_redis()
+    generation = int(redis_conn.get(generation_key(municipality.pk)) or 0)
+    cache_key = feed_cache_key(municipality.pk, category_id, generation)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    blocks = redis_conn.hgetall(blocks_key(municipality.pk))
+    if not blocks:
+        build_blocks(municipality)
+        generation = int(redis_conn.get(generation_key(municipality.pk)) or 0)
+        cache_key = feed_cache_key(municipality.pk, category_id, generation)
+        blocks = redis_conn.hgetall(blocks_key(municipality.pk))
+
+    oldest = (timezone.now() - timedelta(days=getattr(settings, "ICS_PAST_DAYS", 90))).timestamp()
+    body = []
+    for field, value in sorted(blocks.items()):
+        if field == b"built":
+            continue
+        header, _, vevents = value.partition(b"\n")
+        block_category, last_end = header.split()
+        if int(last_end) < oldest or (category_id is not None and int(block_category) != category_id):
+            continue
+        body.append(vevents)
+
+    name = escape(municipality.name)
+    feed = b"".join(
+        [
+            fold("BEGIN:VCALENDAR"),
+            fold("VERSION:2.0"),
+            fold(f"PRODID:{PRODID}"),
+            fold("CALSCALE:GREGORIAN"),
+            fold(f"X-WR-CALNAME:{name}"),
+            *body,
+            fold("END:VCALENDAR"),
+        ]
+    )
+    etag = f'"{hashlib.sha256(feed).hexdigest()[:32]}"'
+    cache.set(cache_key, (etag, feed), getattr(settings, "ICS_FEED_CACHE_TIMEOUT", 60 * 60 * 24))
+    return etag, feed
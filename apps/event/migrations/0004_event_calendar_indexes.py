@@ -0,0 +1,21 @@
+# Generated by Django 4.2.1 on 2026-10-19 12:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0003_eventlocation_geohash_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['municipality', 'date'], name='event_event_municip_dbd2ef_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventschedule',
+            index=models.Index(fields=['event', 'start_time', 'end_time'], name='event_event_event_i_6392d6_idx'),
+        ),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 4.2.1 on 2026-10-19 12:12
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_ratings(apps, schema_editor):
+    # Self-contained on purpose: the live rating helpers may change after this migration
+    Event = apps.get_model("event", "Event")
+    EventPublicInteraction = apps.get_model("event", "EventPublicInteraction")
+    mean = getattr(settings, "RATING_PRIOR_MEAN", 3.5)
+    weight = getattr(settings, "RATING_PRIOR_WEIGHT", 5)
+    histogram = {}
+    rows = (
+        EventPublicInteraction.objects.filter(rating__gte=1, rating__lte=5)
+        .values_list("event_id", "rating")
+        .annotate(n=Count("pk"))
+    )
+    for target_id, rating, n in rows:
+        histogram.setdefault(target_id, [0] * 6)[rating] = n
+    for target_id, counts in histogram.items():
+        count = sum(counts)
+        total = sum(star * n for star, n in enumerate(counts))
+        Event.objects.filter(pk=target_id).update(
+            rating_count=count,
+            rating_sum=total,
+            rating_score=(total + weight * mean) / (count + weight),
+            **{f"rating_{star}": counts[star] for star in range(1, 6)},
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0004_event_calendar_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='rating_1',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='rating_2',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='rating_3',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='rating_4',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='rating_5',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='rating_score',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['municipality', 'rating_score'], name='event_event_municip_ed6a75_idx'),
+        ),
+        migrations.RunPython(backfill_ratings, migrations.RunPython.noop),
+    ]
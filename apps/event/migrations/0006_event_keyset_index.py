@@ -0,0 +1,21 @@
+# Generated by Django 4.2.1 on 2026-10-19 12:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0005_event_ratings'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='event',
+            name='event_event_municip_dbd2ef_idx',
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['municipality', 'date', 'id'], name='event_event_municip_5017eb_idx'),
+        ),
+    ]
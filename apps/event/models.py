@@ -1,12 +1,13 @@
 from django.db import models
 from apps.municipality.models import MunicipalityAwareModel
-from apps.core.models import BaseModel
+from apps.core.models import BaseModel, RatedModel
+from apps.geo.models import GeoHashedModel
 from django.contrib.auth import get_user_model
 
 class EventCategory(BaseModel):
     name = models.CharField(max_length=100)
 
-class EventLocation(BaseModel):
+class EventLocation(BaseModel, GeoHashedModel):
     name = models.CharField(max_length=255)
     address = models.TextField()
     city = models.CharField(max_length=100)
@@ -15,7 +16,12 @@ class EventLocation(BaseModel):
     longitude = models.FloatField(blank=True, null=True)
     user=models.ForeignKey(get_user_model(), on_delete=models.SET_NULL, null=True, blank=True)
 
-class Event(MunicipalityAwareModel):
+    class Meta:
+        indexes = [
+            models.Index(fields=["geohash"]),
+        ]
+
+class Event(MunicipalityAwareModel, RatedModel):
     title = models.CharField(max_length=255)
     description = models.TextField()
     date = models.DateTimeField()
@@ -42,6 +48,13 @@ class Event(MunicipalityAwareModel):
     slug = models.SlugField(max_length=255, unique=True, blank=True, null=True)
     tags = models.JSONField(blank=True, null=True)
     user=models.ForeignKey(get_user_model(), on_delete=models.SET_NULL, null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["municipality", "date", "id"]),
+            models.Index(fields=["municipality", "rating_score"]),
+        ]
+
     def __str__(self):
         return self.title
     
@@ -51,6 +64,12 @@ class EventSchedule(BaseModel):
     end_time = models.DateTimeField()
     category = models.ForeignKey(EventCategory, on_delete=models.CASCADE)
     Max_attendees = models.PositiveIntegerField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["event", "start_time", "end_time"]),
+        ]
+
     def __str__(self):
         return f"{self.event.title} - {self.category.name} ({self.start_time} to {self.end_time})" 
     
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from apps.core.serializers import FieldSelectionModelSerializer
 from .models import (
     EventCategory, EventLocation, Event, EventSchedule,
     OrganizerInfo, EventMedia, EventPublicInteraction,Bookmark
@@ -14,10 +15,19 @@ class EventLocationSerializer(serializers.ModelSerializer):
         model = EventLocation
         fields = '__all__'
 
-class EventSerializer(serializers.ModelSerializer):
+class EventSerializer(FieldSelectionModelSerializer):
     class Meta:
         model = Event
         fields = '__all__'
+        read_only_fields = Event.RATING_FIELDS
+
+class EventListSerializer(FieldSelectionModelSerializer):
+    class Meta:
+        model = Event
+        fields = [
+            'id', 'title', 'slug', 'date', 'category', 'location', 'short_summary',
+            'registration_type', 'ticket_price', 'rating_score', 'rating_count',
+        ]
 
 class EventScheduleSerializer(serializers.ModelSerializer):
     class Meta:
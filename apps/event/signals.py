@@ -1,8 +1,16 @@
-from django.db.models.signals import post_save
+import logging
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
-from apps.event.models import Event
+from apps.core.ratings import track_ratings
+from apps.core.tenant_cache import track_tenant_cache
+from apps.event.models import Event, EventCategory, EventLocation, EventPublicInteraction, EventSchedule, OrganizerInfo
+from apps.event.ics import refresh_event, remove_event
 from apps.qr.utils import generate_qr
 
+logger = logging.getLogger("django")
+
 @receiver(post_save, sender=Event)
 def create_event_qr(sender, instance, created, **kwargs):
     if created:
@@ -12,3 +20,56 @@ def create_event_qr(sender, instance, created, **kwargs):
             municipality=instance.municipality.unique_slug,  
             name=instance.title
         )
+
+
+def _refresh_feed(event_ids):
+    def refresh():
+        for event_id in event_ids:
+            try:
+                refresh_event(event_id)
+            except Exception as e:
+                logger.warning(f"ICS block refresh failed for event {event_id}: {e}")
+    transaction.on_commit(refresh)
+
+
+@receiver(post_save, sender=Event)
+def refresh_event_feed(sender, instance, **kwargs):
+    _refresh_feed([instance.pk])
+
+
+@receiver(post_delete, sender=Event)
+def remove_event_from_feed(sender, instance, **kwargs):
+    municipality_id, pk = instance.municipality_id, instance.pk
+
+    def remove():
+        try:
+            remove_event(municipality_id, pk)
+        except Exception as e:
+            logger.warning(f"ICS block removal failed for event {pk}: {e}")
+    transaction.on_commit(remove)
+
+
+@receiver(post_save, sender=EventSchedule)
+@receiver(post_delete, sender=EventSchedule)
+@receiver(post_save, sender=OrganizerInfo)
+@receiver(post_delete, sender=OrganizerInfo)
+def refresh_feed_for_event_detail(sender, instance, **kwargs):
+    _refresh_feed([instance.event_id])
+
+
+@receiver(post_save, sender=EventLocation)
+def refresh_feed_for_location(sender, instance, created, **kwargs):
+    if not created:
+        _refresh_feed(list(Event.objects.filter(location=instance).values_list("pk", flat=True)))
+
+
+@receiver(post_save, sender=EventCategory)
+def refresh_feed_for_category(sender, instance, created, **kwargs):
+    if not created:
+        _refresh_feed(list(Event.objects.filter(category=instance).values_list("pk", flat=True)))
+
+
+# Interactions have no moderation step; a rating of 0 is a comment without a rating
+track_ratings(EventPublicInteraction, "event", {})
+track_tenant_cache(Event)
+track_tenant_cache(EventPublicInteraction, "event.municipality_id")
@@ -2,7 +2,7 @@ from rest_framework import routers
 from .views import (
     EventCategoryViewSet, EventLocationViewSet, EventViewSet,
     EventScheduleViewSet, OrganizerInfoViewSet, EventMediaViewSet,
-    EventPublicInteractionViewSet, BookmarkViewSet
+    EventPublicInteractionViewSet, BookmarkViewSet, EventCalendarView, event_ics_feed
 )
 from django.urls import path, include
 
@@ -18,5 +18,8 @@ router.register(r'bookmarks', BookmarkViewSet)
 
 
 urlpatterns = [
+    path('calendar/', EventCalendarView.as_view(), name='event-calendar'),
+    path('feed.ics', event_ics_feed, name='event-ics-feed'),
+    path('feed/<int:category_id>.ics', event_ics_feed, name='event-ics-category-feed'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
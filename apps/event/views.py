@@ -1,13 +1,27 @@
-from rest_framework import viewsets
+from datetime import timedelta
+
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseNotModified
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import status, viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import OrderingFilter
 from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from apps.core.permissions import IsDataEntryOrDataManagerAndApproved
 from .models import (
     EventCategory, EventLocation, Event, EventSchedule,
     OrganizerInfo, EventMedia, EventPublicInteraction,Bookmark
 )
+from apps.core.tenant_cache import TenantCacheMixin
 from apps.core.views import MunicipalityTenantModelViewSet
+from .calendar import day_bounds, group_by_day, month_window, occurrences, week_window
+from .ics import get_feed
+from apps.search.filters import SearchIndexFilter
 from .serializers import (
-    EventCategorySerializer, EventLocationSerializer, EventSerializer,
+    EventCategorySerializer, EventLocationSerializer, EventSerializer, EventListSerializer,
     EventScheduleSerializer, OrganizerInfoSerializer, EventMediaSerializer,
     EventPublicInteractionSerializer, BookmarkSerializer
 )
@@ -22,10 +36,40 @@ class EventLocationViewSet(viewsets.ModelViewSet):
     serializer_class = EventLocationSerializer
     permission_classes = [AllowAny]
 
-class EventViewSet(MunicipalityTenantModelViewSet):
+class EventViewSet(TenantCacheMixin, MunicipalityTenantModelViewSet):
     queryset = Event.objects.all()
     serializer_class = EventSerializer
+    list_serializer_class = EventListSerializer
+    cursor_ordering = ("date", "id")
+    query_budgets = {"list": 5, "retrieve": 2}
+    # Interactions update the rating columns
+    cache_models = (Event, EventPublicInteraction)
     permission_classes = [AllowAny]  # Adjust permissions as needed
+    read_replica = True
+    filter_backends = [OrderingFilter, SearchIndexFilter]
+    search_entity_type = "event"
+    ordering_fields = ["date", "rating_score", "rating_count"]
+
+    def get_queryset(self):
+        queryset = super().get_queryset().order_by("date", "pk")
+        date_from = self.date_param("date_from")
+        date_to = self.date_param("date_to")
+        if date_from:
+            queryset = queryset.filter(date__gte=date_from)
+        if date_to:
+            queryset = queryset.filter(date__lt=date_to)
+        return queryset
+
+    def date_param(self, name):
+        value = self.request.query_params.get(name, "")
+        try:
+            # Well-formed but impossible values such as 2024-13-40 raise instead of returning None
+            parsed = parse_datetime(value) or parse_date(value)
+        except ValueError:
+            parsed = None
+        if value and parsed is None:
+            raise ValidationError({name: "Expected a date (YYYY-MM-DD) or an ISO 8601 datetime."})
+        return parsed
 
 class EventScheduleViewSet(viewsets.ModelViewSet):
     queryset = EventSchedule.objects.all()
@@ -50,4 +94,68 @@ class EventPublicInteractionViewSet(viewsets.ModelViewSet):
 class BookmarkViewSet(viewsets.ModelViewSet):
     queryset = Bookmark.objects.all()
     serializer_class = BookmarkSerializer
-    permission_classes = [IsDataEntryOrDataManagerAndApproved]
\ No newline at end of file
+    permission_classes = [IsDataEntryOrDataManagerAndApproved]
+
+class EventCalendarView(APIView):
+    """
+    Events of the tenant grouped by day.
+    view=upcoming (next ``days`` days, default 30), ongoing, month (year, month),
+    week (date) or range (start, end); optional category id.
+    """
+    permission_classes = [AllowAny]
+    read_replica = True
+
+    def get(self, request):
+        params = request.query_params
+        view = params.get("view", "upcoming")
+        now = timezone.now()
+        try:
+            category_id = int(params["category"]) if params.get("category") else None
+            if view == "upcoming":
+                days = min(int(params.get("days", 30)), getattr(settings, "EVENT_CALENDAR_MAX_DAYS", 92))
+                start, end = now, now + timedelta(days=days)
+            elif view == "ongoing":
+                start, end = day_bounds(timezone.localdate())
+            elif view == "month":
+                start, end = month_window(int(params.get("year", now.year)), int(params.get("month", now.month)))
+            elif view == "week":
+                start, end = week_window(parse_date(params["date"]) if params.get("date") else timezone.localdate())
+            elif view == "range":
+                start, end = day_bounds(parse_date(params["start"]))[0], day_bounds(parse_date(params["end"]))[1]
+                if (end - start).days > getattr(settings, "EVENT_CALENDAR_MAX_DAYS", 92):
+                    raise ValueError("range too long")
+            else:
+                raise ValueError(view)
+        except (KeyError, TypeError, ValueError, OverflowError):
+            return Response(
+                {"detail": "Invalid calendar parameters."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        items = occurrences(request.tenant, start, end, category_id=category_id)
+        if view == "ongoing":
+            # Scheduled events running right now, plus unscheduled ones dated today
+            items = [
+                item for item in items
+                if item["schedule_id"] is None or item["start_time"] <= now < item["end_time"]
+            ]
+        return Response({"view": view, "start": start, "end": end, "days": group_by_day(items, start, end)})
+
+
+def event_ics_feed(request, category_id=None):
+    """
+    Subscribable iCalendar feed of the tenant's events, optionally one category.
+    Plain Django view: calendar clients poll it without credentials.
+    """
+    municipality = getattr(request, "tenant", None)
+    if municipality is None:
+        raise Http404("Unknown municipality")
+    etag, feed = get_feed(municipality, category_id=category_id)
+    if request.headers.get("If-None-Match") == etag:
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(feed, content_type="text/calendar; charset=utf-8")
+        response["Content-Disposition"] = 'inline; filename="events.ics"'
+    response["ETag"] = etag
+    response["Cache-Control"] = f"public, max-age={getattr(settings, 'ICS_MAX_AGE', 300)}"
+    return response
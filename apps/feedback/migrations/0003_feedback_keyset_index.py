@@ -0,0 +1,17 @@
+# Generated by Django 4.2.1 on 2026-10-19 12:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(fields=['municipality', 'submitted_at', 'id'], name='feedback_fe_municip_6f4497_idx'),
+        ),
+    ]
@@ -39,6 +39,11 @@ class Feedback(MunicipalityAwareModel):
     submitted_at = models.DateTimeField(auto_now_add=True)
     last_updated = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["municipality", "submitted_at", "id"]),
+        ]
+
     def clean(self):
         if self.approved_by and self.approved_by.user_type != 'municipality_admin':
             raise ValidationError("Only municipality_admin can approve feedback.")
@@ -1,7 +1,8 @@
 from rest_framework import serializers
+from apps.core.serializers import FieldSelectionModelSerializer
 from .models import Feedback, FeedbackMedia
 
-class FeedbackSerializer(serializers.ModelSerializer):
+class FeedbackSerializer(FieldSelectionModelSerializer):
     class Meta:
         model = Feedback
         fields = '__all__'
@@ -10,6 +11,14 @@ class FeedbackSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Only municipality_admin can approve feedback.")
         return value
 
+class FeedbackListSerializer(FieldSelectionModelSerializer):
+    class Meta:
+        model = Feedback
+        fields = [
+            'id', 'feedback_type', 'title', 'status', 'language', 'latitude', 'longitude',
+            'is_approved', 'is_archived', 'submitted_at',
+        ]
+
 class FeedbackMediaSerializer(serializers.ModelSerializer):
     class Meta:
         model = FeedbackMedia
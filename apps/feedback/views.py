@@ -15,6 +15,10 @@ from apps.core.permissions import IsDataEntryOrDataManagerAndApproved
 class FeedbackViewSet(MunicipalityTenantModelViewSet):
     queryset = Feedback.objects.all()
     serializer_class = FeedbackSerializer
+    list_serializer_class = FeedbackListSerializer
+    cursor_ordering = ("-submitted_at", "-id")
+    # Tenant and user lookups, COUNT and page
+    query_budgets = {"list": 4, "retrieve": 3}
     permission_classes = [IsAuthenticated]
 
     def perform_create(self, serializer):
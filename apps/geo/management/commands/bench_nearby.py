@@ -0,0 +1,74 @@
+import random
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from apps.core.benchmark import format_stats, measure
+from apps.geo.search import nearby, nearest
+from apps.geo.utils import encode_geohash, haversine_m
+from apps.municipality.models import Municipality
+from apps.tourism.models import TouristPlace
+
+
+class Command(BaseCommand):
+    help = "Benchmark nearby search against a full scan on synthetic places (rolled back afterwards)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--points", type=int, default=100000)
+        parser.add_argument("--iterations", type=int, default=200)
+        parser.add_argument("--radius", type=float, default=2000)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        radius = options["radius"]
+        # Roughly the extent of a large Nepali municipality
+        lat0, lng0, span = 27.70, 85.30, 0.5
+
+        with transaction.atomic():
+            municipality = Municipality.objects.create(
+                name="bench-nearby", unique_slug="bench-nearby", full_domain="bench-nearby.local"
+            )
+            places = []
+            for i in range(options["points"]):
+                lat, lng = lat0 + rng.random() * span, lng0 + rng.random() * span
+                places.append(
+                    TouristPlace(
+                        municipality=municipality, name=f"Place {i}", slug=f"place-{i}", address="-",
+                        latitude=lat, longitude=lng, category="bench", geohash=encode_geohash(lat, lng),
+                    )
+                )
+            TouristPlace.objects.bulk_create(places, batch_size=2000)
+            del places
+            if connection.vendor == "sqlite":
+                # SQLite ignores the composite geohash index until it has table statistics
+                with connection.cursor() as cursor:
+                    cursor.execute("ANALYZE")
+
+            def point():
+                return lat0 + rng.random() * span, lng0 + rng.random() * span
+
+            def indexed():
+                lat, lng = point()
+                nearby(municipality, lat, lng, radius, ["place"])
+
+            def knn():
+                lat, lng = point()
+                nearest(municipality, lat, lng, 10, ["place"])
+
+            def full_scan():
+                lat, lng = point()
+                rows = np.array(
+                    list(TouristPlace.objects.filter(municipality=municipality).values_list("latitude", "longitude")),
+                    dtype=float,
+                )
+                distances = haversine_m(lat, lng, rows[:, 0], rows[:, 1])
+                np.sort(distances[distances <= radius])
+
+            iterations = options["iterations"]
+            self.stdout.write(f"{options['points']} points, radius {radius}m")
+            self.stdout.write(format_stats("geohash radius", measure(indexed, iterations, warmup=5)))
+            self.stdout.write(format_stats("geohash k=10", measure(knn, iterations, warmup=5)))
+            self.stdout.write(format_stats("full scan", measure(full_scan, max(1, iterations // 10), warmup=1)))
+            transaction.set_rollback(True)
@@ -0,0 +1,69 @@
+import random
+import time
+import tracemalloc
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from apps.core.benchmark import format_stats, measure
+from apps.geo.spatial_index import SpatialIndex
+from apps.geo.utils import haversine_m
+
+
+class Command(BaseCommand):
+    help = "Measure memory and query latency of the in-memory spatial index on synthetic points."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--points", type=int, default=100000)
+        parser.add_argument("--iterations", type=int, default=2000)
+        parser.add_argument("--radius", type=float, default=2000)
+        parser.add_argument("--changes", type=int, default=300, help="Unmerged changes to apply before querying.")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(options["seed"])
+        picker = random.Random(options["seed"])
+        count, radius = options["points"], options["radius"]
+        lat0, lng0, span = 27.70, 85.30, 0.5
+        lats = lat0 + rng.random(count) * span
+        lngs = lng0 + rng.random(count) * span
+        names = [f"Place {i}" for i in range(count)]
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        index = SpatialIndex.from_arrays("place", np.arange(count), lats, lngs, names, max_pending=10 ** 9)
+        build_ms = (time.perf_counter() - started) * 1000
+        _, peak = tracemalloc.get_traced_memory()
+        current = tracemalloc.take_snapshot().statistics("filename")
+        tracemalloc.stop()
+        retained = sum(stat.size for stat in current)
+
+        self.stdout.write(f"{count} points, radius {radius}m")
+        self.stdout.write(
+            f"build: {build_ms:.1f}ms, arrays {index.nbytes() / 2 ** 20:.1f}MiB, "
+            f"retained {retained / 2 ** 20:.1f}MiB, peak {peak / 2 ** 20:.1f}MiB"
+        )
+
+        def point():
+            return lat0 + picker.random() * span, lng0 + picker.random() * span
+
+        def grid():
+            lat, lng = point()
+            index.query(lat, lng, radius, ["place"], 50)
+
+        def brute_force():
+            lat, lng = point()
+            distances = haversine_m(lat, lng, lats, lngs)
+            np.sort(distances[distances <= radius])[:50]
+
+        iterations = options["iterations"]
+        self.stdout.write(format_stats("grid index", measure(grid, iterations)))
+        self.stdout.write(format_stats("numpy brute force", measure(brute_force, max(1, iterations // 10), warmup=5)))
+
+        started = time.perf_counter()
+        for _ in range(options["changes"]):
+            lat, lng = point()
+            index.apply("upsert", "place", picker.randrange(count), "moved", lat, lng)
+        apply_us = (time.perf_counter() - started) * 1e6 / max(1, options["changes"])
+        self.stdout.write(f"apply: {apply_us:.1f}us per change")
+        self.stdout.write(format_stats(f"grid index, {options['changes']} pending", measure(grid, iterations)))
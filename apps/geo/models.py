@@ -0,0 +1,24 @@
+from django.db import models
+
+from .utils import encode_geohash
+
+
+class GeoHashedModel(models.Model):
+    """
+    Keeps a geohash of latitude/longitude so proximity queries can use an
+    index prefix scan instead of reading the whole table.
+    """
+    geohash = models.CharField(max_length=12, blank=True, default="", editable=False)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if self.latitude is not None and self.longitude is not None:
+            self.geohash = encode_geohash(float(self.latitude), float(self.longitude))
+        else:
+            self.geohash = ""
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"latitude", "longitude"} & set(update_fields):
+            kwargs["update_fields"] = set(update_fields) | {"geohash"}
+        super().save(*args, **kwargs)
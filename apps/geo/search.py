@@ -0,0 +1,82 @@
+import numpy as np
+from django.apps import apps
+from django.db.models import Q
+
+from .utils import bounding_box, covering_prefixes, haversine_m
+
+# type -> model, label field, lookup from the model to its municipality, and the
+# field values a row needs to be shown publicly (as in apps.search.index)
+NEARBY_SOURCES = {
+    "place": ("tourism.TouristPlace", "name", "municipality", {"is_approved": True}),
+    "business": ("business.Business", "name", "municipality", {"status": "published", "is_approved": True}),
+    "event_location": ("event.EventLocation", "name", "event__municipality", {}),
+}
+
+
+def is_public(entity_type, instance):
+    return all(getattr(instance, name) == value for name, value in NEARBY_SOURCES[entity_type][3].items())
+
+
+def _candidates(entity_type, municipality, latitude, longitude, radius_m):
+    """
+    Rows that may lie within the radius: geohash prefix scan narrowed by a
+    bounding box. Distances are checked exactly afterwards.
+    """
+    model_path, label_field, tenant_lookup, public = NEARBY_SOURCES[entity_type]
+    queryset = apps.get_model(model_path).objects.filter(**{tenant_lookup: municipality}, **public)
+    prefixes = covering_prefixes(latitude, longitude, radius_m)
+    if prefixes:
+        prefix_q = Q()
+        for prefix in prefixes:
+            # LIKE 'prefix%' is an index range scan, and unlike a hand-made upper bound
+            # it does not depend on how the column's collation orders characters
+            prefix_q |= Q(geohash__startswith=prefix)
+        queryset = queryset.filter(prefix_q)
+    min_lat, max_lat, min_lng, max_lng = bounding_box(latitude, longitude, radius_m)
+    queryset = queryset.filter(latitude__gte=min_lat, latitude__lte=max_lat)
+    if min_lng >= -180 and max_lng <= 180:
+        queryset = queryset.filter(longitude__gte=min_lng, longitude__lte=max_lng)
+    return list(queryset.values_list("pk", label_field, "latitude", "longitude").distinct())
+
+
+def nearby(municipality, latitude, longitude, radius_m, types, limit=50):
+    """
+    Entities of ``types`` within ``radius_m`` metres, closest first.
+    """
+    results = []
+    for entity_type in types:
+        rows = _candidates(entity_type, municipality, latitude, longitude, radius_m)
+        if not rows:
+            continue
+        lats = np.array([row[2] for row in rows], dtype=float)
+        lngs = np.array([row[3] for row in rows], dtype=float)
+        distances = haversine_m(latitude, longitude, lats, lngs)
+        for index in np.flatnonzero(distances <= radius_m):
+            pk, label, lat, lng = rows[index]
+            results.append(
+                {
+                    "type": entity_type,
+                    "id": pk,
+                    "name": label,
+                    "latitude": float(lat),
+                    "longitude": float(lng),
+                    "distance_m": round(float(distances[index]), 1),
+                }
+            )
+    results.sort(key=lambda item: item["distance_m"])
+    return results[:limit]
+
+
+def nearest(municipality, latitude, longitude, k, types, start_radius_m=1000, max_radius_m=50000, search=None):
+    """
+    k nearest entities. The search radius grows until k results fall inside it;
+    anything closer than the k-th result is then guaranteed to have been seen.
+    ``search`` is the radius query to use, nearby() by default.
+    """
+    search = search or nearby
+    radius = start_radius_m
+    while True:
+        found = search(municipality, latitude, longitude, radius, types, limit=k)
+        if len(found) >= k or radius >= max_radius_m:
+            return found
+        radius = min(radius * 4, max_radius_m)
@@ -0,0 +1,79 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from apps.business.models import Business
+from apps.event.models import Event, EventLocation
+from apps.tourism.models import TouristPlace
+from .search import is_public
+from .spatial_index import publish_change
+
+INDEXED_MODELS = {TouristPlace: "place", Business: "business"}
+
+
+def _publish_point(municipality_id, entity_type, instance, label):
+    # Un-approving or unpublishing takes a point off the map, like clearing its coordinates
+    if instance.latitude is None or instance.longitude is None or not is_public(entity_type, instance):
+        op = "delete"
+    else:
+        op = "upsert"
+    transaction.on_commit(
+        lambda: publish_change(
+            municipality_id, op, entity_type, instance.pk, label,
+            None if op == "delete" else float(instance.latitude),
+            None if op == "delete" else float(instance.longitude),
+        )
+    )
+
+
+@receiver(post_save)
+def publish_point_saved(sender, instance, **kwargs):
+    entity_type = INDEXED_MODELS.get(sender)
+    if entity_type is not None:
+        _publish_point(instance.municipality_id, entity_type, instance, instance.name)
+
+
+@receiver(post_delete)
+def publish_point_deleted(sender, instance, **kwargs):
+    entity_type = INDEXED_MODELS.get(sender)
+    if entity_type is not None:
+        transaction.on_commit(lambda: publish_change(instance.municipality_id, "delete", entity_type, instance.pk))
+
+
+@receiver(post_save, sender=EventLocation)
+def publish_event_location_saved(sender, instance, created, **kwargs):
+    if created:
+        # Not on any tenant's map until an event uses it
+        return
+    for municipality_id in Event.objects.filter(location=instance).values_list("municipality_id", flat=True).distinct():
+        _publish_point(municipality_id, "event_location", instance, instance.name)
+
+
+def _drop_unused_location(municipality_id, location_id):
+    # Several events of a tenant can share a location: it stays on the map while one does
+    if not Event.objects.filter(municipality_id=municipality_id, location_id=location_id).exists():
+        transaction.on_commit(lambda: publish_change(municipality_id, "delete", "event_location", location_id))
+
+
+@receiver(post_init, sender=Event)
+def remember_event_location(sender, instance, **kwargs):
+    # __dict__: reading a deferred location_id would cost a query per loaded event
+    instance._indexed_location_id = instance.__dict__.get("location_id") if instance.pk is not None else None
+
+
+@receiver(post_save, sender=Event)
+def publish_event_saved(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is not None and "location" not in update_fields:
+        return
+    previous = getattr(instance, "_indexed_location_id", None)
+    if created or instance.location_id != previous:
+        location = instance.location
+        _publish_point(instance.municipality_id, "event_location", location, location.name)
+        if previous is not None:
+            _drop_unused_location(instance.municipality_id, previous)
+    instance._indexed_location_id = instance.location_id
+
+
+@receiver(post_delete, sender=Event)
+def publish_event_deleted(sender, instance, **kwargs):
+    _drop_unused_location(instance.municipality_id, instance.location_id)
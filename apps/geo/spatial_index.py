@@ -0,0 +1,307 @@
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+from django.apps import apps
+from django.conf import settings
+
+from apps.core.redis_utils import get_redis
+from .search import NEARBY_SOURCES
+from .utils import bounding_box, haversine_m
+
+logger = logging.getLogger("django")
+
+CHANNEL = "geo:index"
+TYPE_CODES = {entity_type: code for code, entity_type in enumerate(NEARBY_SOURCES)}
+
+
+def version_key(municipality_id):
+    return f"geo:index:version:{municipality_id}"
+
+
+class SpatialIndex:
+    """
+    Grid-bucketed point index for one municipality. Points are sorted by grid
+    cell, so every row of cells overlapping a bounding box is one contiguous
+    slice found with searchsorted.
+
+    Changes are applied without touching the arrays: the old slot is masked out
+    and the new position goes to a small pending set that every query scans in
+    full, until ``max_pending`` changes accumulate and the arrays are rebuilt.
+    """
+
+    def __init__(self, entries, version=0, cell_deg=None, max_pending=None):
+        self.entries = entries  # (type, id) -> (name, lat, lng)
+        self.version = version
+        self.cell_deg = cell_deg or getattr(settings, "GEO_INDEX_CELL_DEG", 0.01)
+        self.max_pending = max_pending or getattr(settings, "GEO_INDEX_MAX_PENDING", 512)
+        self.columns = math.ceil(360.0 / self.cell_deg)
+        self.checked_at = time.monotonic()
+        self.lock = threading.Lock()
+        self._rebuild()
+
+    @classmethod
+    def from_arrays(cls, entity_type, ids, lats, lngs, names=None, **kwargs):
+        names = names if names is not None else [""] * len(ids)
+        entries = {
+            (entity_type, int(pk)): (name, float(lat), float(lng))
+            for pk, lat, lng, name in zip(ids, lats, lngs, names)
+        }
+        return cls(entries, **kwargs)
+
+    def _cells(self, lats, lngs):
+        rows = np.floor((np.asarray(lats) + 90.0) / self.cell_deg).astype(np.int64)
+        cols = np.floor((np.asarray(lngs) + 180.0) / self.cell_deg).astype(np.int64)
+        return rows * self.columns + cols
+
+    def _rebuild(self):
+        keys = list(self.entries)
+        count = len(keys)
+        lats = np.fromiter((self.entries[k][1] for k in keys), dtype=np.float64, count=count)
+        lngs = np.fromiter((self.entries[k][2] for k in keys), dtype=np.float64, count=count)
+        cells = self._cells(lats, lngs)
+        order = np.argsort(cells, kind="stable")
+        self.cells = cells[order]
+        self.lats = lats[order]
+        self.lngs = lngs[order]
+        self.types = np.fromiter((TYPE_CODES[keys[i][0]] for i in order), dtype=np.int8, count=count)
+        self.keys = [keys[i] for i in order]
+        self.positions = {key: position for position, key in enumerate(self.keys)}
+        self.alive = np.ones(count, dtype=bool)
+        self.pending = {}
+        self._pending_cache = None
+
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.cells, self.lats, self.lngs, self.types, self.alive))
+
+    def __len__(self):
+        return len(self.entries)
+
+    def apply(self, op, entity_type, pk, name=None, latitude=None, longitude=None):
+        key = (entity_type, pk)
+        with self.lock:
+            position = self.positions.get(key)
+            if position is not None:
+                self.alive[position] = False
+            if op == "upsert":
+                self.entries[key] = (name, latitude, longitude)
+                self.pending[key] = self.entries[key]
+            else:
+                self.entries.pop(key, None)
+                self.pending.pop(key, None)
+            self._pending_cache = None
+            if len(self.pending) > self.max_pending:
+                self._rebuild()
+
+    def _pending_arrays(self):
+        if self._pending_cache is None:
+            keys = list(self.pending)
+            self._pending_cache = (
+                keys,
+                np.array([TYPE_CODES[k[0]] for k in keys], dtype=np.int8),
+                np.array([self.pending[k][1] for k in keys], dtype=np.float64),
+                np.array([self.pending[k][2] for k in keys], dtype=np.float64),
+            )
+        return self._pending_cache
+
+    def query(self, latitude, longitude, radius_m, types, limit):
+        min_lat, max_lat, min_lng, max_lng = bounding_box(latitude, longitude, radius_m)
+        wanted = np.array([TYPE_CODES[t] for t in types], dtype=np.int8)
+        all_types = len(wanted) == len(TYPE_CODES)
+        with self.lock:
+            row_lo = math.floor((max(min_lat, -90.0) + 90.0) / self.cell_deg)
+            row_hi = math.floor((min(max_lat, 90.0) + 90.0) / self.cell_deg)
+            col_lo = math.floor((max(min_lng, -180.0) + 180.0) / self.cell_deg)
+            col_hi = math.floor((min(max_lng, 180.0) + 180.0) / self.cell_deg)
+            rows = np.arange(row_lo, row_hi + 1, dtype=np.int64) * self.columns
+            starts = np.searchsorted(self.cells, rows + col_lo, side="left")
+            ends = np.searchsorted(self.cells, rows + col_hi, side="right")
+            slices = [np.arange(s, e) for s, e in zip(starts.tolist(), ends.tolist()) if e > s]
+            candidates = np.concatenate(slices) if slices else np.empty(0, dtype=np.int64)
+            keep = self.alive[candidates]
+            if not all_types:
+                keep &= np.isin(self.types[candidates], wanted)
+            candidates = candidates[keep]
+            distances = haversine_m(latitude, longitude, self.lats[candidates], self.lngs[candidates])
+            inside = distances <= radius_m
+            candidates, distances = candidates[inside], distances[inside]
+            keys = self.keys
+            found = [keys[i] for i in candidates.tolist()]
+
+            if self.pending:
+                pending_keys, pending_types, pending_lats, pending_lngs = self._pending_arrays()
+                pending_distances = haversine_m(latitude, longitude, pending_lats, pending_lngs)
+                near = pending_distances <= radius_m
+                if not all_types:
+                    near &= np.isin(pending_types, wanted)
+                found += [pending_keys[i] for i in np.flatnonzero(near).tolist()]
+                distances = np.concatenate([distances, pending_distances[near]])
+
+            # Only the closest ``limit`` hits are turned into dicts
+            if len(distances) > limit:
+                closest = np.argpartition(distances, limit - 1)[:limit]
+            else:
+                closest = np.arange(len(distances))
+            closest = closest[np.argsort(distances[closest], kind="stable")]
+            results = []
+            for i in closest.tolist():
+                entity_type, pk = found[i]
+                name, lat, lng = self.entries[found[i]]
+                results.append(
+                    {
+                        "type": entity_type,
+                        "id": pk,
+                        "name": name,
+                        "latitude": lat,
+                        "longitude": lng,
+                        "distance_m": round(float(distances[i]), 1),
+                    }
+                )
+        return results
+
+
+# municipality id -> SpatialIndex, least recently used first
+_indexes = OrderedDict()
+_build_lock = threading.Lock()
+# Guards _indexes and in-place updates, shared by requests and the listener thread
+_indexes_lock = threading.Lock()
+_listener_pid = None
+
+
+def _current_version(municipality_id):
+    try:
+        return int(get_redis().get(version_key(municipality_id)) or 0)
+    except Exception as e:
+        logger.warning(f"Spatial index version unavailable for municipality {municipality_id}: {e}")
+        return None
+
+
+def load_entries(municipality_id):
+    entries = {}
+    for entity_type, (model_path, label_field, tenant_lookup, public) in NEARBY_SOURCES.items():
+        rows = (
+            apps.get_model(model_path)
+            .objects.filter(**{tenant_lookup: municipality_id}, **public)
+            .filter(latitude__isnull=False, longitude__isnull=False)
+            .values_list("pk", label_field, "latitude", "longitude")
+            .distinct()
+        )
+        for pk, label, lat, lng in rows.iterator(chunk_size=5000):
+            entries[(entity_type, pk)] = (label, float(lat), float(lng))
+    return entries
+
+
+def build_index(municipality_id):
+    """
+    Load a tenant's points from the database. The version is read before and
+    after loading; if a change was published in between, load again.
+    """
+    for _ in range(3):
+        version = _current_version(municipality_id)
+        index = SpatialIndex(load_entries(municipality_id), version=version or 0)
+        if version is None or _current_version(municipality_id) == version:
+            break
+    return index
+
+
+def _apply_message(message):
+    with _indexes_lock:
+        index = _indexes.get(message["m"])
+        if index is None or message["v"] <= index.version:
+            return
+        if message["op"] == "reload" or message["v"] != index.version + 1:
+            # A change was missed or cannot be applied in place: rebuild on next use
+            _indexes.pop(message["m"], None)
+            return
+        index.apply(message["op"], message["type"], message["id"], message.get("name"), message.get("lat"),
+                    message.get("lng"))
+        index.version = message["v"]
+
+
+def _listen():
+    while True:
+        try:
+            pubsub = get_redis().pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(CHANNEL)
+            for message in pubsub.listen():
+                _apply_message(json.loads(message["data"]))
+        except Exception as e:
+            logger.warning(f"Spatial index listener lost its subscription: {e}")
+            with _indexes_lock:
+                _indexes.clear()
+            time.sleep(5)
+
+
+def _ensure_listener():
+    """One subscriber thread per process, restarted in forked workers."""
+    global _listener_pid
+    if _listener_pid == os.getpid():
+        return
+    with _build_lock:
+        if _listener_pid != os.getpid():
+            with _indexes_lock:
+                _indexes.clear()
+            threading.Thread(target=_listen, name="geo-index-listener", daemon=True).start()
+            _listener_pid = os.getpid()
+
+
+def get_index(municipality_id):
+    _ensure_listener()
+    with _indexes_lock:
+        index = _indexes.get(municipality_id)
+        if index is not None:
+            _indexes.move_to_end(municipality_id, last=True)
+    if index is not None and time.monotonic() - index.checked_at > getattr(settings, "GEO_INDEX_VERIFY_SECONDS", 30):
+        # Safety net for messages lost while nobody was subscribed
+        version = _current_version(municipality_id)
+        if version is not None and version != index.version:
+            with _indexes_lock:
+                if _indexes.get(municipality_id) is index:
+                    del _indexes[municipality_id]
+            index = None
+        else:
+            index.checked_at = time.monotonic()
+    if index is None:
+        with _build_lock:
+            with _indexes_lock:
+                index = _indexes.get(municipality_id)
+            if index is None:
+                # Built outside _indexes_lock so the listener keeps applying other tenants' changes
+                index = build_index(municipality_id)
+                with _indexes_lock:
+                    _indexes[municipality_id] = index
+                    while len(_indexes) > getattr(settings, "GEO_INDEX_MAX_TENANTS", 64):
+                        _indexes.popitem(last=False)
+    return index
+
+
+def publish_change(municipality_id, op, entity_type=None, pk=None, name=None, latitude=None, longitude=None):
+    """
+    Bump the tenant's index version and broadcast the change to every process.
+    ``op`` is "upsert", "delete" or "reload".
+    """
+    try:
+        redis_conn = get_redis()
+        version = redis_conn.incr(version_key(municipality_id))
+        redis_conn.publish(
+            CHANNEL,
+            json.dumps(
+                {"m": municipality_id, "v": version, "op": op, "type": entity_type, "id": pk, "name": name,
+                 "lat": latitude, "lng": longitude},
+                separators=(",", ":"),
+            ),
+        )
+    except Exception as e:
+        logger.warning(f"Could not publish spatial index change for municipality {municipality_id}: {e}")
+
+
+def nearby(municipality, latitude, longitude, radius_m, types, limit=50):
+    """
+    Same contract as search.nearby(), answered from the in-process index.
+    """
+    return get_index(municipality.pk).query(latitude, longitude, radius_m, types, limit)
@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import NearbySearchView
+
+urlpatterns = [
+    path('nearby/', NearbySearchView.as_view(), name='geo-nearby'),
+]
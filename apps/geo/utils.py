@@ -0,0 +1,80 @@
+import math
+
+import numpy as np
+
+EARTH_RADIUS_M = 6371008.8
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+GEOHASH_PRECISION = 9
+GEOHASH_MAX_COVER_CELLS = 16
+
+
+def encode_geohash(latitude, longitude, precision=GEOHASH_PRECISION):
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, bit_count, even = [], 0, 0, True
+    while len(chars) < precision:
+        rng, value = (lng_range, longitude) if even else (lat_range, latitude)
+        mid = (rng[0] + rng[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_ALPHABET[bits])
+            bits, bit_count = 0, 0
+    return "".join(chars)
+
+
+def geohash_cell_size(precision):
+    """(lat degrees, lng degrees) covered by one cell at ``precision``."""
+    bits = 5 * precision
+    lng_bits = (bits + 1) // 2
+    return 180.0 / (1 << (bits - lng_bits)), 360.0 / (1 << lng_bits)
+
+
+def bounding_box(latitude, longitude, radius_m):
+    """(min_lat, max_lat, min_lng, max_lng) enclosing the circle."""
+    dlat = math.degrees(radius_m / EARTH_RADIUS_M)
+    cos_lat = math.cos(math.radians(min(89.9, abs(latitude) + dlat)))
+    dlng = min(180.0, dlat / max(cos_lat, 1e-6))
+    return latitude - dlat, latitude + dlat, longitude - dlng, longitude + dlng
+
+
+def covering_prefixes(latitude, longitude, radius_m, max_cells=GEOHASH_MAX_COVER_CELLS):
+    """
+    Geohash prefixes of every cell overlapping the circle's bounding box, at the
+    finest precision that needs at most ``max_cells`` cells. Returns [] when the
+    circle is too big for prefixes to help.
+    """
+    min_lat, max_lat, min_lng, max_lng = bounding_box(latitude, longitude, radius_m)
+    min_lat, max_lat = max(min_lat, -90.0), min(max_lat, 90.0)
+    if min_lng < -180.0 or max_lng > 180.0:
+        return []
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        cell_lat, cell_lng = geohash_cell_size(precision)
+        rows = range(int((min_lat + 90.0) // cell_lat), int((max_lat + 90.0) // cell_lat) + 1)
+        cols = range(int((min_lng + 180.0) // cell_lng), int((max_lng + 180.0) // cell_lng) + 1)
+        if len(rows) * len(cols) <= max_cells:
+            return sorted(
+                {
+                    encode_geohash(
+                        min(89.999999, (row + 0.5) * cell_lat - 90.0),
+                        min(179.999999, (col + 0.5) * cell_lng - 180.0),
+                        precision,
+                    )
+                    for row in rows
+                    for col in cols
+                }
+            )
+    return []
+
+
+def haversine_m(latitude, longitude, lats, lngs):
+    """Vectorised great-circle distance in metres from one point to arrays of points."""
+    lat1, lng1 = np.radians(latitude), np.radians(longitude)
+    lat2, lng2 = np.radians(lats), np.radians(lngs)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
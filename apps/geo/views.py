@@ -0,0 +1,54 @@
+from django.conf import settings
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from . import spatial_index
+from .search import NEARBY_SOURCES, nearby, nearest
+
+
+class NearbySearchView(APIView):
+    """
+    Places, businesses and event locations near a point.
+    Query params: lat, lng, radius (metres) or k (nearest k), types (comma separated), limit.
+    """
+    permission_classes = [permissions.AllowAny]
+    read_replica = True
+
+    def get(self, request):
+        params = request.query_params
+        max_radius = getattr(settings, "GEO_MAX_RADIUS_M", 50000)
+        try:
+            latitude = float(params["lat"])
+            longitude = float(params["lng"])
+            radius = float(params.get("radius", 2000))
+            k = int(params["k"]) if params.get("k") else None
+            limit = min(int(params.get("limit", 50)), getattr(settings, "GEO_MAX_RESULTS", 200))
+        except (KeyError, ValueError):
+            return Response(
+                {"detail": "lat and lng are required; radius, k and limit must be numbers."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            return Response({"detail": "Coordinates out of range."}, status=status.HTTP_400_BAD_REQUEST)
+        if not 0 < radius <= max_radius:
+            return Response(
+                {"detail": f"Radius must be between 0 and {max_radius} metres."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        types = [t for t in params.get("types", ",".join(NEARBY_SOURCES)).split(",") if t]
+        unknown = set(types) - set(NEARBY_SOURCES)
+        if unknown or not types:
+            return Response(
+                {"detail": f"types must be among: {', '.join(NEARBY_SOURCES)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        search = spatial_index.nearby if getattr(settings, "GEO_MEMORY_INDEX", True) else nearby
+        if k is not None:
+            if not 0 < k <= limit:
+                return Response({"detail": f"k must be between 1 and {limit}."}, status=status.HTTP_400_BAD_REQUEST)
+            results = nearest(request.tenant, latitude, longitude, k, types, max_radius_m=max_radius, search=search)
+        else:
+            results = search(request.tenant, latitude, longitude, radius, types, limit=limit)
+        return Response({"count": len(results), "results": results})
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class MunicipalityConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.municipality'
+
+    def ready(self):
+        import apps.municipality.signals
@@ -1,3 +1,7 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
 from django.http import HttpResponseNotFound
 from .models import Municipality
 from apps.core.tenant_context import set_current_tenant, clear_current_tenant
@@ -5,6 +9,40 @@ import logging
 
 logger = logging.getLogger("django")
 
+# Bumped on every Municipality save/delete (see .signals), so each process
+# drops the tenants it holds instead of serving them until they expire
+TENANT_GENERATION_KEY = "tenant:gen"
+
+# subdomain -> (Municipality, expires_at, generation); saves a query on every request
+_tenant_cache = {}
+
+
+def tenant_generation():
+    try:
+        return cache.get(TENANT_GENERATION_KEY, 0)
+    except Exception as e:
+        logger.warning(f"Tenant generation unavailable: {e}")
+        return None
+
+
+def invalidate_tenants():
+    try:
+        if not cache.add(TENANT_GENERATION_KEY, 1, timeout=None):
+            cache.incr(TENANT_GENERATION_KEY)
+    except Exception as e:
+        logger.warning(f"Could not invalidate cached tenants: {e}")
+
+
+def get_tenant_for_subdomain(subdomain):
+    generation = tenant_generation()
+    hit = _tenant_cache.get(subdomain)
+    if hit and hit[1] > time.monotonic() and hit[2] == generation:
+        return hit[0]
+    tenant = Municipality.objects.get(unique_slug=subdomain)
+    _tenant_cache[subdomain] = (tenant, time.monotonic() + getattr(settings, "TENANT_CACHE_SECONDS", 60), generation)
+    return tenant
+
+
 class TenantContextMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
@@ -12,7 +50,7 @@ class TenantContextMiddleware:
     def __call__(self, request):
         subdomain = request.get_host().split(":")[0].split(".")[0].lower()
         try:
-            tenant = Municipality.objects.get(unique_slug=subdomain)
+            tenant = get_tenant_for_subdomain(subdomain)
         except Municipality.DoesNotExist:
             return HttpResponseNotFound("Tenant not found")
         except Exception as e:
@@ -0,0 +1,13 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .middleware import invalidate_tenants
+from .models import Municipality
+
+
+@receiver(post_save, sender=Municipality)
+@receiver(post_delete, sender=Municipality)
+def drop_cached_tenants(sender, instance, **kwargs):
+    # After commit, or another process could re-read and cache the old row under the new generation
+    transaction.on_commit(invalidate_tenants)
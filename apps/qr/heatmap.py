@@ -0,0 +1,50 @@
+import numpy as np
+
+from .models import QRAnalytics
+
+SCAN_POINT_DTYPE = np.dtype([("lat", "f8"), ("lng", "f8")])
+
+
+def bin_points(lat, lng, cell_size):
+    """
+    Count points per grid cell of ``cell_size`` degrees.
+    Returns (cell_lat, cell_lng, count) arrays; cell coordinates are cell centres.
+    """
+    if lat.size == 0:
+        empty = np.empty(0)
+        return empty, empty, np.empty(0, dtype=np.int64)
+    rows = np.floor((lat + 90.0) / cell_size).astype(np.int64)
+    cols = np.floor((lng + 180.0) / cell_size).astype(np.int64)
+    width = int(np.ceil(360.0 / cell_size)) + 1
+    cells, counts = np.unique(rows * width + cols, return_counts=True)
+    cell_lat = (cells // width + 0.5) * cell_size - 90.0
+    cell_lng = (cells % width + 0.5) * cell_size - 180.0
+    return cell_lat, cell_lng, counts
+
+
+def scan_heatmap(municipality, start, end, cell_size, qr=None, chunk_size=5000):
+    """
+    Bin a municipality's geolocated scans between ``start`` and ``end``.
+    Rows are streamed straight into a NumPy array, never into model instances.
+    """
+    scans = QRAnalytics.objects.filter(
+        municipality=municipality,
+        scanned_at__gte=start,
+        scanned_at__lt=end,
+        latitude__isnull=False,
+        longitude__isnull=False,
+    )
+    if qr is not None:
+        scans = scans.filter(qr=qr)
+    points = np.fromiter(
+        scans.values_list("latitude", "longitude").iterator(chunk_size=chunk_size),
+        dtype=SCAN_POINT_DTYPE,
+    )
+    cell_lat, cell_lng, counts = bin_points(points["lat"], points["lng"], cell_size)
+    return {
+        "cell_size": cell_size,
+        "total": int(counts.sum()),
+        "lat": np.round(cell_lat, 6).tolist(),
+        "lng": np.round(cell_lng, 6).tolist(),
+        "count": counts.tolist(),
+    }
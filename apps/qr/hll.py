@@ -0,0 +1,137 @@
+import hashlib
+import logging
+import math
+from datetime import timedelta
+
+from django.conf import settings
+
+from apps.core.redis_utils import get_redis
+
+logger = logging.getLogger("django")
+
+# Same register count as Redis (2^14), so both backends share the error bound.
+HLL_PRECISION = 14
+HLL_STANDARD_ERROR = round(1.04 / math.sqrt(2 ** HLL_PRECISION), 4)
+
+
+class HyperLogLog:
+    """
+    Pure-Python HyperLogLog, used when Redis is not the configured backend (tests, local dev).
+    """
+
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = bytearray(self.m)
+
+    def add(self, value):
+        """Add ``value``; return True if the estimate may have changed."""
+        x = int.from_bytes(hashlib.blake2b(str(value).encode("utf-8"), digest_size=8).digest(), "big")
+        index = x >> (64 - self.precision)
+        rest = x & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+            return True
+        return False
+
+    def merge(self, other):
+        for i, rank in enumerate(other.registers):
+            if rank > self.registers[i]:
+                self.registers[i] = rank
+        return self
+
+    def count(self):
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+
+def day_key(qr_uuid, day):
+    return f"qr:hll:{qr_uuid}:{day:%Y%m%d}"
+
+
+def lifetime_key(qr_uuid):
+    return f"qr:hll:{qr_uuid}:all"
+
+
+def _days(start, end):
+    day = start
+    while day <= end:
+        yield day
+        day += timedelta(days=1)
+
+
+class RedisVisitorBackend:
+    def add(self, qr_uuid, visitor, day, pipe=None):
+        """
+        PFADD the visitor to the day and lifetime keys. When ``pipe`` is given the
+        commands are only queued on it.
+        """
+        retention = getattr(settings, "QR_HLL_RETENTION_DAYS", 400)
+        target = pipe if pipe is not None else get_redis().pipeline(transaction=False)
+        target.pfadd(day_key(qr_uuid, day), visitor)
+        target.expire(day_key(qr_uuid, day), retention * 86400)
+        target.pfadd(lifetime_key(qr_uuid), visitor)
+        if pipe is None:
+            target.execute()
+
+    def count(self, qr_uuid, start, end):
+        return get_redis().pfcount(*[day_key(qr_uuid, day) for day in _days(start, end)])
+
+    def lifetime_counts(self, qr_uuids):
+        with get_redis().pipeline(transaction=False) as pipe:
+            for qr_uuid in qr_uuids:
+                pipe.pfcount(lifetime_key(qr_uuid))
+            return dict(zip(qr_uuids, pipe.execute()))
+
+
+class MemoryVisitorBackend:
+    def __init__(self):
+        self.sketches = {}
+
+    def add(self, qr_uuid, visitor, day, pipe=None):
+        self.sketches.setdefault(day_key(qr_uuid, day), HyperLogLog()).add(visitor)
+        self.sketches.setdefault(lifetime_key(qr_uuid), HyperLogLog()).add(visitor)
+
+    def count(self, qr_uuid, start, end):
+        merged = HyperLogLog()
+        for day in _days(start, end):
+            sketch = self.sketches.get(day_key(qr_uuid, day))
+            if sketch is not None:
+                merged.merge(sketch)
+        return merged.count()
+
+    def lifetime_counts(self, qr_uuids):
+        return {
+            qr_uuid: self.sketches[lifetime_key(qr_uuid)].count() if lifetime_key(qr_uuid) in self.sketches else 0
+            for qr_uuid in qr_uuids
+        }
+
+
+_BACKENDS = {"redis": RedisVisitorBackend, "memory": MemoryVisitorBackend}
+_backend = None
+
+
+def get_visitor_backend():
+    global _backend
+    name = getattr(settings, "QR_UNIQUE_VISITOR_BACKEND", "redis")
+    if not isinstance(_backend, _BACKENDS[name]):
+        _backend = _BACKENDS[name]()
+    return _backend
+
+
+def count_unique_visitors(qr_uuid, start, end):
+    """
+    Approximate distinct visitors of a QR between two dates (inclusive),
+    merging the per-day sketches on read.
+    """
+    return {
+        "unique_visitors": get_visitor_backend().count(qr_uuid, start, end),
+        "standard_error": HLL_STANDARD_ERROR,
+        "approximate": True,
+    }
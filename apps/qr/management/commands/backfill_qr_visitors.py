@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from apps.core.redis_utils import get_redis
+from apps.qr.hll import RedisVisitorBackend, get_visitor_backend
+from apps.qr.models import QR, QRAnalytics
+
+
+class Command(BaseCommand):
+    help = "Load historic QRAnalytics rows into the unique-visitor HyperLogLog sketches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        backend = get_visitor_backend()
+        batch_size = options["batch_size"]
+        rows = QRAnalytics.objects.values_list("qr_id", "ip_address", "scanned_at").iterator(chunk_size=batch_size)
+        pipe = get_redis().pipeline(transaction=False) if isinstance(backend, RedisVisitorBackend) else None
+        added = 0
+        for qr_id, ip_address, scanned_at in rows:
+            backend.add(qr_id, ip_address, scanned_at.date(), pipe=pipe)
+            added += 1
+            if pipe is not None and added % batch_size == 0:
+                pipe.execute()
+        if pipe is not None:
+            pipe.execute()
+
+        qrs = list(QR.objects.only("uuid", "unique_ip_count"))
+        counts = backend.lifetime_counts([qr.uuid for qr in qrs])
+        for qr in qrs:
+            qr.unique_ip_count = counts[qr.uuid]
+        QR.objects.bulk_update(qrs, ["unique_ip_count"], batch_size=batch_size)
+        self.stdout.write(f"Added {added} scans; refreshed {len(qrs)} QR counters.")
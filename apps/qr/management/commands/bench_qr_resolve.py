@@ -0,0 +1,54 @@
+import itertools
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from apps.core.benchmark import format_stats, measure
+from apps.core.redis_utils import get_redis
+from apps.qr import resolver
+from apps.qr.views import qr_scan_redirect
+
+
+class Command(BaseCommand):
+    help = "Benchmark QR scan resolution and the redirect view (requires Redis)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--codes", type=int, default=10000)
+        parser.add_argument("--iterations", type=int, default=20000)
+
+    def handle(self, *args, **options):
+        codes = [str(uuid.uuid4()) for _ in range(options["codes"])]
+        redis_conn = get_redis()
+        redis_conn.hset(resolver.TARGETS_KEY, mapping={c: f"/places/{i}/" for i, c in enumerate(codes)})
+        iterations = options["iterations"]
+        factory = RequestFactory()
+
+        try:
+            local = itertools.cycle(codes)
+            cold = itertools.cycle(codes)
+            view = itertools.cycle(codes)
+
+            def from_redis():
+                code = next(cold)
+                resolver._local_targets.pop(code, None)
+                resolver.resolve_target(code)
+
+            def redirect():
+                code = next(view)
+                request = factory.get(f"/qr/place/1/{code}/", REMOTE_ADDR="10.0.0.1")
+                qr_scan_redirect(request, "place", "1", uuid.UUID(code))
+
+            with CaptureQueriesContext(connection) as queries:
+                results = {
+                    "resolve_redis": measure(from_redis, iterations),
+                    "resolve_local": measure(lambda: resolver.resolve_target(next(local)), iterations),
+                    "redirect_view": measure(redirect, iterations),
+                }
+            for name, stats in results.items():
+                self.stdout.write(format_stats(name, stats))
+            self.stdout.write(f"SQL queries: {len(queries)}")
+        finally:
+            redis_conn.hdel(resolver.TARGETS_KEY, *codes)
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from apps.qr.resolver import warm_targets
+
+
+class Command(BaseCommand):
+    help = "Publish every QR redirect target to Redis."
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Published {warm_targets()} QR targets.")
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.1 on 2026-10-19 11:53
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('municipality', '0001_initial'),
+        ('qr', '0003_remove_qr_latitude_remove_qr_longitude_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='qranalytics',
+            name='municipality',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='%(class)s_related', to='municipality.municipality'),
+        ),
+        migrations.AddIndex(
+            model_name='qranalytics',
+            index=models.Index(fields=['municipality', 'scanned_at'], name='qr_qranalyt_municip_beff4e_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.1 on 2026-10-19 12:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('qr', '0004_qranalytics_municipality_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='qranalytics',
+            index=models.Index(fields=['scanned_at', 'id'], name='qr_qranalyt_scanned_ddd9cd_idx'),
+        ),
+    ]
@@ -1,6 +1,6 @@
 from django.db import models
 from django.conf import settings
-from apps.municipality.models import Municipality
+from apps.municipality.models import Municipality, MunicipalityAwareModel
 import uuid
 from apps.core.models import BaseModel
 
@@ -28,7 +28,7 @@ class QR(BaseModel):
     def __str__(self):
         return f"{self.name} ({self.municipality.name})"
 
-class QRAnalytics(BaseModel):
+class QRAnalytics(MunicipalityAwareModel, BaseModel):
     qr = models.ForeignKey(
         'QR', 
         on_delete=models.CASCADE, 
@@ -38,6 +38,12 @@ class QRAnalytics(BaseModel):
     ip_address = models.GenericIPAddressField()
     latitude = models.FloatField(blank=True, null=True)
     longitude = models.FloatField(blank=True, null=True)
-    
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["municipality", "scanned_at"]),
+            models.Index(fields=["scanned_at", "id"]),
+        ]
+
     def __str__(self):
         return f"{self.qr.name} scanned at {self.scanned_at} from {self.ip_address}"
\ No newline at end of file
@@ -0,0 +1,139 @@
+import json
+import logging
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils import timezone
+
+from apps.core.redis_utils import get_redis
+from .hll import get_visitor_backend
+from .models import QR
+from .utils import entity_pk
+
+logger = logging.getLogger("django")
+
+TARGETS_KEY = "qr:targets"
+SCAN_BUFFER_KEY = "qr:scans"
+MISSING = ""
+
+# Per-process LRU of qr uuid -> (target path, expires_at)
+_local_targets = OrderedDict()
+
+
+def target_path(entity_type, entity_id):
+    paths = getattr(settings, "QR_TARGET_PATHS", {})
+    template = paths.get(entity_type)
+    if template is None:
+        return MISSING
+    return template.format(entity_id=entity_pk(entity_id))
+
+
+def _remember(key, target):
+    _local_targets[key] = (target, time.monotonic() + getattr(settings, "QR_LOCAL_TARGET_TTL", 60))
+    _local_targets.move_to_end(key)
+    if len(_local_targets) > getattr(settings, "QR_LOCAL_TARGET_MAX", 50000):
+        _local_targets.popitem(last=False)
+
+
+def publish_target(qr):
+    key = str(qr.uuid)
+    target = target_path(qr.entity_type, qr.entity_id)
+    _remember(key, target)
+    try:
+        get_redis().hset(TARGETS_KEY, key, target)
+    except Exception as e:
+        logger.warning(f"Could not publish QR target {key}: {e}")
+
+
+def forget_target(qr_uuid):
+    key = str(qr_uuid)
+    _local_targets.pop(key, None)
+    try:
+        get_redis().hdel(TARGETS_KEY, key)
+    except Exception as e:
+        logger.warning(f"Could not forget QR target {key}: {e}")
+
+
+def warm_targets(batch_size=5000):
+    """
+    Load every QR target into Redis. Returns the number of targets written.
+    """
+    redis_conn = get_redis()
+    written = 0
+    mapping = {}
+    for qr_uuid, entity_type, entity_id in QR.objects.values_list("uuid", "entity_type", "entity_id").iterator(
+        chunk_size=batch_size
+    ):
+        mapping[str(qr_uuid)] = target_path(entity_type, entity_id)
+        if len(mapping) >= batch_size:
+            redis_conn.hset(TARGETS_KEY, mapping=mapping)
+            written += len(mapping)
+            mapping = {}
+    if mapping:
+        redis_conn.hset(TARGETS_KEY, mapping=mapping)
+        written += len(mapping)
+    return written
+
+
+def resolve_target(qr_uuid):
+    """
+    Return the redirect path for a QR, or None if the QR does not exist.
+    Lookups go to the in-process map first, then Redis; the database is only
+    consulted for QRs that have never been published.
+    """
+    key = str(qr_uuid)
+    hit = _local_targets.get(key)
+    if hit and hit[1] > time.monotonic():
+        return hit[0] or None
+
+    target = None
+    try:
+        raw = get_redis().hget(TARGETS_KEY, key)
+        if raw is not None:
+            target = raw.decode()
+    except Exception as e:
+        logger.warning(f"QR target lookup failed for {key}: {e}")
+
+    if target is None:
+        qr = QR.objects.filter(pk=qr_uuid).only("uuid", "entity_type", "entity_id").first()
+        if qr is None:
+            _remember(key, MISSING)
+            return None
+        publish_target(qr)
+        return _local_targets[key][0] or None
+
+    _remember(key, target)
+    return target or None
+
+
+def record_scan(qr_uuid, ip_address, latitude=None, longitude=None, municipality_id=None):
+    """
+    Queue a scan for qr.tasks.flush_scan_buffer and count the visitor in the
+    HyperLogLog sketches, in one round trip. Never raises: a Redis outage must
+    not break the redirect.
+    """
+    scan = {
+        "qr": str(qr_uuid),
+        "m": municipality_id,
+        "ip": ip_address,
+        "lat": latitude,
+        "lng": longitude,
+        "ts": time.time(),
+    }
+    try:
+        with get_redis().pipeline(transaction=False) as pipe:
+            pipe.rpush(SCAN_BUFFER_KEY, json.dumps(scan, separators=(",", ":")))
+            get_visitor_backend().add(qr_uuid, ip_address, timezone.now().date(), pipe=pipe)
+            pipe.execute()
+    except Exception as e:
+        logger.warning(f"Dropped QR scan for {qr_uuid}: {e}")
+
+
+def drain_scans(batch_size):
+    redis_conn = get_redis()
+    with redis_conn.pipeline() as pipe:
+        pipe.lrange(SCAN_BUFFER_KEY, 0, batch_size - 1)
+        pipe.ltrim(SCAN_BUFFER_KEY, batch_size, -1)
+        raw, _ = pipe.execute()
+    return [json.loads(item) for item in raw]
@@ -1,5 +1,12 @@
+from django.conf import settings
 from rest_framework import serializers
 from .models import QR, QRAnalytics
+from .utils import (
+    BULK_JOB_OUTPUTS,
+    ERROR_CORRECTION_LEVELS,
+    QR_ENTITY_SOURCES,
+    RENDER_CONTENT_TYPES,
+)
 
 class QRSerializer(serializers.ModelSerializer):
     class Meta:
@@ -16,3 +23,25 @@ class QRAnalyticsSerializer(serializers.ModelSerializer):
         if not value:
             raise serializers.ValidationError("IP address is required.")
         return value
+
+
+class QRBulkJobSerializer(serializers.Serializer):
+    entity_type = serializers.ChoiceField(choices=list(QR_ENTITY_SOURCES))
+    filters = serializers.DictField(required=False, default=dict)
+    output = serializers.ChoiceField(choices=list(BULK_JOB_OUTPUTS), default="zip")
+    fmt = serializers.ChoiceField(choices=list(RENDER_CONTENT_TYPES), default="png")
+    size = serializers.IntegerField(
+        default=600,
+        min_value=getattr(settings, "QR_RENDER_MIN_SIZE", 64),
+        max_value=getattr(settings, "QR_RENDER_MAX_SIZE", 4096),
+    )
+    error_correction = serializers.ChoiceField(choices=list(ERROR_CORRECTION_LEVELS), default="M")
+
+    def validate(self, attrs):
+        _, _, allowed = QR_ENTITY_SOURCES[attrs["entity_type"]]
+        unknown = set(attrs.get("filters", {})) - set(allowed)
+        if unknown:
+            raise serializers.ValidationError(
+                {"filters": f"Unsupported filters: {', '.join(sorted(unknown))}."}
+            )
+        return attrs
@@ -1,7 +1,15 @@
-from django.db.models.signals import post_save
+import logging
+
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.utils.timezone import now
 from .models import QRAnalytics, QR
+from .hll import get_visitor_backend
+from .resolver import publish_target, forget_target
+from .utils import render_data_key
+
+logger = logging.getLogger("django")
 
 @receiver(post_save, sender=QRAnalytics)
 def update_qr_scan_stats(sender, instance, created, **kwargs):
@@ -11,8 +19,27 @@ def update_qr_scan_stats(sender, instance, created, **kwargs):
     ip_address = instance.ip_address
 
     qr.total_scans += 1
-    unique_ip_count = QRAnalytics.objects.filter(qr=qr, ip_address=ip_address).count()
-    if unique_ip_count == 1:
-        qr.unique_ip_count += 1
+    try:
+        backend = get_visitor_backend()
+        backend.add(qr.uuid, ip_address, instance.scanned_at.date())
+        qr.unique_ip_count = backend.lifetime_counts([qr.uuid])[qr.uuid]
+    except Exception as e:
+        logger.warning(f"Unique visitor sketch unavailable for QR {qr.uuid}: {e}")
+        unique_ip_count = QRAnalytics.objects.filter(qr=qr, ip_address=ip_address).count()
+        if unique_ip_count == 1:
+            qr.unique_ip_count += 1
     qr.last_scanned_at = now()
-    qr.save()
+    qr.save(update_fields=["total_scans", "unique_ip_count", "last_scanned_at", "updated_at"])
+
+
+@receiver(post_save, sender=QR)
+def publish_qr_target(sender, instance, created, update_fields=None, **kwargs):
+    if created or update_fields is None or {"entity_type", "entity_id"} & set(update_fields):
+        publish_target(instance)
+        cache.delete(render_data_key(instance.uuid))
+
+
+@receiver(post_delete, sender=QR)
+def forget_qr_target(sender, instance, **kwargs):
+    forget_target(instance.uuid)
+    cache.delete(render_data_key(instance.uuid))
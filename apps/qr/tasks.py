@@ -0,0 +1,218 @@
+import io
+import os
+import time
+import uuid
+import zipfile
+from collections import defaultdict
+from datetime import datetime, timezone as dt_timezone
+
+from billiard.pool import Pool
+from celery import shared_task
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.urls import reverse
+from django.utils.text import slugify
+
+from apps.municipality.models import Municipality
+from .models import QR, QRAnalytics
+from .hll import get_visitor_backend
+from .resolver import drain_scans
+from .utils import (
+    QR_ENTITY_SOURCES,
+    build_qr_url,
+    bulk_job_export_folder,
+    bulk_job_export_path,
+    entity_uuid,
+    render_qr,
+    update_bulk_job,
+)
+
+# A4 at 150 DPI, 3 x 4 codes per page
+SHEET_PAGE_SIZE = (1240, 1754)
+SHEET_COLUMNS = 3
+SHEET_ROWS = 4
+SHEET_MARGIN = 60
+SHEET_LABEL_HEIGHT = 40
+PROGRESS_EVERY = 25
+
+
+def _render_job_item(item):
+    filename, label, data, fmt, size, error_correction = item
+    return filename, label, render_qr(data, fmt=fmt, size=size, error_correction=error_correction)
+
+
+def _ensure_qr_rows(entity_type, entities, user_id):
+    """
+    Create QR rows for entities that do not have one yet, in batches.
+    """
+    by_entity_id = {entity_uuid(pk): label for pk, label in entities}
+    existing = set(
+        QR.objects.filter(entity_type=entity_type, entity_id__in=list(by_entity_id)).values_list(
+            "entity_id", flat=True
+        )
+    )
+    missing = []
+    for entity_id, label in by_entity_id.items():
+        if entity_id in existing:
+            continue
+        qr_uuid = uuid.uuid4()
+        missing.append(
+            QR(
+                uuid=qr_uuid,
+                entity_type=entity_type,
+                entity_id=entity_id,
+                name=(label or f"{entity_type}_{entity_id}")[:150],
+                user_id=user_id,
+                qr_code_image=reverse("qr-render", kwargs={"pk": qr_uuid}),
+            )
+        )
+    QR.objects.bulk_create(missing, batch_size=500)
+    return len(missing), list(by_entity_id)
+
+
+def _write_zip(path, results, job_id, total):
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED) as archive:
+        for processed, (filename, _, image) in enumerate(results, start=1):
+            archive.writestr(filename, image)
+            if processed % PROGRESS_EVERY == 0 or processed == total:
+                update_bulk_job(job_id, processed=processed)
+
+
+def _write_sheet(path, results, job_id, total):
+    """
+    Lay codes out on A4 pages and append each page to the PDF as soon as it is full,
+    so only one page is held in memory at a time.
+    """
+    from PIL import Image, ImageDraw, ImageFont
+
+    font = ImageFont.load_default()
+    per_page = SHEET_COLUMNS * SHEET_ROWS
+    cell_w = (SHEET_PAGE_SIZE[0] - 2 * SHEET_MARGIN) // SHEET_COLUMNS
+    cell_h = (SHEET_PAGE_SIZE[1] - 2 * SHEET_MARGIN) // SHEET_ROWS
+    page, pages = None, 0
+
+    for processed, (_, label, image) in enumerate(results, start=1):
+        slot = (processed - 1) % per_page
+        if slot == 0:
+            page = Image.new("RGB", SHEET_PAGE_SIZE, "white")
+        code = Image.open(io.BytesIO(image)).convert("RGB")
+        code.thumbnail((cell_w, cell_h - SHEET_LABEL_HEIGHT))
+        x = SHEET_MARGIN + (slot % SHEET_COLUMNS) * cell_w
+        y = SHEET_MARGIN + (slot // SHEET_COLUMNS) * cell_h
+        page.paste(code, (x + (cell_w - code.width) // 2, y))
+        ImageDraw.Draw(page).text((x + 10, y + code.height + 5), label[:40], fill="black", font=font)
+        if slot == per_page - 1 or processed == total:
+            page.save(path, "PDF", resolution=150, append=pages > 0)
+            pages += 1
+            update_bulk_job(job_id, processed=processed)
+
+
+@shared_task(name="qr.bulk_generate_qr")
+def bulk_generate_qr(job_id, municipality_id, entity_type, filters=None, output="zip",
+                     fmt="png", size=600, error_correction="M", user_id=None):
+    model_path, label_field, _ = QR_ENTITY_SOURCES[entity_type]
+    model = apps.get_model(model_path)
+    municipality = Municipality.objects.get(pk=municipality_id)
+    update_bulk_job(job_id, status="running", output=output)
+    try:
+        entities = list(
+            model.objects.filter(municipality=municipality, **(filters or {}))
+            .order_by("pk")
+            .values_list("pk", label_field)
+        )
+        created, entity_ids = _ensure_qr_rows(entity_type, entities, user_id)
+        qrs = QR.objects.filter(entity_type=entity_type, entity_id__in=entity_ids).order_by("name")
+        if output == "sheet":
+            fmt, size = "png", SHEET_PAGE_SIZE[0] // SHEET_COLUMNS
+        items = [
+            (
+                f"{slugify(name) or entity_type}_{qr_uuid.hex[:8]}.{fmt}",
+                name,
+                build_qr_url(entity_type, entity_id, qr_uuid, municipality=municipality.unique_slug),
+                fmt,
+                size,
+                error_correction,
+            )
+            for qr_uuid, entity_id, name in qrs.values_list("uuid", "entity_id", "name")
+        ]
+        total = len(items)
+        update_bulk_job(job_id, total=total, created=created, processed=0)
+
+        path = bulk_job_export_path(job_id, output)
+        processes = getattr(settings, "QR_BULK_POOL_SIZE", None) or os.cpu_count()
+        with Pool(processes=processes) as pool:
+            results = pool.imap(_render_job_item, items, chunksize=8)
+            if output == "sheet":
+                _write_sheet(path, results, job_id, total)
+            else:
+                _write_zip(path, results, job_id, total)
+    except Exception as e:
+        update_bulk_job(job_id, status="failed", error=str(e))
+        raise
+    update_bulk_job(job_id, status="done")
+
+
+@shared_task(name="qr.purge_bulk_exports")
+def purge_bulk_exports():
+    """
+    Delete export files older than QR_BULK_JOB_TIMEOUT: by then their job
+    entry has expired and download() can no longer serve them.
+    """
+    folder = bulk_job_export_folder()
+    if not os.path.isdir(folder):
+        return 0
+    cutoff = time.time() - getattr(settings, "QR_BULK_JOB_TIMEOUT", 60 * 60 * 24)
+    removed = 0
+    for entry in os.scandir(folder):
+        if entry.is_file() and entry.stat().st_mtime < cutoff:
+            try:
+                os.remove(entry.path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+    return removed
+
+
+@shared_task(name="qr.flush_scan_buffer")
+def flush_scan_buffer(batch_size=1000):
+    """
+    Move scans queued by the redirect view into QRAnalytics and roll them up
+    into the QR counters. scanned_at is auto_now_add, so it records flush time,
+    which lags the real scan by at most one beat interval.
+    """
+    scans = drain_scans(batch_size)
+    if not scans:
+        return 0
+    known = {
+        str(pk)
+        for pk in QR.objects.filter(uuid__in={s["qr"] for s in scans}).values_list("uuid", flat=True)
+    }
+    grouped = defaultdict(list)
+    for scan in scans:
+        if scan["qr"] in known and scan["ip"]:
+            grouped[scan["qr"]].append(scan)
+
+    # record_scan() already added every visitor to the HyperLogLog sketches
+    unique_counts = get_visitor_backend().lifetime_counts(list(grouped))
+    with transaction.atomic():
+        for qr_id, qr_scans in grouped.items():
+            QRAnalytics.objects.bulk_create(
+                [
+                    QRAnalytics(
+                        qr_id=qr_id,
+                        municipality_id=s.get("m"),
+                        ip_address=s["ip"],
+                        latitude=s["lat"],
+                        longitude=s["lng"],
+                    )
+                    for s in qr_scans
+                ]
+            )
+            QR.objects.filter(pk=qr_id).update(
+                total_scans=F("total_scans") + len(qr_scans),
+                unique_ip_count=unique_counts[qr_id],
+                last_scanned_at=datetime.fromtimestamp(max(s["ts"] for s in qr_scans), tz=dt_timezone.utc),
+            )
+    return sum(len(v) for v in grouped.values())
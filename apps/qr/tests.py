@@ -1,3 +1,70 @@
-from django.test import TestCase
+import uuid
+from datetime import date, timedelta
 
-# Create your tests here.
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from apps.municipality.models import Municipality
+from .hll import HLL_STANDARD_ERROR, HyperLogLog, MemoryVisitorBackend
+
+
+class HyperLogLogTests(SimpleTestCase):
+    def test_estimate_within_error_bound(self):
+        for n in (10_000, 100_000):
+            with self.subTest(n=n):
+                sketch = HyperLogLog()
+                for i in range(n):
+                    sketch.add(f"10.0.{i // 256}.{i % 256}")
+                self.assertLessEqual(abs(sketch.count() - n) / n, 3 * HLL_STANDARD_ERROR)
+
+    def test_duplicates_do_not_count(self):
+        sketch = HyperLogLog()
+        for _ in range(3):
+            for i in range(1000):
+                sketch.add(i)
+        self.assertLessEqual(abs(sketch.count() - 1000) / 1000, 3 * HLL_STANDARD_ERROR)
+
+    def test_merge_on_read_equals_union(self):
+        backend = MemoryVisitorBackend()
+        qr_uuid = uuid.uuid4()
+        first = date(2026, 1, 1)
+        union = HyperLogLog()
+        for offset, visitors in enumerate((range(0, 6000), range(3000, 9000))):
+            for visitor in visitors:
+                backend.add(qr_uuid, visitor, first + timedelta(days=offset))
+                union.add(visitor)
+        # Outside the range read below
+        for visitor in range(20000, 30000):
+            backend.add(qr_uuid, visitor, first + timedelta(days=5))
+
+        self.assertEqual(backend.count(qr_uuid, first, first + timedelta(days=1)), union.count())
+        self.assertEqual(backend.count(qr_uuid, first - timedelta(days=3), first - timedelta(days=1)), 0)
+
+
+@override_settings(QR_UNIQUE_VISITOR_BACKEND="memory", QR_HLL_RETENTION_DAYS=30)
+class UniqueVisitorsViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.municipality = Municipality.objects.create(
+            name="Visitors", unique_slug="visitors", full_domain="visitors.example.com"
+        )
+
+    def get(self, **params):
+        return self.client.get(
+            "/api/qr/qr-analytics/unique-visitors/", {"qr": str(uuid.uuid4()), **params},
+            HTTP_HOST=self.municipality.full_domain,
+        )
+
+    def test_counts_a_valid_range(self):
+        response = self.get(start="2026-01-01", end="2026-01-07")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["unique_visitors"], 0)
+
+    def test_rejects_inverted_range(self):
+        self.assertEqual(self.get(start="2026-01-07", end="2026-01-01").status_code, 400)
+
+    def test_rejects_range_beyond_retention(self):
+        self.assertEqual(self.get(start="2026-01-01", end="2026-03-01").status_code, 400)
+
+    def test_rejects_bad_input(self):
+        self.assertEqual(self.get(start="yesterday").status_code, 400)
+        self.assertEqual(self.get(qr="not-a-uuid").status_code, 400)
@@ -1,11 +1,14 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import QRViewSet, QRAnalyticsViewSet
+from .views import QRViewSet, QRAnalyticsViewSet, QRBulkJobViewSet, QRHeatmapView, QRRenderView
 
 router = DefaultRouter()
 router.register(r'qr', QRViewSet, basename='qr')
 router.register(r'qr-analytics', QRAnalyticsViewSet, basename='qranalytics')
+router.register(r'bulk-jobs', QRBulkJobViewSet, basename='qr-bulk-job')
 
 urlpatterns = [
     path('', include(router.urls)),
+    path('render/<uuid:pk>/', QRRenderView.as_view(), name='qr-render'),
+    path('heatmap/', QRHeatmapView.as_view(), name='qr-heatmap'),
 ]
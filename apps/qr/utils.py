@@ -1,35 +1,176 @@
-import qrcode
+import hashlib
+import io
 import os
+import uuid
+
+from django.apps import apps
 from django.conf import settings
+from django.core.cache import cache
+from django.urls import reverse
 from apps.qr.models import QR
-import uuid
 
-def generate_qr(entity_type, entity_id, name=None, description=None, municipality="default", user=None):
+# Names in qrcode.constants; qrcode (and PIL with it) is only imported to render
+ERROR_CORRECTION_LEVELS = {
+    "L": "ERROR_CORRECT_L",
+    "M": "ERROR_CORRECT_M",
+    "Q": "ERROR_CORRECT_Q",
+    "H": "ERROR_CORRECT_H",
+}
+RENDER_CONTENT_TYPES = {
+    "png": "image/png",
+    "svg": "image/svg+xml",
+}
+QR_BORDER = 4
+
+# entity_type -> (app_label.Model, label field, filters accepted by bulk jobs)
+QR_ENTITY_SOURCES = {
+    "tourist_place": ("tourism.TouristPlace", "name", ["category", "approval_status", "is_approved"]),
+    "business": ("business.Business", "name", ["business", "status", "is_approved"]),
+    "event": ("event.Event", "title", ["category", "date__gte", "date__lte"]),
+}
+BULK_JOB_OUTPUTS = {
+    "zip": ("zip", "application/zip"),
+    "sheet": ("pdf", "application/pdf"),
+}
+
+
+def build_qr_url(entity_type, entity_id, qr_uuid, municipality="default"):
+    return f"https://{municipality}.dobato.net/qr/{entity_type}/{entity_id}/{qr_uuid}/"
+
+
+def qr_municipality_slug(qr):
+    """
+    unique_slug of the municipality owning the QR's entity, so the encoded URL
+    depends on the QR alone and never on the host it is requested through.
+    """
+    if qr.entity_type == "municipality":
+        model, lookup = apps.get_model("municipality.Municipality"), "unique_slug"
+    else:
+        source = QR_ENTITY_SOURCES.get("tourist_place" if qr.entity_type == "place" else qr.entity_type)
+        if source is None:
+            return "default"
+        model, lookup = apps.get_model(source[0]), "municipality__unique_slug"
+    slug = model.objects.filter(pk=entity_pk(qr.entity_id)).values_list(lookup, flat=True).first()
+    return slug or "default"
+
+
+def render_data_key(qr_uuid):
+    return f"qr:render-data:{qr_uuid}"
+
+
+def qr_render_data(qr_uuid):
+    """
+    The URL encoded in a QR's image, or None if there is no such QR. Cached per
+    QR (forgotten when it is saved or deleted), so a render request that hits
+    the cache runs no query.
+    """
+    key = render_data_key(qr_uuid)
+    data = cache.get(key)
+    if data is None:
+        qr = QR.objects.filter(pk=qr_uuid).only("uuid", "entity_type", "entity_id").first()
+        if qr is None:
+            return None
+        data = build_qr_url(qr.entity_type, qr.entity_id, qr.uuid, municipality=qr_municipality_slug(qr))
+        cache.set(key, data, getattr(settings, "QR_RENDER_CACHE_TIMEOUT", 60 * 60 * 24 * 30))
+    return data
+
+
+def entity_uuid(pk):
+    """
+    QR.entity_id is a UUIDField while most entities use integer keys.
+    """
+    return pk if isinstance(pk, uuid.UUID) else uuid.UUID(int=int(pk))
+
+
+def entity_pk(entity_id):
     """
-    Create and save a QR code for any entity (event, place, business, etc.)
-    Stores only the file path in qr_code_image (TextField).
+    Inverse of entity_uuid() for the integer-keyed entity models.
     """
+    return entity_id.int if isinstance(entity_id, uuid.UUID) else int(entity_id)
 
-    qr_instance = QR.objects.create(
+
+def render_cache_key(data, fmt, size, error_correction):
+    digest = hashlib.sha256(
+        f"{data}|{fmt}|{size}|{error_correction}".encode("utf-8")
+    ).hexdigest()
+    return f"qr:render:{digest}"
+
+
+def render_qr(data, fmt="png", size=300, error_correction="M"):
+    """
+    Render ``data`` as a QR image and return the raw bytes.
+    The output only depends on the arguments, so it can be cached by content key.
+    """
+    import qrcode
+    import qrcode.image.svg
+
+    qr = qrcode.QRCode(
+        error_correction=getattr(qrcode.constants, ERROR_CORRECTION_LEVELS[error_correction]),
+        border=QR_BORDER,
+    )
+    qr.add_data(data)
+    qr.make(fit=True)
+    modules = qr.modules_count + 2 * QR_BORDER
+    qr.box_size = max(1, size // modules)
+
+    buffer = io.BytesIO()
+    if fmt == "svg":
+        qr.make_image(image_factory=qrcode.image.svg.SvgPathImage).save(buffer)
+    else:
+        qr.make_image().save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def get_rendered_qr(data, fmt="png", size=300, error_correction="M"):
+    """
+    Return ``(cache_key, image_bytes)``, rendering and caching the image on a miss.
+    """
+    key = render_cache_key(data, fmt, size, error_correction)
+    image = cache.get(key)
+    if image is None:
+        image = render_qr(data, fmt=fmt, size=size, error_correction=error_correction)
+        cache.set(key, image, getattr(settings, "QR_RENDER_CACHE_TIMEOUT", 60 * 60 * 24 * 30))
+    return key, image
+
+
+def generate_qr(entity_type, entity_id, name=None, description=None, municipality="default", user=None):
+    """
+    Create a QR record for any entity (event, place, business, etc.)
+    The image is rendered on demand, so qr_code_image stores the render endpoint path.
+    """
+    qr_uuid = uuid.uuid4()
+    return QR.objects.create(
+        uuid=qr_uuid,
         entity_type=entity_type,
         entity_id=entity_id,
         name=name or f"{entity_type}_{entity_id}",
         description=description or "",
-        user=user
+        user=user,
+        qr_code_image=reverse("qr-render", kwargs={"pk": qr_uuid}),
     )
 
-    qr_url = f"https://{municipality}.dobato.net/qr/{entity_type}/{entity_id}/{qr_instance.uuid}/"
 
-    qr_img = qrcode.make(qr_url)
+def bulk_job_key(job_id):
+    return f"qr:bulk:{job_id}"
 
-    filename = f"{entity_type}_{entity_id}_{uuid.uuid4().hex}.png"
-    folder = os.path.join(settings.MEDIA_ROOT, "qr_codes")
-    os.makedirs(folder, exist_ok=True)
-    filepath = os.path.join(folder, filename)
 
-    qr_img.save(filepath)
+def get_bulk_job(job_id):
+    return cache.get(bulk_job_key(job_id))
 
-    qr_instance.qr_code_image = f"qr_codes/{filename}"
-    qr_instance.save()
 
-    return qr_instance
+def update_bulk_job(job_id, **fields):
+    job = get_bulk_job(job_id) or {"id": str(job_id)}
+    job.update(fields)
+    cache.set(bulk_job_key(job_id), job, getattr(settings, "QR_BULK_JOB_TIMEOUT", 60 * 60 * 24))
+    return job
+
+
+def bulk_job_export_folder():
+    return os.path.join(settings.MEDIA_ROOT, "qr_exports")
+
+
+def bulk_job_export_path(job_id, output):
+    extension, _ = BULK_JOB_OUTPUTS[output]
+    folder = bulk_job_export_folder()
+    os.makedirs(folder, exist_ok=True)
+    return os.path.join(folder, f"{job_id}.{extension}")
@@ -1,7 +1,43 @@
-from rest_framework import viewsets
+import math
+import os
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    HttpResponseNotFound,
+    HttpResponseNotModified,
+    HttpResponseRedirect,
+)
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from apps.core.mixins import MunicipalityTenantMixin
 from apps.core.permissions import IsDataEntryOrDataManagerAndApproved
 from .models import QR, QRAnalytics
-from .serializers import QRSerializer, QRAnalyticsSerializer
+from .serializers import QRSerializer, QRAnalyticsSerializer, QRBulkJobSerializer
+from .heatmap import scan_heatmap
+from .hll import count_unique_visitors
+from .resolver import record_scan, resolve_target
+from .tasks import bulk_generate_qr
+from .utils import (
+    BULK_JOB_OUTPUTS,
+    ERROR_CORRECTION_LEVELS,
+    RENDER_CONTENT_TYPES,
+    bulk_job_export_path,
+    get_bulk_job,
+    get_rendered_qr,
+    qr_render_data,
+    render_cache_key,
+    update_bulk_job,
+)
 from apps.core.views import MunicipalityTenantModelViewSet
 
 class QRViewSet(MunicipalityTenantModelViewSet):
@@ -10,7 +46,219 @@ class QRViewSet(MunicipalityTenantModelViewSet):
     permission_classes = [IsDataEntryOrDataManagerAndApproved]
 
 
-class QRAnalyticsViewSet(viewsets.ModelViewSet):
+class QRAnalyticsViewSet(MunicipalityTenantMixin, viewsets.ModelViewSet):
     queryset = QRAnalytics.objects.all()
     serializer_class = QRAnalyticsSerializer
     permission_classes = [IsDataEntryOrDataManagerAndApproved]
+    cursor_ordering = ("-scanned_at", "-id")
+
+    @action(detail=False, methods=["get"], url_path="unique-visitors")
+    def unique_visitors(self, request):
+        """
+        Approximate distinct visitors of one QR between two dates (inclusive).
+        Query params: qr (uuid), start, end (YYYY-MM-DD, default last 7 days).
+        """
+        params = request.query_params
+        try:
+            qr_uuid = uuid.UUID(params.get("qr", ""))
+            end = parse_date(params["end"]) if params.get("end") else timezone.now().date()
+            start = parse_date(params["start"]) if params.get("start") else end - timedelta(days=6)
+        except ValueError:
+            return Response({"detail": "Invalid qr or date."}, status=status.HTTP_400_BAD_REQUEST)
+        if start is None or end is None or start > end:
+            return Response({"detail": "Invalid date range."}, status=status.HTTP_400_BAD_REQUEST)
+        if (end - start).days >= getattr(settings, "QR_HLL_RETENTION_DAYS", 400):
+            return Response({"detail": "Date range exceeds retention."}, status=status.HTTP_400_BAD_REQUEST)
+        data = {"qr": qr_uuid, "start": start, "end": end}
+        data.update(count_unique_visitors(qr_uuid, start, end))
+        return Response(data)
+
+
+class QRBulkJobViewSet(viewsets.ViewSet):
+    """
+    Generate QR codes for many entities of one type and export them as a ZIP
+    archive or a printable PDF sheet. Jobs run in Celery; poll retrieve() for progress.
+    """
+    permission_classes = [IsDataEntryOrDataManagerAndApproved]
+
+    def create(self, request):
+        serializer = QRBulkJobSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job_id = str(uuid.uuid4())
+        job = update_bulk_job(
+            job_id,
+            status="pending",
+            municipality_id=request.tenant.pk,
+            output=serializer.validated_data["output"],
+            total=None,
+            processed=0,
+        )
+        bulk_generate_qr.delay(
+            job_id,
+            request.tenant.pk,
+            user_id=request.user.pk,
+            **serializer.validated_data,
+        )
+        return Response(job, status=status.HTTP_202_ACCEPTED)
+
+    def get_job(self, pk):
+        job = get_bulk_job(pk)
+        # Job ids are unguessable but still only valid on the tenant that started them
+        if job is None or job.get("municipality_id") != self.request.tenant.pk:
+            raise Http404
+        return job
+
+    def retrieve(self, request, pk=None):
+        return Response(self.get_job(pk))
+
+    @action(detail=True, methods=["get"])
+    def download(self, request, pk=None):
+        job = self.get_job(pk)
+        if job.get("status") != "done":
+            raise Http404
+        path = bulk_job_export_path(pk, job["output"])
+        if not os.path.exists(path):
+            raise Http404
+        _, content_type = BULK_JOB_OUTPUTS[job["output"]]
+        return FileResponse(
+            open(path, "rb"),
+            as_attachment=True,
+            filename=os.path.basename(path),
+            content_type=content_type,
+        )
+
+
+def _aware(value):
+    if value is None:
+        raise ValueError("Invalid datetime")
+    return timezone.make_aware(value) if timezone.is_naive(value) else value
+
+
+class QRHeatmapView(APIView):
+    """
+    Scan counts per grid cell for the current municipality.
+    Query params: start, end (ISO datetimes, default last 30 days), cell (degrees), qr (uuid).
+    """
+    permission_classes = [IsDataEntryOrDataManagerAndApproved]
+
+    def get(self, request):
+        params = request.query_params
+        try:
+            end = _aware(parse_datetime(params["end"])) if params.get("end") else timezone.now()
+            start = _aware(parse_datetime(params["start"])) if params.get("start") else end - timedelta(days=30)
+        except (TypeError, ValueError):
+            return Response({"detail": "Invalid time window."}, status=status.HTTP_400_BAD_REQUEST)
+        if start >= end:
+            return Response({"detail": "Invalid time window."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            cell_size = float(params.get("cell", getattr(settings, "QR_HEATMAP_CELL_SIZE", 0.005)))
+        except ValueError:
+            return Response({"detail": "Cell size must be a number."}, status=status.HTTP_400_BAD_REQUEST)
+        if not 0.0001 <= cell_size <= 1:
+            return Response({"detail": "Cell size must be between 0.0001 and 1 degrees."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            qr = uuid.UUID(params["qr"]) if params.get("qr") else None
+        except ValueError:
+            return Response({"detail": "Invalid QR id."}, status=status.HTTP_400_BAD_REQUEST)
+
+        data = scan_heatmap(request.tenant, start, end, cell_size, qr=qr)
+        data.update(start=start, end=end)
+        return Response(data)
+
+
+class QRRenderView(APIView):
+    """
+    Render a QR code on demand.
+    Query params: fmt (png|svg), size (pixels), ec (L|M|Q|H).
+    """
+    permission_classes = [AllowAny]
+
+    def get(self, request, pk):
+        fmt = request.query_params.get("fmt", "png").lower()
+        error_correction = request.query_params.get("ec", "M").upper()
+        if fmt not in RENDER_CONTENT_TYPES:
+            return Response({"detail": "Unsupported format."}, status=status.HTTP_400_BAD_REQUEST)
+        if error_correction not in ERROR_CORRECTION_LEVELS:
+            return Response({"detail": "Unsupported error correction level."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            size = int(request.query_params.get("size", 300))
+        except ValueError:
+            return Response({"detail": "Size must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+        min_size = getattr(settings, "QR_RENDER_MIN_SIZE", 64)
+        max_size = getattr(settings, "QR_RENDER_MAX_SIZE", 4096)
+        if not min_size <= size <= max_size:
+            return Response(
+                {"detail": f"Size must be between {min_size} and {max_size}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # The image is cached as immutable: it must encode the QR's own tenant, not the request's
+        data = qr_render_data(pk)
+        if data is None:
+            raise Http404
+        key = render_cache_key(data, fmt, size, error_correction)
+
+        etag = f'"{key.rsplit(":", 1)[-1]}"'
+        cache_control = f"public, max-age={getattr(settings, 'QR_RENDER_MAX_AGE', 60 * 60 * 24 * 365)}, immutable"
+        if request.headers.get("If-None-Match") == etag:
+            # The ETag only depends on the key: no need to fetch or render the image
+            response = HttpResponseNotModified()
+        else:
+            _, image = get_rendered_qr(data, fmt=fmt, size=size, error_correction=error_correction)
+            response = HttpResponse(image, content_type=RENDER_CONTENT_TYPES[fmt])
+        response["ETag"] = etag
+        response["Cache-Control"] = cache_control
+        return response
+
+
+def _client_ip(request):
+    """
+    REMOTE_ADDR, unless TRUSTED_PROXY_DEPTH proxies sit in front of the app:
+    then the address the outermost of them saw. Hops further left in
+    X-Forwarded-For come from the client and cannot be trusted.
+    """
+    depth = getattr(settings, "TRUSTED_PROXY_DEPTH", 0)
+    forwarded = [hop.strip() for hop in request.META.get("HTTP_X_FORWARDED_FOR", "").split(",") if hop.strip()]
+    if depth and forwarded:
+        return forwarded[-min(depth, len(forwarded))]
+    return request.META.get("REMOTE_ADDR")
+
+
+# Largest accepted absolute value of each coordinate parameter
+COORDINATE_LIMITS = {"lat": 90, "lng": 180}
+
+
+def _coordinate_param(request, name):
+    """A finite coordinate within its range, or None: anything else would skew the heatmap."""
+    try:
+        value = float(request.GET[name])
+    except (KeyError, ValueError):
+        return None
+    if not math.isfinite(value) or abs(value) > COORDINATE_LIMITS[name]:
+        return None
+    return value
+
+
+def qr_scan_redirect(request, entity_type, entity_id, qr_uuid):
+    """
+    Public target of every printed QR code. Plain Django view on purpose:
+    no DRF authentication, no database access once the target is published.
+    """
+    target = resolve_target(qr_uuid)
+    if target is None:
+        return HttpResponseNotFound("QR code not found")
+    tenant = getattr(request, "tenant", None)
+    record_scan(
+        qr_uuid,
+        _client_ip(request),
+        latitude=_coordinate_param(request, "lat"),
+        longitude=_coordinate_param(request, "lng"),
+        municipality_id=tenant.pk if tenant else None,
+    )
+    response = HttpResponseRedirect(target)
+    response["Cache-Control"] = "no-store"
+    return response
+
+
+# At most the tenant lookup when its cache entry expires
+qr_scan_redirect.query_budget = 1
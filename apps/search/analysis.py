@@ -0,0 +1,58 @@
+import re
+import unicodedata
+
+# Letters and digits plus the whole Devanagari block, whose vowel signs and
+# virama are combining marks that \w alone would split words on. The danda
+# (U+0964/U+0965) is punctuation and stays out.
+TOKEN_RE = re.compile(r"(?:[^\W_]|[\u0900-\u0963\u0966-\u097f])+")
+DEVANAGARI_RE = re.compile(r"[\u0900-\u097f]")
+MAX_TERM_LENGTH = 64
+
+ENGLISH_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were will with".split()
+)
+NEPALI_STOPWORDS = frozenset(
+    "र छ छन् हो थियो पनि को का की ले लाई मा बाट यो त्यो यस उक्त एक गर्न गरेको भएको तथा वा".split()
+)
+# Postpositions and the plural marker attach to the noun in Nepali
+NEPALI_SUFFIXES = ("हरूलाई", "हरूको", "हरूका", "हरूमा", "हरूले", "हरू", "लाई", "बाट", "देखि", "सम्म", "को", "का",
+                   "की", "ले", "मा")
+ENGLISH_PLURALS = (("ies", "y"), ("sses", "ss"), ("shes", "sh"), ("ches", "ch"), ("xes", "x"), ("zes", "z"), ("s", ""))
+
+
+def stem_english(token):
+    """Plural folding only; anything more aggressive merges unrelated place names."""
+    if token.endswith(("ss", "us", "is")):
+        return token
+    for suffix, replacement in ENGLISH_PLURALS:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 2:
+            return token[: -len(suffix)] + replacement
+    return token
+
+
+def stem_nepali(token):
+    for suffix in NEPALI_SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 2:
+            return token[: -len(suffix)]
+    return token
+
+
+def tokenize(text):
+    """
+    Normalised search terms of ``text``, in order, duplicates kept.
+    English and Nepali words can be mixed; each token is handled by its script.
+    """
+    if not text:
+        return []
+    terms = []
+    for token in TOKEN_RE.findall(unicodedata.normalize("NFC", str(text)).casefold()):
+        if DEVANAGARI_RE.search(token):
+            if token in NEPALI_STOPWORDS:
+                continue
+            term = stem_nepali(token)
+        else:
+            if token in ENGLISH_STOPWORDS:
+                continue
+            term = stem_english(token)
+        terms.append(term[:MAX_TERM_LENGTH])
+    return terms
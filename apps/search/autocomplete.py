@@ -0,0 +1,182 @@
+import json
+import logging
+import unicodedata
+
+from django.apps import apps
+from django.conf import settings
+from django.db.models import Sum
+
+from apps.core.redis_utils import get_redis
+from apps.qr.models import QR
+from apps.qr.utils import entity_pk, entity_uuid
+from .analysis import DEVANAGARI_RE, TOKEN_RE
+from .index import SEARCH_SOURCES, parse_entity_id
+
+logger = logging.getLogger("django")
+
+# Search entity type -> QR entity type whose scans count as popularity
+POPULARITY_QR_TYPES = {"place": "tourist_place", "business": "business", "event": "event"}
+
+
+def items_key(municipality_id):
+    return f"ac:{municipality_id}:items"
+
+
+def prefix_key(municipality_id, language, prefix):
+    return f"ac:{municipality_id}:{language}:p:{prefix}"
+
+
+def built_key(municipality_id):
+    return f"ac:{municipality_id}:built"
+
+
+def normalize(text):
+    return " ".join(TOKEN_RE.findall(unicodedata.normalize("NFC", str(text)).casefold()))
+
+
+def detect_language(text):
+    # Codes of Municipality.LANGUAGE_CHOICES, which is what clients pass as ?lang=
+    return "np" if DEVANAGARI_RE.search(text or "") else "en"
+
+
+def prefixes(title):
+    """
+    Prefixes of the whole title and of every word in it, so "Phewa Lake"
+    is found by both "phe" and "lak".
+    """
+    normalized = normalize(title)
+    max_length = getattr(settings, "AUTOCOMPLETE_MAX_PREFIX", 15)
+    found = set()
+    for word in [normalized] + normalized.split():
+        for length in range(1, min(len(word), max_length) + 1):
+            found.add(word[:length].rstrip())
+    found.discard("")
+    return found
+
+
+def _member(entity_type, pk):
+    return f"{entity_type}:{pk}"
+
+
+def _remove(pipe, municipality_id, member, raw):
+    if raw is None:
+        return
+    old = json.loads(raw)
+    for prefix in prefixes(old["title"]):
+        pipe.zrem(prefix_key(municipality_id, old["lang"], prefix), member)
+    pipe.hdel(items_key(municipality_id), member)
+
+
+def _add(pipe, municipality_id, member, item):
+    keep = getattr(settings, "AUTOCOMPLETE_KEEP", 100)
+    for prefix in prefixes(item["title"]):
+        key = prefix_key(municipality_id, item["lang"], prefix)
+        pipe.zadd(key, {member: item["score"]})
+        # Keep only the most popular entries per prefix; a rebuild restores anything trimmed
+        pipe.zremrangebyrank(key, 0, -(keep + 1))
+    pipe.hset(items_key(municipality_id), member, json.dumps(item, separators=(",", ":")))
+
+
+def _item(entity_type, instance, score):
+    title = str(getattr(instance, SEARCH_SOURCES[entity_type]["title"]) or "")
+    return {
+        "type": entity_type,
+        "id": str(instance.pk),
+        "title": title,
+        "lang": getattr(instance, "language_code", None) or detect_language(title),
+        "score": score,
+    }
+
+
+def popularity(entity_type, pks):
+    """QR scan totals by entity pk; entities without a QR score 0."""
+    qr_type = POPULARITY_QR_TYPES.get(entity_type)
+    if qr_type is None or not pks:
+        return {}
+    rows = (
+        QR.objects.filter(entity_type=qr_type, entity_id__in=[entity_uuid(pk) for pk in pks])
+        .values_list("entity_id")
+        .annotate(scans=Sum("total_scans"))
+        .values_list("entity_id", "scans")
+    )
+    return {entity_pk(entity_id): scans or 0 for entity_id, scans in rows}
+
+
+def update_entry(entity_type, instance):
+    """
+    Replace one entity's entries. Entities that are not public are removed.
+    """
+    source = SEARCH_SOURCES[entity_type]
+    municipality_id = instance.municipality_id
+    member = _member(entity_type, instance.pk)
+    redis_conn = get_redis()
+    raw = redis_conn.hget(items_key(municipality_id), member)
+    visible = source["indexed"](instance) and source["public"](instance)
+    score = json.loads(raw)["score"] if raw is not None else popularity(entity_type, [instance.pk]).get(instance.pk, 0)
+    with redis_conn.pipeline(transaction=False) as pipe:
+        _remove(pipe, municipality_id, member, raw)
+        if visible:
+            _add(pipe, municipality_id, member, _item(entity_type, instance, score))
+        pipe.execute()
+
+
+def remove_entry(entity_type, municipality_id, pk):
+    member = _member(entity_type, pk)
+    redis_conn = get_redis()
+    raw = redis_conn.hget(items_key(municipality_id), member)
+    with redis_conn.pipeline(transaction=False) as pipe:
+        _remove(pipe, municipality_id, member, raw)
+        pipe.execute()
+
+
+def rebuild(municipality_id):
+    """
+    Rebuild a tenant's autocomplete keys from the database. Returns the number of entries.
+    """
+    redis_conn = get_redis()
+    stale = list(redis_conn.scan_iter(match=f"ac:{municipality_id}:*", count=1000))
+    count = 0
+    with redis_conn.pipeline(transaction=False) as pipe:
+        for start in range(0, len(stale), 1000):
+            pipe.delete(*stale[start:start + 1000])
+        for entity_type, source in SEARCH_SOURCES.items():
+            instances = [
+                instance
+                for instance in apps.get_model(source["model"]).objects.filter(municipality_id=municipality_id)
+                if source["indexed"](instance) and source["public"](instance)
+            ]
+            scores = popularity(entity_type, [instance.pk for instance in instances])
+            for instance in instances:
+                item = _item(entity_type, instance, scores.get(instance.pk, 0))
+                _add(pipe, municipality_id, _member(entity_type, instance.pk), item)
+                count += 1
+        pipe.set(built_key(municipality_id), 1)
+        pipe.execute()
+    return count
+
+
+def suggest(municipality_id, prefix, language=None, limit=10):
+    """
+    Top ``limit`` entries whose title, or a word of it, starts with ``prefix``,
+    most popular first. Reads Redis only. Returns None when the tenant has not
+    been built yet.
+    """
+    normalized = normalize(prefix)[: getattr(settings, "AUTOCOMPLETE_MAX_PREFIX", 15)].rstrip()
+    if not normalized:
+        return []
+    language = language or detect_language(normalized)
+    redis_conn = get_redis()
+    with redis_conn.pipeline(transaction=False) as pipe:
+        pipe.exists(built_key(municipality_id))
+        pipe.zrevrange(prefix_key(municipality_id, language, normalized), 0, limit - 1)
+        built, members = pipe.execute()
+    if not built:
+        return None
+    if not members:
+        return []
+    suggestions = []
+    for raw in redis_conn.hmget(items_key(municipality_id), members):
+        if raw is not None:
+            item = json.loads(raw)
+            suggestions.append({"type": item["type"], "id": parse_entity_id(item["id"]), "title": item["title"]})
+    return suggestions
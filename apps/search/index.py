@@ -0,0 +1,232 @@
+import logging
+import math
+from collections import Counter, defaultdict
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Avg, Count
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+from .analysis import tokenize
+from .models import SearchDocument, SearchPosting
+
+logger = logging.getLogger("django")
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# entity_type -> model, title field, weighted fields, summary field, whether a row
+# belongs in the index at all, and whether it may appear in public results
+SEARCH_SOURCES = {
+    "page": {
+        "model": "cms.Page",
+        "title": "title",
+        "fields": {"title": 3.0, "body": 1.0},
+        "summary": "body",
+        "indexed": lambda obj: not obj.is_deleted,
+        "public": lambda obj: obj.status == "published",
+    },
+    "place": {
+        "model": "tourism.TouristPlace",
+        "title": "name",
+        "fields": {"name": 3.0, "category": 2.0, "tags": 2.0, "address": 1.0, "seo_description": 1.0},
+        "summary": "seo_description",
+        "indexed": lambda obj: True,
+        "public": lambda obj: obj.is_approved,
+    },
+    "business": {
+        "model": "business.Business",
+        "title": "name",
+        "fields": {"name": 3.0, "business": 2.0, "specialities": 2.0, "short_description": 1.5,
+                   "overview": 1.0, "full_description": 1.0, "address": 1.0},
+        "summary": "overview",
+        "indexed": lambda obj: obj.status != "archived",
+        "public": lambda obj: obj.status == "published" and obj.is_approved,
+    },
+    "event": {
+        "model": "event.Event",
+        "title": "title",
+        "fields": {"title": 3.0, "tags": 2.0, "short_summary": 1.5, "description": 1.0,
+                   "detailed_description": 1.0},
+        "summary": "short_summary",
+        "indexed": lambda obj: True,
+        "public": lambda obj: True,
+    },
+}
+SUMMARY_LENGTH = 300
+
+
+def _text(value):
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        return " ".join(_text(item) for item in value)
+    if isinstance(value, dict):
+        return " ".join(_text(item) for item in value.values())
+    return strip_tags(str(value))
+
+
+def _stats_key(municipality_id):
+    return f"search:stats:{municipality_id}"
+
+
+def parse_entity_id(value):
+    return int(value) if value.isdigit() else value
+
+
+def remove_document(entity_type, entity_id):
+    SearchDocument.objects.filter(entity_type=entity_type, entity_id=str(entity_id)).delete()
+
+
+def index_instance(entity_type, instance):
+    """
+    (Re)write the document and postings of one entity.
+    """
+    source = SEARCH_SOURCES[entity_type]
+    if not source["indexed"](instance):
+        remove_document(entity_type, instance.pk)
+        return None
+
+    weights = Counter()
+    length = 0
+    for field, boost in source["fields"].items():
+        terms = tokenize(_text(getattr(instance, field, None)))
+        length += len(terms)
+        for term in terms:
+            weights[term] += boost
+
+    title = _text(getattr(instance, source["title"]))[:255]
+    summary = " ".join((_text(getattr(instance, source["summary"], None)) or title).split())[:SUMMARY_LENGTH]
+    with transaction.atomic():
+        document, _ = SearchDocument.objects.update_or_create(
+            entity_type=entity_type,
+            entity_id=str(instance.pk),
+            defaults={
+                "municipality_id": instance.municipality_id,
+                "title": title,
+                "summary": summary,
+                "language_code": getattr(instance, "language_code", "") or "",
+                "length": length,
+                "is_public": bool(source["public"](instance)),
+            },
+        )
+        SearchPosting.objects.filter(document=document).delete()
+        SearchPosting.objects.bulk_create(
+            [
+                SearchPosting(municipality_id=instance.municipality_id, term=term, document=document, weight=weight)
+                for term, weight in weights.items()
+            ],
+            batch_size=1000,
+        )
+    return document
+
+
+def rebuild_index(entity_types=None, municipality=None):
+    """
+    Reindex every row of the given types. Returns the number of rows processed.
+    Every document written is stamped with a fresh indexed_at, so documents
+    stamped before the rebuild started belong to rows that no longer exist.
+    """
+    processed = 0
+    for entity_type in entity_types or SEARCH_SOURCES:
+        source = SEARCH_SOURCES[entity_type]
+        queryset = apps.get_model(source["model"]).objects.all()
+        if municipality is not None:
+            queryset = queryset.filter(municipality=municipality)
+        started = timezone.now()
+        for instance in queryset.iterator(chunk_size=500):
+            index_instance(entity_type, instance)
+            processed += 1
+        stale = SearchDocument.objects.filter(entity_type=entity_type, indexed_at__lt=started)
+        if municipality is not None:
+            stale = stale.filter(municipality=municipality)
+        stale.delete()
+    return processed
+
+
+def corpus_stats(municipality_id):
+    """
+    (document count, average length) of a tenant's index, cached briefly:
+    BM25 only needs them approximately.
+    """
+    stats = cache.get(_stats_key(municipality_id))
+    if stats is None:
+        row = SearchDocument.objects.filter(municipality_id=municipality_id).aggregate(
+            count=Count("id"), avg_length=Avg("length")
+        )
+        stats = (row["count"] or 0, float(row["avg_length"] or 0.0))
+        cache.set(_stats_key(municipality_id), stats, getattr(settings, "SEARCH_STATS_TIMEOUT", 300))
+    return stats
+
+
+def rank(municipality_id, query, types=None, public_only=True):
+    """
+    [(document id, score)] for documents matching any query term, best first,
+    scored with BM25 over the field-weighted term frequencies.
+    """
+    terms = list(dict.fromkeys(tokenize(query)))
+    if not terms:
+        return []
+    total, avg_length = corpus_stats(municipality_id)
+    if not total:
+        return []
+
+    # One pass over the postings of all query terms: document frequencies come
+    # from the same rows that get scored
+    rows = SearchPosting.objects.filter(municipality_id=municipality_id, term__in=terms).values_list(
+        "document_id", "term", "weight", "document__length", "document__entity_type", "document__is_public"
+    )
+    frequencies = Counter()
+    matched = []
+    for row in rows:
+        frequencies[row[1]] += 1
+        if (types is None or row[4] in types) and (row[5] or not public_only):
+            matched.append(row)
+    idf = {term: math.log(1 + (total - df + 0.5) / (df + 0.5)) for term, df in frequencies.items()}
+
+    scores = defaultdict(float)
+    for document_id, term, weight, length, _, _ in matched:
+        norm = K1 * (1 - B + B * length / (avg_length or 1))
+        scores[document_id] += idf[term] * weight * (K1 + 1) / (weight + norm)
+    return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+
+def search(municipality, query, types=None, limit=20, offset=0, public_only=True):
+    """
+    Ranked results for ``query`` within one tenant. Returns (total, results).
+    """
+    ranked = rank(municipality.pk, query, types=types, public_only=public_only)
+    page = ranked[offset:offset + limit]
+    documents = SearchDocument.objects.in_bulk([document_id for document_id, _ in page])
+    results = [
+        {
+            "type": documents[document_id].entity_type,
+            "id": parse_entity_id(documents[document_id].entity_id),
+            "title": documents[document_id].title,
+            "summary": documents[document_id].summary,
+            "language_code": documents[document_id].language_code,
+            "score": round(score, 4),
+        }
+        for document_id, score in page
+        if document_id in documents
+    ]
+    return len(ranked), results
+
+
+def search_entity_ids(municipality, query, entity_type, public_only=False):
+    """
+    Primary keys of ``entity_type`` rows matching ``query``, best first, capped
+    at SEARCH_FILTER_MAX_RESULTS. Used to narrow viewset querysets.
+    """
+    ranked = rank(municipality.pk, query, types=[entity_type], public_only=public_only)
+    ranked = ranked[: getattr(settings, "SEARCH_FILTER_MAX_RESULTS", 1000)]
+    by_document = dict(
+        SearchDocument.objects.filter(pk__in=[document_id for document_id, _ in ranked]).values_list(
+            "pk", "entity_id"
+        )
+    )
+    return [parse_entity_id(by_document[document_id]) for document_id, _ in ranked if document_id in by_document]
@@ -0,0 +1,59 @@
+import random
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.core.benchmark import format_stats, measure
+from apps.core.redis_utils import get_redis
+from apps.search.autocomplete import _add, built_key, suggest
+
+SYLLABLES = "ka ma na ra pa la ta sa ha ga da ba ya kha cha pho bha ja ti ri".split()
+NEPALI_WORDS = "पोखरा ताल मन्दिर हिमाल गाउँ बजार होमस्टे संग्रहालय".split()
+
+
+class Command(BaseCommand):
+    help = "Measure autocomplete latency on synthetic titles stored under a throwaway tenant id."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--entries", type=int, default=20000)
+        parser.add_argument("--iterations", type=int, default=5000)
+        parser.add_argument("--municipality-id", type=int, default=-1)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        municipality_id = options["municipality_id"]
+        redis_conn = get_redis()
+
+        titles = []
+        with redis_conn.pipeline(transaction=False) as pipe:
+            for i in range(options["entries"]):
+                if i % 5 == 0:
+                    title = " ".join(rng.sample(NEPALI_WORDS, 2))
+                    language = "np"
+                else:
+                    title = " ".join("".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))) for _ in range(2))
+                    language = "en"
+                titles.append(title)
+                _add(pipe, municipality_id, f"place:{i}",
+                     {"type": "place", "id": str(i), "title": title, "lang": language, "score": rng.randint(0, 500)})
+                if i % 1000 == 999:
+                    pipe.execute()
+            pipe.set(built_key(municipality_id), 1)
+            pipe.execute()
+
+        def typeahead():
+            title = rng.choice(titles)
+            suggest(municipality_id, title[: rng.randint(1, 6)], limit=10)
+
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                stats = measure(typeahead, options["iterations"])
+            self.stdout.write(f"{options['entries']} entries")
+            self.stdout.write(format_stats("autocomplete", stats))
+            self.stdout.write(f"SQL queries: {len(queries)}")
+        finally:
+            stale = list(redis_conn.scan_iter(match=f"ac:{municipality_id}:*", count=1000))
+            for start in range(0, len(stale), 1000):
+                redis_conn.delete(*stale[start:start + 1000])
@@ -0,0 +1,80 @@
+import random
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+
+from apps.cms.models import Page
+from apps.core.benchmark import format_stats, measure
+from apps.municipality.models import Municipality
+from apps.search.index import index_instance, search
+
+WORDS = (
+    "lake temple trek mountain village festival homestay museum river bridge market heritage stupa "
+    "viewpoint sunrise jungle safari boat monastery cave waterfall garden palace bazaar momo tea "
+    "ताल मन्दिर पदयात्रा हिमाल गाउँ चाड होमस्टे संग्रहालय नदी पुल बजार सम्पदा स्तूप"
+).split()
+
+
+class Command(BaseCommand):
+    help = "Compare the search index against LIKE scans on synthetic pages (rolled back afterwards)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pages", type=int, default=5000)
+        parser.add_argument("--words", type=int, default=150, help="Words per page body.")
+        parser.add_argument("--iterations", type=int, default=200)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        vocabulary = WORDS + [f"w{i}" for i in range(5000)]
+
+        with transaction.atomic():
+            municipality = Municipality.objects.create(
+                name="bench-search", unique_slug="bench-search", full_domain="bench-search.local"
+            )
+            pages = Page.objects.bulk_create(
+                [
+                    Page(
+                        municipality=municipality,
+                        title=" ".join(rng.choices(vocabulary, k=4)),
+                        slug=f"bench-{i}",
+                        body=" ".join(rng.choices(vocabulary, k=options["words"])),
+                        status="published",
+                    )
+                    for i in range(options["pages"])
+                ],
+                batch_size=1000,
+            )
+            for page in pages:
+                index_instance("page", page)
+            if connection.vendor == "sqlite":
+                with connection.cursor() as cursor:
+                    cursor.execute("ANALYZE")
+
+            def common():
+                return rng.sample(WORDS, 2)
+
+            def rare():
+                return [f"w{rng.randrange(5000)}", rng.choice(WORDS)]
+
+            def like(words):
+                # What SearchFilter plus page-number pagination runs: a count and the first page
+                q = Q()
+                for word in words:
+                    q |= Q(title__icontains=word) | Q(body__icontains=word)
+                queryset = Page.objects.filter(q, municipality=municipality)
+                queryset.count()
+                list(queryset.values_list("pk", flat=True)[:20])
+
+            def indexed(words):
+                search(municipality, " ".join(words), limit=20)
+
+            iterations = options["iterations"]
+            self.stdout.write(f"{options['pages']} pages, {options['words']} words each")
+            for label, words in (("common terms", common), ("rare term", rare)):
+                self.stdout.write(format_stats(f"LIKE, {label}", measure(lambda: like(words()), iterations, warmup=5)))
+                self.stdout.write(
+                    format_stats(f"index, {label}", measure(lambda: indexed(words()), iterations, warmup=5))
+                )
+            transaction.set_rollback(True)
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from apps.municipality.models import Municipality
+from apps.search.tasks import rebuild_autocomplete
+
+
+class Command(BaseCommand):
+    help = "Rebuild the Redis autocomplete keys from the database."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--municipality", help="unique_slug of a single municipality")
+
+    def handle(self, *args, **options):
+        municipality_id = None
+        if options["municipality"]:
+            municipality_id = Municipality.objects.get(unique_slug=options["municipality"]).pk
+        self.stdout.write(f"Indexed {rebuild_autocomplete(municipality_id)} entries.")
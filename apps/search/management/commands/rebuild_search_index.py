@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from apps.municipality.models import Municipality
+from apps.search.index import SEARCH_SOURCES, rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the search index from the source tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--types", nargs="*", choices=list(SEARCH_SOURCES))
+        parser.add_argument("--municipality", help="unique_slug of a single municipality")
+
+    def handle(self, *args, **options):
+        municipality = None
+        if options["municipality"]:
+            municipality = Municipality.objects.get(unique_slug=options["municipality"])
+        processed = rebuild_index(options["types"], municipality=municipality)
+        self.stdout.write(f"Indexed {processed} rows.")
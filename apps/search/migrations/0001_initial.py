@@ -0,0 +1,52 @@
+# Generated by Django 4.2.1 on 2026-10-19 12:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('municipality', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity_type', models.CharField(max_length=30)),
+                ('entity_id', models.CharField(max_length=36)),
+                ('title', models.CharField(max_length=255)),
+                ('summary', models.CharField(blank=True, max_length=300)),
+                ('language_code', models.CharField(blank=True, max_length=10)),
+                ('length', models.PositiveIntegerField(default=0)),
+                ('is_public', models.BooleanField(default=True)),
+                ('indexed_at', models.DateTimeField(auto_now=True)),
+                ('municipality', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='%(class)s_related', to='municipality.municipality')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SearchPosting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64)),
+                ('weight', models.FloatField()),
+                ('document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='postings', to='search.searchdocument')),
+                ('municipality', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='municipality.municipality')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['municipality', 'term', 'document', 'weight'], name='search_posting_lookup_idx')],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='searchdocument',
+            index=models.Index(fields=['municipality', 'entity_type'], name='search_sear_municip_7eb959_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='searchdocument',
+            constraint=models.UniqueConstraint(fields=('entity_type', 'entity_id'), name='search_document_entity_unique'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+from django.db import models
+
+from apps.municipality.models import Municipality, MunicipalityAwareModel
+
+
+class SearchDocument(MunicipalityAwareModel):
+    """
+    One searchable entity (page, place, business or event) of a tenant.
+    """
+    entity_type = models.CharField(max_length=30)
+    entity_id = models.CharField(max_length=36)  # pages use UUID keys, the rest integers
+    title = models.CharField(max_length=255)
+    summary = models.CharField(max_length=300, blank=True)
+    language_code = models.CharField(max_length=10, blank=True)
+    length = models.PositiveIntegerField(default=0)
+    is_public = models.BooleanField(default=True)
+    indexed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["entity_type", "entity_id"], name="search_document_entity_unique"),
+        ]
+        indexes = [
+            models.Index(fields=["municipality", "entity_type"]),
+        ]
+
+    def __str__(self):
+        return f"{self.entity_type}:{self.entity_id} {self.title}"
+
+
+class SearchPosting(models.Model):
+    """
+    Inverted index entry: ``term`` occurs in ``document`` with a field-weighted
+    frequency of ``weight``. municipality is copied from the document so a
+    lookup stays on the (municipality, term) index.
+    """
+    municipality = models.ForeignKey(Municipality, on_delete=models.CASCADE, null=True, blank=True)
+    term = models.CharField(max_length=64)
+    document = models.ForeignKey(SearchDocument, on_delete=models.CASCADE, related_name="postings")
+    weight = models.FloatField()
+
+    class Meta:
+        indexes = [
+            # Covers the whole lookup, so scoring never reads the table rows
+            models.Index(fields=["municipality", "term", "document", "weight"], name="search_posting_lookup_idx"),
+        ]
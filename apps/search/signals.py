@@ -0,0 +1,46 @@
+import logging
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from . import autocomplete
+from .index import SEARCH_SOURCES, index_instance, remove_document
+
+logger = logging.getLogger("django")
+
+
+def _reindex(entity_type, instance):
+    try:
+        index_instance(entity_type, instance)
+    except Exception as e:
+        # A stale search entry must not fail the write that triggered it
+        logger.error(f"Search indexing failed for {entity_type} {instance.pk}: {e}")
+    try:
+        autocomplete.update_entry(entity_type, instance)
+    except Exception as e:
+        logger.warning(f"Autocomplete update failed for {entity_type} {instance.pk}: {e}")
+
+
+def _unindex(entity_type, municipality_id, pk):
+    remove_document(entity_type, pk)
+    try:
+        autocomplete.remove_entry(entity_type, municipality_id, pk)
+    except Exception as e:
+        logger.warning(f"Autocomplete removal failed for {entity_type} {pk}: {e}")
+
+
+def _connect(entity_type, model):
+    def on_save(sender, instance, **kwargs):
+        transaction.on_commit(lambda: _reindex(entity_type, instance))
+
+    def on_delete(sender, instance, **kwargs):
+        pk, municipality_id = instance.pk, instance.municipality_id
+        transaction.on_commit(lambda: _unindex(entity_type, municipality_id, pk))
+
+    post_save.connect(on_save, sender=model, weak=False, dispatch_uid=f"search-save-{entity_type}")
+    post_delete.connect(on_delete, sender=model, weak=False, dispatch_uid=f"search-delete-{entity_type}")
+
+
+for _entity_type, _source in SEARCH_SOURCES.items():
+    _connect(_entity_type, apps.get_model(_source["model"]))
@@ -0,0 +1,15 @@
+from celery import shared_task
+
+from apps.municipality.models import Municipality
+from .autocomplete import rebuild
+
+
+@shared_task(name="search.rebuild_autocomplete")
+def rebuild_autocomplete(municipality_id=None):
+    """
+    Rebuild autocomplete for one tenant, or all of them. The nightly run also
+    refreshes popularity, which signals do not touch.
+    """
+    if municipality_id is not None:
+        return rebuild(municipality_id)
+    return sum(rebuild(pk) for pk in Municipality.objects.values_list("pk", flat=True))
@@ -0,0 +1,61 @@
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .autocomplete import suggest
+from .index import SEARCH_SOURCES, search
+from .tasks import rebuild_autocomplete
+
+
+class SearchView(APIView):
+    """
+    Ranked full-text search over the tenant's published pages, places, businesses and events.
+    Query params: q, types (comma separated), limit, offset.
+    """
+    permission_classes = [permissions.AllowAny]
+    read_replica = True
+
+    def get(self, request):
+        params = request.query_params
+        query = params.get("q", "").strip()
+        if not query:
+            return Response({"detail": "q is required."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = min(int(params.get("limit", 20)), getattr(settings, "SEARCH_MAX_RESULTS", 50))
+            offset = max(int(params.get("offset", 0)), 0)
+        except ValueError:
+            return Response({"detail": "limit and offset must be integers."}, status=status.HTTP_400_BAD_REQUEST)
+        types = [t for t in params.get("types", "").split(",") if t] or None
+        if types and set(types) - set(SEARCH_SOURCES):
+            return Response(
+                {"detail": f"types must be among: {', '.join(SEARCH_SOURCES)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        total, results = search(request.tenant, query, types=types, limit=limit, offset=offset)
+        return Response({"count": total, "results": results})
+
+
+class AutocompleteView(APIView):
+    """
+    Typeahead suggestions from Redis; never queries the database.
+    Query params: q (prefix), lang (defaults to the script of q), limit.
+    """
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        params = request.query_params
+        try:
+            limit = min(int(params.get("limit", 10)), getattr(settings, "AUTOCOMPLETE_MAX_RESULTS", 20))
+        except ValueError:
+            return Response({"detail": "limit must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+        suggestions = suggest(request.tenant.pk, params.get("q", ""), language=params.get("lang"), limit=limit)
+        if suggestions is None:
+            # First request for this tenant: build it once in the background, answer empty
+            if cache.add(f"ac:{request.tenant.pk}:rebuild_queued", 1, 300):
+                rebuild_autocomplete.delay(request.tenant.pk)
+            suggestions = []
+        response = Response({"results": suggestions})
+        response["Cache-Control"] = f"public, max-age={getattr(settings, 'AUTOCOMPLETE_MAX_AGE', 60)}"
+        return response
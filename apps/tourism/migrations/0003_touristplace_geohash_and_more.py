@@ -0,0 +1,38 @@
+# Generated by Django 4.2.1 on 2026-10-19 11:56
+
+from django.db import migrations, models
+
+from apps.geo.utils import encode_geohash
+
+
+def backfill_geohash(apps, schema_editor):
+    Model = apps.get_model("tourism", "touristplace")
+    rows = Model.objects.exclude(latitude=None).exclude(longitude=None).only("id", "latitude", "longitude")
+    batch = []
+    for row in rows.iterator(chunk_size=2000):
+        row.geohash = encode_geohash(float(row.latitude), float(row.longitude))
+        batch.append(row)
+        if len(batch) >= 2000:
+            Model.objects.bulk_update(batch, ["geohash"])
+            batch = []
+    Model.objects.bulk_update(batch, ["geohash"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tourism', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='touristplace',
+            name='geohash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=12),
+        ),
+        migrations.AddIndex(
+            model_name='touristplace',
+            index=models.Index(fields=['municipality', 'geohash'], name='tourism_tou_municip_e9337c_idx'),
+        ),
+        migrations.RunPython(backfill_geohash, migrations.RunPython.noop),
+    ]
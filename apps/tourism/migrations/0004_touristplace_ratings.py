@@ -0,0 +1,85 @@
+# Generated by Django 4.2.1 on 2026-10-19 12:12
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_ratings(apps, schema_editor):
+    # Self-contained on purpose: the live rating helpers may change after this migration
+    TouristPlace = apps.get_model("tourism", "TouristPlace")
+    Review = apps.get_model("tourism", "Review")
+    mean = getattr(settings, "RATING_PRIOR_MEAN", 3.5)
+    weight = getattr(settings, "RATING_PRIOR_WEIGHT", 5)
+    histogram = {}
+    rows = (
+        Review.objects.filter(rating__gte=1, rating__lte=5, is_approved=True)
+        .values_list("place_id", "rating")
+        .annotate(n=Count("pk"))
+    )
+    for target_id, rating, n in rows:
+        histogram.setdefault(target_id, [0] * 6)[rating] = n
+    for target_id, counts in histogram.items():
+        count = sum(counts)
+        total = sum(star * n for star, n in enumerate(counts))
+        TouristPlace.objects.filter(pk=target_id).update(
+            rating_count=count,
+            rating_sum=total,
+            rating_score=(total + weight * mean) / (count + weight),
+            **{f"rating_{star}": counts[star] for star in range(1, 6)},
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tourism', '0003_touristplace_geohash_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='touristplace',
+            name='rating_1',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='touristplace',
+            name='rating_2',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='touristplace',
+            name='rating_3',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='touristplace',
+            name='rating_4',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='touristplace',
+            name='rating_5',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='touristplace',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='touristplace',
+            name='rating_score',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='touristplace',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='touristplace',
+            index=models.Index(fields=['municipality', 'rating_score'], name='tourism_tou_municip_52a158_idx'),
+        ),
+        migrations.RunPython(backfill_ratings, migrations.RunPython.noop),
+    ]
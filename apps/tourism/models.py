@@ -1,9 +1,10 @@
 from django.db import models
 
 from apps.municipality.models import MunicipalityAwareModel
-from apps.core.models import BaseModel
+from apps.core.models import BaseModel, RatedModel
+from apps.geo.models import GeoHashedModel
 
-class TouristPlace(MunicipalityAwareModel):
+class TouristPlace(MunicipalityAwareModel, GeoHashedModel, RatedModel):
     name = models.CharField(max_length=255)
     slug = models.SlugField()
     address = models.TextField()
@@ -37,7 +38,13 @@ class TouristPlace(MunicipalityAwareModel):
     version = models.PositiveIntegerField(default=1)
     last_edited = models.DateTimeField(auto_now=True)
     is_approved = models.BooleanField(default=False)
-    
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["municipality", "geohash"]),
+            models.Index(fields=["municipality", "rating_score"]),
+        ]
+
     def __str__(self):
         return self.name
 
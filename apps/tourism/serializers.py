@@ -1,4 +1,6 @@
 from rest_framework import serializers
+
+from apps.core.serializers import FieldSelectionModelSerializer
 from .models import (
     TouristPlace,
     StorySection,
@@ -7,11 +9,20 @@ from .models import (
 
 )
 
-class TouristPlaceSerializer(serializers.ModelSerializer):
+class TouristPlaceSerializer(FieldSelectionModelSerializer):
     class Meta:
         model = TouristPlace
         fields = '__all__'
-        read_only_fields = ['municipality', 'version', 'last_edited']
+        read_only_fields = ['municipality', 'version', 'last_edited', *TouristPlace.RATING_FIELDS]
+
+class TouristPlaceListSerializer(FieldSelectionModelSerializer):
+    class Meta:
+        model = TouristPlace
+        fields = [
+            'id', 'name', 'slug', 'category', 'address', 'latitude', 'longitude', 'opening_hours',
+            'entry_fee_local', 'entry_fee_foreign', 'og_image', 'approval_status', 'is_approved',
+            'rating_score', 'rating_count',
+        ]
 
 class StorySectionSerializer(serializers.ModelSerializer):
     class Meta:
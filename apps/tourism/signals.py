@@ -1,6 +1,8 @@
 from django.db.models.signals import post_save
 from django.dispatch import receiver
-from apps.tourism.models import TouristPlace
+from apps.tourism.models import TouristPlace, Review
+from apps.core.ratings import track_ratings
+from apps.core.tenant_cache import track_tenant_cache
 from apps.qr.utils import generate_qr   
 
 @receiver(post_save, sender=TouristPlace)
@@ -11,4 +13,9 @@ def create_tourist_place_qr(sender, instance, created, **kwargs):
             entity_id=instance.id,
             municipality=instance.municipality.unique_slug,
             name=instance.name
-        ) 
\ No newline at end of file
+        ) 
+
+
+track_ratings(Review, "place", {"is_approved": True})
+track_tenant_cache(TouristPlace)
+track_tenant_cache(Review, "place.municipality_id")
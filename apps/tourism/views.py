@@ -1,15 +1,26 @@
 from rest_framework.viewsets import ModelViewSet
+from rest_framework.filters import OrderingFilter
 from rest_framework.permissions import AllowAny
 
+from apps.core.tenant_cache import TenantCacheMixin
 from apps.core.views import MunicipalityTenantModelViewSet
 from apps.core.permissions import IsDataEntryOrDataManagerAndApproved
+from apps.search.filters import SearchIndexFilter
 from .models import *
 from .serializers import *
 
-class TouristPlaceViewSet(MunicipalityTenantModelViewSet):
+class TouristPlaceViewSet(TenantCacheMixin, MunicipalityTenantModelViewSet):
     queryset = TouristPlace.objects.all()
     serializer_class = TouristPlaceSerializer
+    list_serializer_class = TouristPlaceListSerializer
     permission_classes = [AllowAny]
+    read_replica = True
+    filter_backends = [OrderingFilter, SearchIndexFilter]
+    search_entity_type = "place"
+    ordering_fields = ["rating_score", "rating_count", "name"]
+    query_budgets = {"list": 5, "retrieve": 2}
+    # Reviews update the rating columns
+    cache_models = (TouristPlace, Review)
 
 class StorySectionViewSet(ModelViewSet):
     queryset = StorySection.objects.all()
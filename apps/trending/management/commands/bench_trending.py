@@ -0,0 +1,135 @@
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.business.models import Business, Favorite
+from apps.core.redis_utils import get_redis
+from apps.event.models import Bookmark, Event, EventCategory, EventLocation
+from apps.municipality.models import Municipality
+from apps.qr.models import QR, QRAnalytics
+from apps.qr.utils import entity_uuid
+from apps.tourism.models import TouristPlace
+from apps.trending.rankings import RANKED_SOURCES, compute, ranking_key, recompute
+from apps.user.models import User
+
+
+class Command(BaseCommand):
+    help = "Benchmark the trending recompute job on synthetic scans, favorites and bookmarks (rolled back afterwards)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--entities", type=int, default=2000, help="per entity type")
+        parser.add_argument("--scans", type=int, default=200000)
+        parser.add_argument("--interactions", type=int, default=20000, help="favorites and bookmarks each")
+        parser.add_argument("--days", type=int, default=30)
+        parser.add_argument("--iterations", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        n, days = options["entities"], options["days"]
+        started = timezone.now()
+
+        with transaction.atomic():
+            municipality = Municipality.objects.create(
+                name="bench-trending", unique_slug="bench-trending", full_domain="bench-trending.local"
+            )
+            users = User.objects.bulk_create(
+                [User(name=f"bench {i}", email=f"bench-trending-{i}@example.com") for i in range(200)]
+            )
+            places = TouristPlace.objects.bulk_create(
+                [
+                    TouristPlace(municipality=municipality, name=f"Place {i}", slug=f"place-{i}", address="-",
+                                 latitude=27.7, longitude=85.3, category="bench", is_approved=True)
+                    for i in range(n)
+                ],
+                batch_size=1000,
+            )
+            businesses = Business.objects.bulk_create(
+                [
+                    Business(municipality=municipality, name=f"Business {i}", slug=f"bench-trending-{i}",
+                             reg_no=f"bench-trending-{i}", latitude=27.7, longitude=85.3, status="published")
+                    for i in range(n)
+                ],
+                batch_size=1000,
+            )
+            location = EventLocation.objects.create(name="Hall", address="-", city="-", state="-")
+            category = EventCategory.objects.create(name="bench")
+            events = Event.objects.bulk_create(
+                [
+                    Event(municipality=municipality, title=f"Event {i}", description="-", location=location,
+                          category=category, date=started + timedelta(days=rng.randint(0, 60)))
+                    for i in range(n)
+                ],
+                batch_size=1000,
+            )
+            qrs = QR.objects.bulk_create(
+                [
+                    QR(name=f"{qr_type} {obj.pk}", entity_type=qr_type, entity_id=entity_uuid(obj.pk))
+                    for qr_type, objects in [("tourist_place", places), ("business", businesses), ("event", events)]
+                    for obj in objects
+                ],
+                batch_size=1000,
+            )
+
+            # scanned_at/created_at are auto_now_add: insert one day's worth at a time, then backdate it
+            for day in range(days):
+                stamp = started - timedelta(days=day, hours=rng.random() * 24)
+                # A skewed popularity curve, like real traffic
+                QRAnalytics.objects.bulk_create(
+                    [
+                        QRAnalytics(municipality=municipality, qr=qrs[int(len(qrs) * rng.random() ** 3)],
+                                    ip_address="10.0.0.1")
+                        for _ in range(options["scans"] // days)
+                    ],
+                    batch_size=2000,
+                )
+                Favorite.objects.bulk_create(
+                    [
+                        Favorite(user=rng.choice(users), business=businesses[int(n * rng.random() ** 3)])
+                        for _ in range(options["interactions"] // days)
+                    ],
+                    batch_size=2000,
+                )
+                Bookmark.objects.bulk_create(
+                    [
+                        Bookmark(user=rng.choice(users), event=events[int(n * rng.random() ** 3)])
+                        for _ in range(options["interactions"] // days)
+                    ],
+                    batch_size=2000,
+                )
+                QRAnalytics.objects.filter(scanned_at__gte=started).update(scanned_at=stamp, created_at=stamp)
+                Favorite.objects.filter(created_at__gte=started).update(created_at=stamp)
+                Bookmark.objects.filter(created_at__gte=started).update(created_at=stamp)
+            if connection.vendor == "sqlite":
+                with connection.cursor() as cursor:
+                    cursor.execute("ANALYZE")
+
+            self.stdout.write(
+                f"{n} entities per type, {options['scans']} scans, "
+                f"{options['interactions']} favorites and bookmarks over {days} days"
+            )
+            for entity_type in RANKED_SOURCES:
+                with CaptureQueriesContext(connection) as queries:
+                    t0 = time.perf_counter()
+                    top = compute(municipality.pk, entity_type)
+                    elapsed = (time.perf_counter() - t0) * 1000
+                self.stdout.write(
+                    f"{entity_type}: {elapsed:.1f}ms, {len(queries)} queries, top score {top[0]['score'] if top else '-'}"
+                )
+
+            samples = []
+            for _ in range(options["iterations"]):
+                t0 = time.perf_counter()
+                recompute(municipality.pk)
+                samples.append((time.perf_counter() - t0) * 1000)
+            samples.sort()
+            self.stdout.write(
+                f"full tenant recompute: median={samples[len(samples) // 2]:.1f}ms max={samples[-1]:.1f}ms"
+            )
+            get_redis().delete(*(ranking_key(municipality.pk, entity_type) for entity_type in RANKED_SOURCES))
+            transaction.set_rollback(True)
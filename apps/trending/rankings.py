@@ -0,0 +1,138 @@
+import json
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from apps.business.models import Business, Favorite
+from apps.core.redis_utils import fail_open, get_redis
+from apps.event.models import Bookmark, Event
+from apps.qr.models import QRAnalytics
+from apps.qr.utils import entity_pk
+from apps.tourism.models import TouristPlace
+
+DEFAULT_WEIGHTS = {
+    "place": {"scans": 0.6, "rating": 0.4},
+    "business": {"scans": 0.4, "favorites": 0.3, "rating": 0.3},
+    "event": {"scans": 0.3, "bookmarks": 0.5, "rating": 0.2},
+}
+
+# entity type -> model, QR entity type, visibility filter, fields copied into the stored list
+RANKED_SOURCES = {
+    "place": (TouristPlace, "tourist_place", {"is_approved": True}, ["name", "slug", "category"]),
+    "business": (Business, "business", {"status": "published"}, ["name", "slug", "business"]),
+    "event": (Event, "event", {}, ["title", "slug", "date"]),
+}
+
+
+def ranking_key(municipality_id, entity_type):
+    return f"trending:{municipality_id}:{entity_type}"
+
+
+def _decayed(rows, now, half_life_days):
+    """Sum per-day counts with an exponential half-life: {pk: score}."""
+    scores = defaultdict(float)
+    for pk, day, count in rows:
+        age_days = max(0.0, (timezone.localdate(now) - day).days + 0.5)
+        scores[pk] += count * 0.5 ** (age_days / half_life_days)
+    return scores
+
+
+def _daily_counts(queryset, pk_field, date_field, since):
+    return (
+        queryset.filter(**{f"{date_field}__gte": since})
+        .annotate(day=TruncDate(date_field))
+        .values_list(pk_field, "day")
+        .annotate(n=Count("pk"))
+    )
+
+
+def signals(municipality_id, entity_type, now=None):
+    """
+    {signal name: {pk: raw value}} for one tenant and entity type. Each
+    event-based signal is one grouped query over the time window.
+    """
+    now = now or timezone.now()
+    window = getattr(settings, "TRENDING_WINDOW_DAYS", 30)
+    half_life = getattr(settings, "TRENDING_HALF_LIFE_DAYS", 7)
+    since = now - timedelta(days=window)
+    model, qr_type, _, _ = RANKED_SOURCES[entity_type]
+
+    scan_rows = _daily_counts(
+        QRAnalytics.objects.filter(municipality_id=municipality_id, qr__entity_type=qr_type),
+        "qr__entity_id", "scanned_at", since,
+    )
+    found = {"scans": _decayed(((entity_pk(e), d, n) for e, d, n in scan_rows), now, half_life)}
+    if entity_type == "business":
+        found["favorites"] = _decayed(
+            _daily_counts(Favorite.objects.filter(business__municipality_id=municipality_id), "business_id",
+                          "created_at", since),
+            now, half_life,
+        )
+    if entity_type == "event":
+        found["bookmarks"] = _decayed(
+            _daily_counts(Bookmark.objects.filter(event__municipality_id=municipality_id), "event_id",
+                          "created_at", since),
+            now, half_life,
+        )
+    # rating_score is already shrunk towards the prior, so one 5-star review does not dominate
+    found["rating"] = dict(
+        model.objects.filter(municipality_id=municipality_id, rating_count__gt=0).values_list("pk", "rating_score")
+    )
+    return found
+
+
+def compute(municipality_id, entity_type, now=None):
+    """
+    Scale each signal to [0, 1] by its maximum among the listable entities,
+    blend them with TRENDING_WEIGHTS and return the top N rows.
+    """
+    now = now or timezone.now()
+    weights = getattr(settings, "TRENDING_WEIGHTS", DEFAULT_WEIGHTS)[entity_type]
+    model, _, visible, fields = RANKED_SOURCES[entity_type]
+    found = signals(municipality_id, entity_type, now)
+
+    candidates = model.objects.filter(
+        municipality_id=municipality_id, pk__in={pk for values in found.values() for pk in values}, **visible
+    )
+    if entity_type == "event":
+        # Featured events are the ones still ahead (or running today)
+        candidates = candidates.filter(date__gte=now - timedelta(days=1))
+    rows = {row[0]: row for row in candidates.values_list("pk", *fields, "rating_score", "rating_count")}
+
+    blended = defaultdict(float)
+    for name, values in found.items():
+        values = {pk: value for pk, value in values.items() if pk in rows}
+        top = max(values.values(), default=0)
+        if not top:
+            continue
+        for pk, value in values.items():
+            blended[pk] += weights.get(name, 0) * value / top
+
+    ranked = sorted(blended, key=lambda pk: (-blended[pk], pk))[: getattr(settings, "TRENDING_TOP_N", 50)]
+    keys = ["id", *fields, "rating_score", "rating_count"]
+    return [{**dict(zip(keys, rows[pk])), "score": round(blended[pk], 4)} for pk in ranked]
+
+
+def store(municipality_id, entity_type, results, now=None):
+    payload = {"computed_at": (now or timezone.now()).isoformat(), "results": results}
+    get_redis().set(
+        ranking_key(municipality_id, entity_type),
+        json.dumps(payload, default=str, separators=(",", ":")),
+        ex=getattr(settings, "TRENDING_TTL", 60 * 60 * 24),
+    )
+
+
+def recompute(municipality_id):
+    now = timezone.now()
+    for entity_type in RANKED_SOURCES:
+        store(municipality_id, entity_type, compute(municipality_id, entity_type, now), now)
+
+
+@fail_open(default=None)
+def read(municipality_id, entity_type):
+    """The stored JSON bytes, or None if never computed or Redis is unavailable."""
+    return get_redis().get(ranking_key(municipality_id, entity_type))
@@ -0,0 +1,14 @@
+from celery import shared_task
+
+from apps.municipality.models import Municipality
+from .rankings import recompute
+
+
+@shared_task(name="trending.compute_rankings")
+def compute_rankings(municipality_id=None):
+    """
+    Recompute the stored trending lists for one tenant, or all of them.
+    """
+    pks = [municipality_id] if municipality_id is not None else Municipality.objects.values_list("pk", flat=True)
+    for pk in pks:
+        recompute(pk)
@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import trending_list
+
+urlpatterns = [
+    path('<str:entity_type>/', trending_list, name='trending-list'),
+]
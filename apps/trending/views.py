@@ -0,0 +1,40 @@
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404, HttpResponse
+
+from .rankings import RANKED_SOURCES, read
+from .tasks import compute_rankings
+
+logger = logging.getLogger("django")
+
+EMPTY = b'{"computed_at":null,"results":[]}'
+
+
+def trending_list(request, entity_type):
+    """
+    Top places, businesses or events of the tenant, as stored by the ranking
+    job. Plain Django view returning the stored JSON as-is: one Redis GET,
+    no database access. Answers EMPTY rather than failing when Redis or the
+    broker is down.
+    """
+    municipality = getattr(request, "tenant", None)
+    if municipality is None or entity_type not in RANKED_SOURCES:
+        raise Http404
+    payload = read(municipality.pk, entity_type)
+    if payload is None:
+        # Never computed for this tenant: queue it once, answer empty meanwhile
+        try:
+            if cache.add(f"trending:queued:{municipality.pk}", 1, 300):
+                compute_rankings.delay(municipality.pk)
+        except Exception as e:
+            logger.warning(f"Could not queue trending rankings for municipality {municipality.pk}: {e}")
+        payload = EMPTY
+    response = HttpResponse(payload, content_type="application/json")
+    response["Cache-Control"] = f"public, max-age={getattr(settings, 'TRENDING_MAX_AGE', 300)}"
+    return response
+
+
+# At most the tenant lookup when its cache entry expires
+trending_list.query_budget = 1
@@ -2,6 +2,7 @@ import logging
 
 from datetime import timedelta
 
+from django.conf import settings
 from django.utils import timezone
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
@@ -15,8 +16,9 @@ from apps.core.permissions import IsSuperAdmin, IsSupportUser
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.decorators import action
-from rest_framework.throttling import UserRateThrottle
 
+from apps.core.redis_utils import delete_many, incr_with_expiry, pop_token, set_token
+from apps.core.throttling import RedisUserRateThrottle
 from apps.core.views import generate_otp, send_otp_sms
 from apps.user.models import User, UserOTP, AdminUser
 from apps.user.serializers import (
@@ -52,7 +54,6 @@ class UserRegistrationView(ModelViewSet):
 
         otp_code = generate_otp()
         UserOTP.objects.create(user=user, otp=otp_code, is_verified=False)
-        send_otp_sms(user.phone, otp_code) if user.phone else None
         logger.info(f"OTP entry created for user ID: {user.id}")
 
         phone = getattr(user, 'phone', None)
@@ -75,6 +76,21 @@ class VerifyOTPView(APIView):
 
         user_id = serializer.validated_data['user_id']
         otp = serializer.validated_data['otp']
+        # Six digits are guessable without a cap on attempts per code lifetime
+        attempts_key = f"otp:attempts:{user_id}"
+        attempts, _ = incr_with_expiry(attempts_key, getattr(settings, "OTP_ATTEMPT_WINDOW_SECONDS", 300))
+        if attempts is None:
+            # Fails closed: without the counter the code could be guessed without limit
+            logger.error(f"OTP attempt counter unavailable, rejecting verification for user ID: {user_id}")
+            return Response(
+                {"detail": "Verification is temporarily unavailable. Try again later."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+        if attempts > getattr(settings, "OTP_MAX_ATTEMPTS", 5):
+            logger.warning(f"Too many OTP attempts for user ID: {user_id}")
+            return Response(
+                {"detail": "Too many attempts. Try again later."}, status=status.HTTP_429_TOO_MANY_REQUESTS
+            )
         cutoff_time = timezone.now() - timedelta(minutes=5)
         otp_qs = UserOTP.objects.filter(
             user_id=user_id,
@@ -90,6 +106,7 @@ class VerifyOTPView(APIView):
         otp_entry = otp_qs.first()
         otp_entry.is_verified = True
         otp_entry.save()
+        delete_many([attempts_key])
         logger.info(f"OTP verified for user ID: {user_id}")
 
         user = otp_entry.user
@@ -104,6 +121,7 @@ class UserViewSet(ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
+    cursor_ordering = ("-created_at", "-id")
 
     def get_queryset(self):
         queryset = User.objects.all()
@@ -123,10 +141,9 @@ class UserViewSet(ModelViewSet):
         if (sort_by := params.get('sort_by')):
             queryset = queryset.order_by(sort_by)
 
-        logger.info(f"Final user queryset count: {queryset.count()}")
         return queryset
 
-    @action(detail=False, methods=['post'], url_path='change-password', throttle_classes=[UserRateThrottle])
+    @action(detail=False, methods=['post'], url_path='change-password', throttle_classes=[RedisUserRateThrottle])
     def change_password(self, request):
         logger.info(f"Password change requested for user ID: {request.user.id}")
         serializer = ChangePasswordSerializer(data=request.data, context={'request': request})
@@ -138,7 +155,7 @@ class UserViewSet(ModelViewSet):
         logger.warning(f"Password change failed for user ID: {request.user.id}, errors: {serializer.errors}")
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
-    @action(detail=False, methods=['post'], url_path='deactivate', throttle_classes=[UserRateThrottle])
+    @action(detail=False, methods=['post'], url_path='deactivate', throttle_classes=[RedisUserRateThrottle])
     def deactivate(self, request):
         user = request.user
         logger.info(f"Account deactivation requested for user ID: {user.id}")
@@ -150,9 +167,13 @@ class UserViewSet(ModelViewSet):
 
 token_generator = PasswordResetTokenGenerator()
 
+
+def reset_token_key(user_id):
+    return f"password_reset:{user_id}"
+
 class ResetPasswordAPIView(APIView):
     permission_classes = [AllowAny]
-    throttle_classes = [UserRateThrottle]
+    throttle_classes = [RedisUserRateThrottle]
 
     def post(self, request):
         email = request.data.get("email")
@@ -169,6 +190,9 @@ class ResetPasswordAPIView(APIView):
 
         uid = urlsafe_base64_encode(force_bytes(user.pk))
         token = token_generator.make_token(user)
+        # Only the latest link works, and only once (see ResetPasswordConfirmAPIView)
+        if not set_token(reset_token_key(user.pk), token, settings.PASSWORD_RESET_TIMEOUT):
+            return Response({"error": "Password reset is temporarily unavailable"}, status=503)
         relative_url = f"/api/user/reset-password-confirm/{uid}/{token}/"
         reset_link = request.build_absolute_uri(relative_url)
 
@@ -183,7 +207,7 @@ class ResetPasswordAPIView(APIView):
 
 class ResetPasswordConfirmAPIView(APIView):
     permission_classes = [AllowAny]
-    throttle_classes = [UserRateThrottle]
+    throttle_classes = [RedisUserRateThrottle]
 
     def get(self, request, uidb64, token):
         logger.info(f"Password reset confirm GET called with UID: {uidb64}")
@@ -203,6 +227,10 @@ class ResetPasswordConfirmAPIView(APIView):
         if not password:
             return Response({"error": "Password is required."}, status=400)
 
+        if pop_token(reset_token_key(user.pk)) != token:
+            logger.warning(f"Reset token already used or superseded for user ID: {uid}")
+            return Response({"error": "Invalid or expired token"}, status=400)
+
         user.set_password(password)
         user.save()
         logger.info(f"Password reset successful for user ID: {uid}")
@@ -0,0 +1,70 @@
+"""
+Production server settings, read by gunicorn from the working directory:
+
+    SERVER_MODE=gthread gunicorn        # default
+    SERVER_MODE=sync gunicorn
+    SERVER_MODE=asgi gunicorn           # uvicorn workers on admin_module.asgi
+
+Every value can be overridden with an environment variable; see below.
+"""
+import multiprocessing
+import os
+
+MODES = {
+    # Process per request: simplest, and safe for CPU-heavy views
+    "sync": ("admin_module.wsgi:application", "sync"),
+    # Threads share a worker's memory and overlap database/Redis waits
+    "gthread": ("admin_module.wsgi:application", "gthread"),
+    # One event loop per worker; sync views run in Django's thread executor
+    "asgi": ("admin_module.asgi:application", "uvicorn.workers.UvicornWorker"),
+}
+mode = os.environ.get("SERVER_MODE", "gthread")
+if mode not in MODES:
+    raise RuntimeError(f"SERVER_MODE must be one of {', '.join(MODES)}, not {mode!r}")
+wsgi_app, worker_class = MODES[mode]
+
+cpus = multiprocessing.cpu_count()
+bind = os.environ.get("GUNICORN_BIND", f"0.0.0.0:{os.environ.get('PORT', '8000')}")
+# Sync workers block on I/O, so use the usual 2n+1; threaded and async workers need one per core
+workers = int(os.environ.get("GUNICORN_WORKERS", 2 * cpus + 1 if mode == "sync" else cpus))
+threads = int(os.environ.get("GUNICORN_THREADS", 4 if mode == "gthread" else 1))
+
+if mode == "asgi":
+    # Connections live in the executor threads under ASGI and are not reused reliably
+    os.environ.setdefault("DB_CONN_MAX_AGE", "0")
+
+# Import Django once in the master: workers fork with the app loaded and share
+# its memory pages copy-on-write, and a broken deploy fails before any fork
+preload_app = os.environ.get("GUNICORN_PRELOAD", "1") == "1"
+
+# Recycle workers now and then so slow leaks cannot build up; the jitter
+# keeps them from all restarting at once
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 2000))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", 200))
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+# On SIGTERM/HUP, workers finish in-flight requests for this long
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 5))
+
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG", "-") or None  # empty: no access log
+errorlog = "-"
+loglevel = os.environ.get("GUNICORN_LOG_LEVEL", "info")
+# Heartbeat files on tmpfs: a slow disk must not make healthy workers look hung
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+def post_fork(server, worker):
+    # Anything the master opened while preloading must not be shared between workers
+    from django.db import connections
+
+    connections.close_all()
+
+
+def when_ready(server):
+    # The URLConf imports every view on the first request; do that once in the
+    # preloaded master so new workers start with it instead of each paying for it
+    if server.cfg.preload_app:
+        from django.urls import get_resolver
+
+        get_resolver().url_patterns